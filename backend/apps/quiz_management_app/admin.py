@@ -1,6 +1,16 @@
 from django.contrib import admin
 
-from apps.quiz_management_app.models import Quiz, QuizQuestion
+from apps.quiz_management_app.models import (
+    CacheCounter,
+    IdempotencyKey,
+    InflightLease,
+    PipelineTelemetry,
+    Quiz,
+    QuizJob,
+    QuizQuestion,
+    QuizPayloadCacheEntry,
+    TranscriptCacheEntry,
+)
 
 
 class QuizQuestionInline(admin.TabularInline):
@@ -13,8 +23,8 @@ class QuizQuestionInline(admin.TabularInline):
 @admin.register(Quiz)
 class QuizAdmin(admin.ModelAdmin):
     list_display = ("id", "title", "user", "created_at", "updated_at", "question_count")
-    list_filter = ("created_at", "user")
-    search_fields = ("title", "description", "video_url", "user__username", "user__email")
+    list_filter = ("created_at", "transcript_source", "user")
+    search_fields = ("title", "description", "video_url", "video_id", "user__username", "user__email")
     readonly_fields = ("created_at", "updated_at")
     inlines = [QuizQuestionInline]
 
@@ -35,4 +45,62 @@ class QuizQuestionAdmin(admin.ModelAdmin):
         t = obj.question_title or ""
         return (t[:50] + "...") if len(t) > 50 else t
 
-    question_title_short.short_description = "Question"
\ No newline at end of file
+    question_title_short.short_description = "Question"
+
+
+@admin.register(QuizJob)
+class QuizJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "status", "attempts", "quiz", "created_at", "finished_at")
+    list_filter = ("status", "created_at")
+    search_fields = ("video_url", "error", "user__username", "user__email")
+    readonly_fields = ("created_at", "updated_at", "started_at", "finished_at")
+
+
+@admin.register(TranscriptCacheEntry)
+class TranscriptCacheEntryAdmin(admin.ModelAdmin):
+    list_display = ("id", "video_id", "model_name", "size_bytes", "hit_count", "created_at", "last_used_at")
+    list_filter = ("model_name",)
+    search_fields = ("video_id",)
+    readonly_fields = ("created_at", "last_used_at")
+
+
+@admin.register(QuizPayloadCacheEntry)
+class QuizPayloadCacheEntryAdmin(admin.ModelAdmin):
+    list_display = ("id", "transcript_hash", "prompt_version", "model_name", "size_bytes", "hit_count", "created_at", "last_used_at")
+    list_filter = ("model_name", "prompt_version")
+    search_fields = ("transcript_hash",)
+    readonly_fields = ("created_at", "last_used_at")
+
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "key", "status_code", "job", "created_at")
+    list_filter = ("status_code",)
+    search_fields = ("key", "user__username")
+    readonly_fields = ("created_at",)
+
+
+@admin.register(InflightLease)
+class InflightLeaseAdmin(admin.ModelAdmin):
+    list_display = ("key", "owner", "created_at", "expires_at")
+    search_fields = ("key",)
+    readonly_fields = ("created_at",)
+
+
+@admin.register(CacheCounter)
+class CacheCounterAdmin(admin.ModelAdmin):
+    list_display = ("name", "hits", "misses", "hit_rate_display", "updated_at")
+    readonly_fields = ("updated_at",)
+
+    def hit_rate_display(self, obj):
+        return f"{obj.hit_rate:.1%}"
+
+    hit_rate_display.short_description = "Hit rate"
+
+
+@admin.register(PipelineTelemetry)
+class PipelineTelemetryAdmin(admin.ModelAdmin):
+    list_display = ("id", "quiz", "outcome", "failed_stage", "total_seconds", "audio_seconds", "whisper_model", "created_at")
+    list_filter = ("outcome", "whisper_model", "transcript_source", "llm_strategy", "created_at")
+    search_fields = ("quiz__title", "job__video_url")
+    readonly_fields = ("created_at",)
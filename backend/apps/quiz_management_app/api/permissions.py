@@ -10,4 +10,15 @@ class IsQuizOwner(BasePermission):
     message = "You do not have permission to access this quiz."
 
     def has_object_permission(self, request, view, obj) -> bool:
-        return getattr(obj, "user_id", None) == getattr(request.user, "id", None)
\ No newline at end of file
+        return getattr(obj, "user_id", None) == getattr(request.user, "id", None)
+
+
+class IsJobOwner(BasePermission):
+    """
+    Object-level permission: only the user who queued a job can poll it.
+    """
+
+    message = "You do not have permission to access this job."
+
+    def has_object_permission(self, request, view, obj) -> bool:
+        return getattr(obj, "user_id", None) == getattr(request.user, "id", None)
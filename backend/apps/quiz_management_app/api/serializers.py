@@ -1,6 +1,6 @@
 from rest_framework import serializers
 
-from apps.quiz_management_app.models import Quiz, QuizQuestion
+from apps.quiz_management_app.models import Quiz, QuizJob, QuizQuestion
 
 
 
@@ -61,4 +61,34 @@ class CreateQuizRequestSerializer(serializers.Serializer):
     """
     Request body for POST /createQuiz/
     """
-    url = serializers.URLField()
\ No newline at end of file
+    url = serializers.URLField()
+
+
+class QuizJobSerializer(serializers.ModelSerializer):
+    """
+    Status of a queued quiz generation job.
+    `quiz` is filled in once the job has succeeded; with streaming enabled,
+    `partial_questions` lists the questions generated so far. Once the job has
+    finished it holds exactly the saved quiz's questions (empty if it failed).
+    """
+
+    quiz = QuizSerializer(read_only=True)
+
+    class Meta:
+        model = QuizJob
+        fields = [
+            "id",
+            "status",
+            "video_url",
+            "quiz",
+            "error",
+            "duration_seconds",
+            "estimated_seconds",
+            "max_seconds",
+            "whisper_model",
+            "partial_questions",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
@@ -1,9 +1,10 @@
 from django.urls import path
 
-from .views import CreateQuizView, QuizDetailView, QuizListView
+from .views import CreateQuizView, QuizDetailView, QuizJobDetailView, QuizListView
 
 urlpatterns = [
     path("createQuiz/", CreateQuizView.as_view(), name="create_quiz"),
+    path("jobs/<int:pk>/", QuizJobDetailView.as_view(), name="quiz_job_detail"),
     path("quizzes/", QuizListView.as_view(), name="quiz_list"),
     path("quizzes/<int:pk>/", QuizDetailView.as_view(), name="quiz_detail"),
-]
\ No newline at end of file
+]
@@ -1,34 +1,123 @@
+from django.urls import reverse
 from rest_framework import status
-from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveAPIView, RetrieveUpdateDestroyAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from apps.quiz_management_app.models import Quiz
-from apps.quiz_management_app.api.permissions import IsQuizOwner
-from apps.quiz_management_app.utils import create_quiz_from_url, QuizCreationError, InvalidYouTubeUrlError
+from apps.quiz_management_app.idempotency import (
+    IDEMPOTENCY_HEADER,
+    MAX_KEY_LENGTH,
+    RETRY_AFTER_SECONDS,
+    IdempotencyKeyInProgressError,
+    IdempotencyKeyMismatchError,
+    claim_idempotency_key,
+    release_idempotency_key,
+    request_fingerprint,
+    store_idempotent_response,
+)
+from apps.quiz_management_app.jobs import enqueue_quiz_job
+from apps.quiz_management_app.models import Quiz, QuizJob
+from apps.quiz_management_app.api.permissions import IsJobOwner, IsQuizOwner
+from apps.quiz_management_app.utils import InvalidYouTubeUrlError, VideoRejectedError
 from .serializers import (
     CreateQuizRequestSerializer,
+    QuizJobSerializer,
     QuizSerializer,
     QuizUpdateSerializer,
 )
 
 
 class CreateQuizView(CreateAPIView):
+    """
+    Queues quiz generation and answers with 202 + the job.
+    Poll GET /jobs/<id>/ until status is "succeeded" or "failed".
+    ?fresh=1 skips reuse of an existing quiz for the same video.
+    With an Idempotency-Key header, retries of the same request get the first
+    response back (202 with the job's current state, or the stored error)
+    instead of queueing another job.
+    """
+
     permission_classes = [IsAuthenticated]
     serializer_class = CreateQuizRequestSerializer
 
     def create(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            return self._create(request)[0]
+        if not key.strip() or len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {"detail": f"{IDEMPOTENCY_HEADER} must be 1 to {MAX_KEY_LENGTH} characters."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        body = request.data.dict() if hasattr(request.data, "dict") else request.data
+        fingerprint = request_fingerprint(request.path, sorted(request.query_params.lists()), body)
+        try:
+            record, created = claim_idempotency_key(request.user, key, fingerprint)
+        except IdempotencyKeyMismatchError:
+            return Response(
+                {"detail": f"This {IDEMPOTENCY_HEADER} was already used for a different request."},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        except IdempotencyKeyInProgressError:
+            return Response(
+                {"detail": f"A request with this {IDEMPOTENCY_HEADER} is still being processed."},
+                status=status.HTTP_409_CONFLICT,
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+        if not created:
+            return self._replay(record)
+
+        try:
+            response, job = self._create(request)
+        except BaseException:
+            # e.g. an invalid body: nothing was queued, so a corrected retry may reuse the key
+            release_idempotency_key(record)
+            raise
+        store_idempotent_response(record, response.status_code, response.data, job=job)
+        return response
+
+    def _replay(self, record):
+        if record.job is not None:
+            response = self._accepted(record.job)
+        else:
+            response = Response(record.response, status=record.status_code)
+        response["Idempotent-Replayed"] = "true"
+        return response
+
+    def _accepted(self, job):
+        location = reverse("quiz_job_detail", kwargs={"pk": job.pk})
+        return Response(
+            QuizJobSerializer(job).data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": location},
+        )
+
+    def _create(self, request):
+        """
+        Validates and queues the request; returns the response and the job (None on errors).
+        """
         req = self.get_serializer(data=request.data)
         req.is_valid(raise_exception=True)
 
         try:
-            quiz = create_quiz_from_url(req.validated_data["url"], request.user)
+            job = enqueue_quiz_job(
+                req.validated_data["url"],
+                request.user,
+                fresh=request.query_params.get("fresh", "").lower() in ("1", "true", "yes"),
+            )
         except InvalidYouTubeUrlError:
-            return Response({"detail": "Only YouTube URLs are allowed."}, status=status.HTTP_400_BAD_REQUEST)
-        except QuizCreationError as e:
-            return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return Response({"detail": "Only YouTube URLs are allowed."}, status=status.HTTP_400_BAD_REQUEST), None
+        except VideoRejectedError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_422_UNPROCESSABLE_ENTITY), None
+
+        return self._accepted(job), job
+
 
-        return Response(QuizSerializer(quiz).data, status=status.HTTP_201_CREATED)
+class QuizJobDetailView(RetrieveAPIView):
+    permission_classes = [IsAuthenticated, IsJobOwner]
+    serializer_class = QuizJobSerializer
+    queryset = QuizJob.objects.all().select_related("quiz").prefetch_related("quiz__questions")
 
 
 class QuizListView(ListAPIView):
@@ -46,4 +135,4 @@ class QuizDetailView(RetrieveUpdateDestroyAPIView):
     def get_serializer_class(self):
         if self.request.method in ("PATCH", "PUT"):
             return QuizUpdateSerializer
-        return QuizSerializer
\ No newline at end of file
+        return QuizSerializer
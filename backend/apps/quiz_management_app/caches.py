@@ -0,0 +1,214 @@
+import hashlib
+import json
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from apps.quiz_management_app.models import CacheCounter, QuizPayloadCacheEntry, TranscriptCacheEntry
+
+TRANSCRIPT_CACHE = "transcript"
+QUIZ_PAYLOAD_CACHE = "quiz_payload"
+
+
+# -----------------------------
+# Counters
+# -----------------------------
+def record_cache_lookup(name: str, hit: bool) -> None:
+    field = "hits" if hit else "misses"
+    updated = CacheCounter.objects.filter(name=name).update(**{field: F(field) + 1})
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            CacheCounter.objects.create(name=name, **{field: 1})
+    except IntegrityError:
+        CacheCounter.objects.filter(name=name).update(**{field: F(field) + 1})
+
+
+def cache_stats(name: str) -> Dict[str, Any]:
+    counter = CacheCounter.objects.filter(name=name).first()
+    hits = counter.hits if counter else 0
+    misses = counter.misses if counter else 0
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": counter.hit_rate if counter else 0.0,
+    }
+
+
+# -----------------------------
+# Transcript cache
+# -----------------------------
+def transcription_options_key(options: Dict[str, Any]) -> str:
+    """
+    Stable short hash of the options passed to model.transcribe(),
+    so changing e.g. language or temperature never serves a stale transcript.
+    """
+    raw = json.dumps(options or {}, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def transcript_cache_enabled() -> bool:
+    return bool(getattr(settings, "TRANSCRIPT_CACHE_ENABLED", True))
+
+
+def get_cached_transcript(video_id: Optional[str], model_name: str, options: Dict[str, Any]) -> Optional[str]:
+    if not video_id or not transcript_cache_enabled():
+        return None
+
+    entry = TranscriptCacheEntry.objects.filter(
+        video_id=video_id,
+        model_name=model_name,
+        options_key=transcription_options_key(options),
+    ).first()
+
+    record_cache_lookup(TRANSCRIPT_CACHE, hit=entry is not None)
+    if entry is None:
+        return None
+
+    TranscriptCacheEntry.objects.filter(pk=entry.pk).update(
+        hit_count=F("hit_count") + 1,
+        last_used_at=timezone.now(),
+    )
+    return entry.transcript
+
+
+def store_transcript(video_id: Optional[str], model_name: str, options: Dict[str, Any], transcript: str) -> None:
+    if not video_id or not transcript_cache_enabled():
+        return
+
+    TranscriptCacheEntry.objects.update_or_create(
+        video_id=video_id,
+        model_name=model_name,
+        options_key=transcription_options_key(options),
+        defaults={
+            "transcript": transcript,
+            "size_bytes": len(transcript.encode("utf-8")),
+            "last_used_at": timezone.now(),
+        },
+    )
+    evict_transcripts()
+
+
+def evict_transcripts(max_bytes: Optional[int] = None) -> int:
+    """
+    Deletes least recently used entries until the cache fits into
+    settings.TRANSCRIPT_CACHE_MAX_BYTES. Returns the number of deleted entries.
+    """
+    if max_bytes is None:
+        max_bytes = int(getattr(settings, "TRANSCRIPT_CACHE_MAX_BYTES", 200 * 1024 * 1024))
+    return _evict_lru(TranscriptCacheEntry, max_bytes)
+
+
+def _evict_lru(model, max_bytes: int) -> int:
+    total = model.objects.aggregate(total=Sum("size_bytes"))["total"] or 0
+    if total <= max_bytes:
+        return 0
+
+    doomed = []
+    rows = model.objects.order_by("last_used_at", "id").values_list("id", "size_bytes")
+    for entry_id, size in rows.iterator():
+        if total <= max_bytes:
+            break
+        doomed.append(entry_id)
+        total -= size
+
+    model.objects.filter(id__in=doomed).delete()
+    return len(doomed)
+
+
+def transcript_cache_stats() -> Dict[str, Any]:
+    agg = TranscriptCacheEntry.objects.aggregate(total=Sum("size_bytes"))
+    stats = cache_stats(TRANSCRIPT_CACHE)
+    stats["entries"] = TranscriptCacheEntry.objects.count()
+    stats["size_bytes"] = agg["total"] or 0
+    return stats
+
+
+# -----------------------------
+# Quiz payload (LLM response) cache
+# -----------------------------
+def normalized_transcript_hash(transcript: str) -> str:
+    """
+    sha256 of the transcript with whitespace collapsed, so re-wrapped or
+    re-uploaded transcripts with the same words share an entry.
+    """
+    normalized = " ".join((transcript or "").split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def quiz_payload_cache_enabled() -> bool:
+    return bool(getattr(settings, "LLM_CACHE_ENABLED", True))
+
+
+def quiz_payload_cache_ttl() -> timedelta:
+    return getattr(settings, "LLM_CACHE_TTL", timedelta(days=30))
+
+
+def get_cached_quiz_payload(transcript_hash: str, prompt_version: str, model_name: str) -> Optional[Dict[str, Any]]:
+    if not quiz_payload_cache_enabled():
+        return None
+
+    entry = QuizPayloadCacheEntry.objects.filter(
+        transcript_hash=transcript_hash,
+        prompt_version=prompt_version,
+        model_name=model_name,
+        created_at__gte=timezone.now() - quiz_payload_cache_ttl(),
+    ).first()
+
+    record_cache_lookup(QUIZ_PAYLOAD_CACHE, hit=entry is not None)
+    if entry is None:
+        return None
+
+    QuizPayloadCacheEntry.objects.filter(pk=entry.pk).update(
+        hit_count=F("hit_count") + 1,
+        last_used_at=timezone.now(),
+    )
+    return entry.payload
+
+
+def store_quiz_payload(transcript_hash: str, prompt_version: str, model_name: str, payload: Dict[str, Any]) -> None:
+    """
+    Only call with payloads that passed validate_quiz_payload.
+    """
+    if not quiz_payload_cache_enabled():
+        return
+
+    now = timezone.now()
+    QuizPayloadCacheEntry.objects.update_or_create(
+        transcript_hash=transcript_hash,
+        prompt_version=prompt_version,
+        model_name=model_name,
+        defaults={
+            "payload": payload,
+            "size_bytes": len(json.dumps(payload, ensure_ascii=False).encode("utf-8")),
+            "created_at": now,
+            "last_used_at": now,
+        },
+    )
+    evict_quiz_payloads()
+
+
+def evict_quiz_payloads(max_bytes: Optional[int] = None) -> int:
+    """
+    Deletes entries older than settings.LLM_CACHE_TTL, then least recently used
+    ones until the cache fits into settings.LLM_CACHE_MAX_BYTES.
+    Returns the number of deleted entries.
+    """
+    if max_bytes is None:
+        max_bytes = int(getattr(settings, "LLM_CACHE_MAX_BYTES", 50 * 1024 * 1024))
+
+    expired, _ = QuizPayloadCacheEntry.objects.filter(created_at__lt=timezone.now() - quiz_payload_cache_ttl()).delete()
+    return expired + _evict_lru(QuizPayloadCacheEntry, max_bytes)
+
+
+def quiz_payload_cache_stats() -> Dict[str, Any]:
+    agg = QuizPayloadCacheEntry.objects.aggregate(total=Sum("size_bytes"))
+    stats = cache_stats(QUIZ_PAYLOAD_CACHE)
+    stats["entries"] = QuizPayloadCacheEntry.objects.count()
+    stats["size_bytes"] = agg["total"] or 0
+    return stats
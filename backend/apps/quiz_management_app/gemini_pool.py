@@ -0,0 +1,84 @@
+"""
+Process-wide Gemini client with a pooled, keep-alive HTTP connection.
+
+genai.Client() builds a fresh httpx client, so creating one per quiz pays DNS,
+TCP and TLS setup on every request. ClientHolder keeps a single client per
+process (rebuilt only when the configuration changes) on top of an httpx
+connection pool, which is safe to share between threads.
+
+After os.fork() the child drops the inherited client without closing it: the
+sockets belong to the parent, and the child opens its own on first use.
+
+Like whisper_registry, this module has no Django imports; utils.py wires it to settings.
+"""
+import os
+import threading
+from typing import Any, NamedTuple, Optional
+
+
+class ClientConfig(NamedTuple):
+    api_key: str
+    base_url: str = ""
+    timeout: float = 120.0
+    connect_timeout: float = 10.0
+    max_connections: int = 10
+    keepalive_expiry: float = 60.0
+
+
+def build_client(config: ClientConfig):
+    import httpx
+    from google import genai
+    from google.genai import types
+
+    http = httpx.Client(
+        timeout=httpx.Timeout(config.timeout, connect=config.connect_timeout),
+        limits=httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        ),
+    )
+    options = types.HttpOptions(
+        httpx_client=http,
+        # per-request timeout in ms; without it genai sends timeout=None and disables httpx's default
+        timeout=int(config.timeout * 1000),
+        base_url=config.base_url or None,
+    )
+    return genai.Client(api_key=config.api_key, http_options=options)
+
+
+class ClientHolder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._client: Any = None
+        self._config: Optional[ClientConfig] = None
+        self.builds = 0
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._forget)
+
+    def get(self, config: ClientConfig):
+        with self._lock:
+            if self._client is None or self._config != config:
+                self._client = build_client(config)
+                self._config = config
+                self.builds += 1
+            return self._client
+
+    def reset(self) -> None:
+        """
+        Closes the pooled connections; the next get() builds a new client.
+        """
+        with self._lock:
+            client, self._client, self._config = self._client, None, None
+        http = getattr(getattr(client, "_api_client", None), "_httpx_client", None)
+        if http is not None:
+            http.close()
+
+    def _forget(self) -> None:
+        # Runs in the forked child: the parent's lock may be held, so don't take it.
+        self._lock = threading.Lock()
+        self._client = None
+        self._config = None
+
+
+CLIENTS = ClientHolder()
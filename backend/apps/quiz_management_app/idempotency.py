@@ -0,0 +1,107 @@
+"""
+Idempotency keys for POST /api/createQuiz/.
+
+The first request with a key claims an IdempotencyKey row (unique per user and key)
+and stores its outcome when done. Later requests with the same key and the same
+request fingerprint get that outcome back. While the first one is still running they
+wait briefly (IDEMPOTENCY_WAIT_SECONDS, default 1, enough for a double click) and then
+get 409 with Retry-After instead of holding one of the few gunicorn threads.
+Reusing a key for a different request is an error.
+"""
+import hashlib
+import json
+import time
+from datetime import timedelta
+from typing import Any, Optional, Tuple
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from apps.quiz_management_app.models import IdempotencyKey, QuizJob
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+RETRY_AFTER_SECONDS = 1
+
+
+class IdempotencyKeyMismatchError(Exception):
+    """
+    The key was already used for a request with a different body or query string.
+    """
+
+
+class IdempotencyKeyInProgressError(Exception):
+    """
+    The first request with this key is still running after the wait window.
+    """
+
+
+def idempotency_key_ttl() -> timedelta:
+    return getattr(settings, "IDEMPOTENCY_KEY_TTL", timedelta(hours=24))
+
+
+def idempotency_wait_seconds() -> float:
+    return float(getattr(settings, "IDEMPOTENCY_WAIT_SECONDS", 1))
+
+
+def idempotency_poll_seconds() -> float:
+    return float(getattr(settings, "IDEMPOTENCY_POLL_SECONDS", 0.25))
+
+
+def request_fingerprint(path: str, query: Any, body: Any) -> str:
+    raw = json.dumps({"path": path, "query": query, "body": body}, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _live_keys():
+    return IdempotencyKey.objects.filter(created_at__gt=timezone.now() - idempotency_key_ttl())
+
+
+def claim_idempotency_key(user, key: str, fingerprint: str) -> Tuple[IdempotencyKey, bool]:
+    """
+    Returns (record, created). created=True means the caller handles the request and
+    must call store_idempotent_response() or release_idempotency_key() afterwards;
+    otherwise the record holds the finished outcome to replay.
+    """
+    deadline = time.monotonic() + idempotency_wait_seconds()
+    while True:
+        IdempotencyKey.objects.filter(user=user, key=key, created_at__lte=timezone.now() - idempotency_key_ttl()).delete()
+        try:
+            with transaction.atomic():
+                return IdempotencyKey.objects.create(user=user, key=key, fingerprint=fingerprint), True
+        except IntegrityError:
+            pass
+
+        record = _live_keys().filter(user=user, key=key).select_related("job").first()
+        if record is None:
+            # The first request failed and released the key (or it just expired): take it.
+            continue
+        if record.fingerprint != fingerprint:
+            raise IdempotencyKeyMismatchError()
+        if record.status_code is not None:
+            return record, False
+        if time.monotonic() >= deadline:
+            raise IdempotencyKeyInProgressError()
+        time.sleep(idempotency_poll_seconds())
+
+
+def store_idempotent_response(
+    record: IdempotencyKey, status_code: int, response: Any, job: Optional[QuizJob] = None
+) -> None:
+    record.status_code = status_code
+    record.response = response
+    record.job = job
+    record.save(update_fields=["status_code", "response", "job"])
+
+
+def release_idempotency_key(record: IdempotencyKey) -> None:
+    """
+    Forgets a key whose request failed unexpectedly, so a retry runs it again.
+    """
+    IdempotencyKey.objects.filter(pk=record.pk).delete()
+
+
+def purge_expired_idempotency_keys() -> int:
+    deleted, _ = IdempotencyKey.objects.filter(created_at__lte=timezone.now() - idempotency_key_ttl()).delete()
+    return deleted
@@ -0,0 +1,166 @@
+"""
+Coalescing of concurrent quiz computations for the same video.
+
+Two layers, both keyed by what the computation depends on (video id, Whisper
+model, audio cap; see utils.inflight_key):
+- threads of one process share a SingleFlight, so only one of them goes further;
+- across processes an InflightLease row (unique key) elects the owner. The others
+  poll the row until the owner stores its result there, or until the lease is
+  gone (owner failed) or expired (owner died), in which case they try to take it.
+  While the owner runs, a LeaseRenewal thread keeps pushing expires_at forward, so
+  only a dead owner's lease ever expires, however long the pipeline takes.
+
+The result must be JSON-serializable; it stays on the row for
+QUIZ_INFLIGHT_RESULT_SECONDS so slower pollers still find it.
+"""
+import logging
+import threading
+import time
+import uuid
+from datetime import timedelta
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from apps.quiz_management_app import metrics
+from apps.quiz_management_app.models import InflightLease
+from apps.quiz_management_app.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+LEADER = "leader"
+THREAD = "thread"
+PROCESS = "process"
+
+INFLIGHT_REQUESTS = metrics.counter(
+    "quiz_inflight_requests_total",
+    "Quiz computations by single-flight role: ran it (leader) or waited for another thread/process.",
+    ("role",),
+)
+
+FLIGHTS = SingleFlight()
+
+
+def inflight_enabled() -> bool:
+    return bool(getattr(settings, "QUIZ_INFLIGHT_ENABLED", True))
+
+
+def lease_seconds() -> int:
+    return int(getattr(settings, "QUIZ_INFLIGHT_LEASE_SECONDS", 60))
+
+
+def result_seconds() -> int:
+    return int(getattr(settings, "QUIZ_INFLIGHT_RESULT_SECONDS", 30))
+
+
+def poll_seconds() -> float:
+    return float(getattr(settings, "QUIZ_INFLIGHT_POLL_SECONDS", 1.0))
+
+
+def _try_acquire(key: str, owner: str) -> bool:
+    now = timezone.now()
+    # Live owners renew their lease, so expired ones belong to dead owners;
+    # expired results are no longer shared.
+    InflightLease.objects.filter(expires_at__lte=now).delete()
+    try:
+        with transaction.atomic():
+            InflightLease.objects.create(key=key, owner=owner, expires_at=now + timedelta(seconds=lease_seconds()))
+    except IntegrityError:
+        return False
+    return True
+
+
+def renew_lease(key: str, owner: str) -> bool:
+    """
+    Extends a running lease; False once it's no longer ours (expired and taken over).
+    """
+    return bool(
+        InflightLease.objects.filter(key=key, owner=owner, result__isnull=True).update(
+            expires_at=timezone.now() + timedelta(seconds=lease_seconds())
+        )
+    )
+
+
+class LeaseRenewal:
+    """
+    Renews the owner's lease from a background thread every third of
+    QUIZ_INFLIGHT_LEASE_SECONDS while compute() runs.
+    """
+
+    def __init__(self, key: str, owner: str, interval: Optional[float] = None):
+        self.key = key
+        self.owner = owner
+        self.interval = lease_seconds() / 3 if interval is None else interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"inflight-lease-{key}", daemon=True)
+
+    def __enter__(self) -> "LeaseRenewal":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.wait(self.interval):
+                try:
+                    if not renew_lease(self.key, self.owner):
+                        logger.warning("Lost the inflight lease for %s; waiters may run it again.", self.key)
+                        return
+                except Exception:
+                    logger.exception("Renewing the inflight lease for %s failed.", self.key)
+        finally:
+            # the thread's own DB connection
+            connection.close()
+
+
+def _finished_result(key: str) -> Optional[Any]:
+    return (
+        InflightLease.objects.filter(key=key, result__isnull=False, expires_at__gt=timezone.now())
+        .values_list("result", flat=True)
+        .first()
+    )
+
+
+def run_with_lease(key: str, compute: Callable[[], Any]):
+    """
+    Returns (result, role). Waits for another process holding the lease for key,
+    otherwise takes the lease and runs compute().
+    """
+    owner = uuid.uuid4().hex
+    while not _try_acquire(key, owner):
+        result = _finished_result(key)
+        if result is not None:
+            return result, PROCESS
+        time.sleep(poll_seconds())
+
+    try:
+        with LeaseRenewal(key, owner):
+            result = compute()
+    except BaseException:
+        # Waiting processes retry on their own instead of inheriting the error.
+        InflightLease.objects.filter(key=key, owner=owner).delete()
+        raise
+    InflightLease.objects.filter(key=key, owner=owner).update(
+        result=result,
+        expires_at=timezone.now() + timedelta(seconds=result_seconds()),
+    )
+    return result, LEADER
+
+
+def coalesce(key: Optional[str], compute: Callable[[], Any]) -> Any:
+    """
+    compute() once for all concurrent callers with the same key (None = no coalescing).
+    """
+    if not key or not inflight_enabled():
+        return compute()
+
+    (result, role), shared = FLIGHTS.do(key, lambda: run_with_lease(key, compute))
+    if shared:
+        role = THREAD
+    INFLIGHT_REQUESTS.inc(role=role)
+    return result
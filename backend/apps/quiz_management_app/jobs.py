@@ -0,0 +1,292 @@
+import logging
+import threading
+import time
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.models import Count, F
+from django.utils import timezone
+
+from apps.quiz_management_app import metrics
+from apps.quiz_management_app.models import QuizJob
+from apps.quiz_management_app.utils import (
+    InvalidYouTubeUrlError,
+    QuizCreationError,
+    admit_video,
+    create_quiz_from_url,
+    estimate_processing_seconds,
+    is_youtube_url,
+    log_whisper_models,
+    normalize_youtube_url,
+    probe_video,
+    select_whisper_model,
+)
+from apps.quiz_management_app.telemetry import record_pipeline_run
+
+logger = logging.getLogger(__name__)
+
+JOBS_FINISHED = metrics.counter("quiz_jobs_finished_total", "Finished quiz jobs by status.", ("status",))
+JOB_SECONDS = metrics.histogram(
+    "quiz_job_duration_seconds", "Run time of quiz jobs (excluding queue wait).", ("status", "model")
+)
+JOB_QUEUE_SECONDS = metrics.histogram("quiz_job_queue_seconds", "Time jobs spent waiting in the queue.")
+JOBS_BY_STATUS = metrics.gauge("quiz_jobs", "Quiz jobs in the database by status.", ("status",))
+
+
+# -----------------------------
+# Producer side (API)
+# -----------------------------
+def enqueue_quiz_job(url: str, user, fresh: bool = False) -> QuizJob:
+    """
+    Validates the URL and runs the metadata preflight up front (so the client
+    gets a 4xx immediately for unusable videos) and stores a pending job for the worker.
+    fresh=True bypasses quiz reuse for this job.
+    """
+    normalized = normalize_youtube_url(url)
+    if not is_youtube_url(normalized):
+        raise InvalidYouTubeUrlError("Not a YouTube URL.")
+
+    probe = probe_video(normalized)
+    max_seconds = admit_video(probe)
+    return QuizJob.objects.create(
+        user=user,
+        video_url=normalized,
+        fresh=fresh,
+        duration_seconds=probe.duration if probe else None,
+        estimated_seconds=estimate_processing_seconds(probe, max_seconds),
+        max_seconds=max_seconds,
+        video_info=probe.info if probe else None,
+    )
+
+
+# -----------------------------
+# Consumer side (worker)
+# -----------------------------
+def requeue_stale_jobs() -> int:
+    """
+    Running jobs without a heartbeat (updated_at) for QUIZ_JOB_STALE_AFTER seconds belong
+    to a worker that died. They go back to PENDING, or FAILED once QUIZ_JOB_MAX_ATTEMPTS is used up.
+    Long jobs that are still running are kept alive by JobHeartbeat.
+    """
+    stale_after = int(getattr(settings, "QUIZ_JOB_STALE_AFTER", 900))
+    max_attempts = int(getattr(settings, "QUIZ_JOB_MAX_ATTEMPTS", 2))
+    now = timezone.now()
+    stale = QuizJob.objects.filter(
+        status=QuizJob.Status.RUNNING,
+        updated_at__lt=now - timedelta(seconds=stale_after),
+    )
+    failed = stale.filter(attempts__gte=max_attempts).update(
+        status=QuizJob.Status.FAILED,
+        error="Quiz generation did not finish in time.",
+        finished_at=now,
+        updated_at=now,
+    )
+    requeued = stale.filter(attempts__lt=max_attempts).update(
+        status=QuizJob.Status.PENDING,
+        started_at=None,
+        updated_at=now,
+    )
+    return failed + requeued
+
+
+def _next_pending_job_id() -> Optional[int]:
+    """
+    Shortest estimated job first, so one long video can't block everyone.
+    Jobs waiting longer than QUIZ_JOB_MAX_WAIT seconds go first (oldest first)
+    so long videos still get their turn.
+    """
+    pending = QuizJob.objects.filter(status=QuizJob.Status.PENDING)
+    max_wait = int(getattr(settings, "QUIZ_JOB_MAX_WAIT", 600))
+    overdue = (
+        pending.filter(created_at__lt=timezone.now() - timedelta(seconds=max_wait))
+        .order_by("created_at", "id")
+        .values_list("id", flat=True)
+        .first()
+    )
+    if overdue is not None:
+        return overdue
+    return (
+        pending.order_by(F("estimated_seconds").asc(nulls_last=True), "created_at", "id")
+        .values_list("id", flat=True)
+        .first()
+    )
+
+
+def claim_next_job() -> Optional[QuizJob]:
+    """
+    Claims the next pending job with a compare-and-swap UPDATE.
+    This needs no row locks, so it is safe with several workers on SQLite and Postgres.
+    """
+    while True:
+        job_id = _next_pending_job_id()
+        if job_id is None:
+            return None
+
+        now = timezone.now()
+        claimed = QuizJob.objects.filter(id=job_id, status=QuizJob.Status.PENDING).update(
+            status=QuizJob.Status.RUNNING,
+            started_at=now,
+            attempts=F("attempts") + 1,
+            updated_at=now,
+        )
+        if claimed:
+            return QuizJob.objects.select_related("user").get(id=job_id)
+
+
+def heartbeat_seconds() -> float:
+    return float(getattr(settings, "QUIZ_JOB_HEARTBEAT_SECONDS", 60))
+
+
+def touch_job(job_id: int) -> None:
+    QuizJob.objects.filter(id=job_id, status=QuizJob.Status.RUNNING).update(updated_at=timezone.now())
+
+
+class JobHeartbeat:
+    """
+    Bumps a running job's updated_at from a background thread every
+    QUIZ_JOB_HEARTBEAT_SECONDS, so requeue_stale_jobs() leaves long transcriptions alone
+    and only requeues jobs whose worker stopped beating.
+    """
+
+    def __init__(self, job_id: int, interval: Optional[float] = None):
+        self.job_id = job_id
+        self.interval = heartbeat_seconds() if interval is None else interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"quiz-job-{job_id}-heartbeat", daemon=True)
+
+    def __enter__(self) -> "JobHeartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.wait(self.interval):
+                try:
+                    touch_job(self.job_id)
+                except Exception:
+                    logger.exception("Heartbeat for quiz job %s failed.", self.job_id)
+        finally:
+            # the thread's own DB connection
+            connection.close()
+
+
+def _pick_whisper_model(job: QuizJob) -> str:
+    audio_seconds = job.duration_seconds
+    if audio_seconds and job.max_seconds:
+        audio_seconds = min(audio_seconds, job.max_seconds)
+    queue_depth = QuizJob.objects.filter(status=QuizJob.Status.PENDING).count()
+    return select_whisper_model(audio_seconds, queue_depth)
+
+
+def _question_saver(job: QuizJob):
+    """
+    Stores each streamed question on the job as it arrives, so the status endpoint
+    can show the first questions before the quiz is complete. They are only a preview:
+    _finish() replaces them with the saved quiz's questions (repair may trim or
+    replace streamed ones) or clears them when the job fails.
+    """
+
+    def on_question(question) -> None:
+        job.partial_questions = [*job.partial_questions, question]
+        job.save(update_fields=["partial_questions", "updated_at"])
+
+    return on_question
+
+
+def run_job(job: QuizJob) -> QuizJob:
+    job.whisper_model = _pick_whisper_model(job)
+    job.partial_questions = []
+    job.save(update_fields=["whisper_model", "partial_questions", "updated_at"])
+    quiz = None
+    with metrics.trace() as trace, JobHeartbeat(job.pk):
+        try:
+            quiz = create_quiz_from_url(
+                job.video_url,
+                job.user,
+                fresh=job.fresh,
+                max_seconds=job.max_seconds,
+                model_name=job.whisper_model,
+                on_question=_question_saver(job),
+                video_info=job.video_info,
+            )
+        except InvalidYouTubeUrlError:
+            _finish(job, QuizJob.Status.FAILED, error="Only YouTube URLs are allowed.")
+        except QuizCreationError as e:
+            _finish(job, QuizJob.Status.FAILED, error=str(e))
+        except Exception:
+            logger.exception("Unexpected error while running quiz job %s.", job.pk)
+            _finish(job, QuizJob.Status.FAILED, error="Unexpected error while creating the quiz.")
+        else:
+            _finish(job, QuizJob.Status.SUCCEEDED, quiz=quiz)
+
+    try:
+        record_pipeline_run(trace, job, quiz)
+    except Exception:
+        logger.exception("Could not record telemetry for quiz job %s.", job.pk)
+    return job
+
+
+def _finish(job: QuizJob, status: str, quiz=None, error: str = "") -> None:
+    job.status = status
+    job.quiz = quiz
+    job.error = error
+    job.finished_at = timezone.now()
+    # Signed stream URLs in the probe info expire anyway; don't keep them around.
+    job.video_info = None
+    job.partial_questions = _final_questions(quiz)
+    job.save(update_fields=["status", "quiz", "error", "finished_at", "video_info", "partial_questions", "updated_at"])
+
+    JOBS_FINISHED.inc(status=status)
+    if job.started_at:
+        JOB_SECONDS.observe((job.finished_at - job.started_at).total_seconds(), status=status, model=job.whisper_model)
+        JOB_QUEUE_SECONDS.observe(max((job.started_at - job.created_at).total_seconds(), 0.0))
+
+
+def _final_questions(quiz) -> list:
+    if quiz is None:
+        return []
+    return [
+        {"question_title": q.question_title, "question_options": list(q.question_options), "answer": q.answer}
+        for q in quiz.questions.all()
+    ]
+
+
+def collect_job_metrics() -> None:
+    """
+    Refreshes the per-status job gauges (one GROUP BY query); call from a request thread.
+    """
+    counts = dict(QuizJob.objects.values("status").annotate(n=Count("id")).values_list("status", "n"))
+    for status in QuizJob.Status.values:
+        JOBS_BY_STATUS.set(counts.get(status, 0), status=status)
+
+
+def run_worker(poll_interval: Optional[float] = None, once: bool = False, should_stop=None) -> int:
+    """
+    Main worker loop. Returns the number of processed jobs.
+    - once=True drains the queue and returns (handy for cron and tests)
+    - should_stop is an optional callable checked between jobs (signal handling)
+    """
+    if poll_interval is None:
+        poll_interval = float(getattr(settings, "QUIZ_JOB_POLL_INTERVAL", 2.0))
+
+    processed = 0
+    while not (should_stop and should_stop()):
+        close_old_connections()
+        requeue_stale_jobs()
+        job = claim_next_job()
+        if job is None:
+            if once:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        run_job(job)
+        log_whisper_models()
+        processed += 1
+    return processed
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from apps.quiz_management_app.caches import quiz_payload_cache_stats, transcript_cache_stats
+from apps.quiz_management_app.models import Quiz
+
+
+class Command(BaseCommand):
+    help = "Shows size and hit/miss counters of the quiz pipeline caches."
+
+    def handle(self, *args, **options):
+        for name, stats in (("transcript", transcript_cache_stats()), ("quiz payload", quiz_payload_cache_stats())):
+            self.stdout.write(
+                f"{name}: "
+                f"{stats['entries']} entries, {stats['size_bytes']} bytes, "
+                f"{stats['hits']} hits, {stats['misses']} misses, "
+                f"hit rate {stats['hit_rate']:.1%}"
+            )
+
+        sources = (
+            Quiz.objects.exclude(transcript_source="")
+            .values("transcript_source")
+            .annotate(n=Count("id"))
+            .order_by("transcript_source")
+        )
+        total = sum(row["n"] for row in sources)
+        if total:
+            parts = ", ".join(f"{row['transcript_source']}={row['n']} ({row['n'] / total:.0%})" for row in sources)
+            self.stdout.write(f"transcript sources: {parts}")
@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.quiz_management_app.telemetry import PERCENTILES, pipeline_report
+
+
+class Command(BaseCommand):
+    help = (
+        "Shows p50/p95/p99 per pipeline stage, the Whisper real-time factor and LLM time/prompt tokens "
+        "per generation strategy from recorded telemetry."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hours",
+            type=float,
+            default=24.0,
+            help="Time window to report on, counted back from now (default: 24).",
+        )
+
+    def handle(self, *args, **options):
+        since = timezone.now() - timedelta(hours=options["hours"])
+        report = pipeline_report(since)
+        if not report["runs"]:
+            self.stdout.write(f"no pipeline runs since {since:%Y-%m-%d %H:%M}")
+            return
+
+        outcomes = ", ".join(f"{k}={v}" for k, v in sorted(report["outcomes"].items()))
+        self.stdout.write(f"runs since {since:%Y-%m-%d %H:%M}: {report['runs']} ({outcomes})")
+        if report["failures"]:
+            parts = ", ".join(f"{k}={v}" for k, v in sorted(report["failures"].items()))
+            self.stdout.write(f"failed stages: {parts}")
+
+        header = f"{'stage':<18} {'n':>6}" + "".join(f" {f'p{q} s':>9}" for q in PERCENTILES)
+        self.stdout.write(header)
+        for name, row in list(report["stages"].items()) + [("total", report["total"])]:
+            self.stdout.write(self._row(name, row))
+
+        if report["whisper_rtf"]:
+            self.stdout.write(f"{'whisper RTF':<18} {'n':>6}" + "".join(f" {f'p{q}':>9}" for q in PERCENTILES))
+            for model, row in report["whisper_rtf"].items():
+                self.stdout.write(self._row(model, row))
+
+        if report["llm_seconds"]:
+            self.stdout.write(f"{'llm strategy':<18} {'n':>6}" + "".join(f" {f'p{q} s':>9}" for q in PERCENTILES))
+            for strategy, row in report["llm_seconds"].items():
+                self.stdout.write(self._row(strategy, row))
+        if report["prompt_tokens"]:
+            self.stdout.write(f"{'prompt tokens':<18} {'n':>6}" + "".join(f" {f'p{q}':>9}" for q in PERCENTILES))
+            for strategy, row in report["prompt_tokens"].items():
+                self.stdout.write(self._row(strategy, row, "{:>9.0f}"))
+
+    def _row(self, name, row, fmt="{:>9.3f}"):
+        return f"{name:<18} {row['count']:>6}" + "".join(" " + fmt.format(row[f"p{q}"]) for q in PERCENTILES)
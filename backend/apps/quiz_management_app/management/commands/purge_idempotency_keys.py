@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.quiz_management_app.idempotency import idempotency_key_ttl, purge_expired_idempotency_keys
+
+
+class Command(BaseCommand):
+    help = "Deletes Idempotency-Key records older than settings.IDEMPOTENCY_KEY_TTL."
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_idempotency_keys()
+        self.stdout.write(f"Deleted {deleted} idempotency key(s) older than {idempotency_key_ttl()}.")
@@ -0,0 +1,72 @@
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.quiz_management_app import metrics
+
+from apps.quiz_management_app.jobs import run_worker
+from apps.quiz_management_app.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = "Processes queued quiz generation jobs (download, transcription, Gemini)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process all pending jobs and exit instead of polling forever.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=None,
+            help="Seconds to sleep when the queue is empty (default: settings.QUIZ_JOB_POLL_INTERVAL).",
+        )
+        parser.add_argument(
+            "--metrics-port",
+            type=int,
+            default=None,
+            help="Serve Prometheus metrics on this port (default: settings.QUIZ_WORKER_METRICS_PORT, 0 = off).",
+        )
+        parser.add_argument(
+            "--no-warmup",
+            action="store_true",
+            help="Don't load and warm the Whisper model before taking the first job.",
+        )
+
+    def handle(self, *args, **options):
+        stop = {"requested": False}
+
+        def _request_stop(signum, frame):
+            stop["requested"] = True
+            self.stdout.write("Stopping after the current job...")
+
+        signal.signal(signal.SIGTERM, _request_stop)
+        signal.signal(signal.SIGINT, _request_stop)
+
+        port = options["metrics_port"]
+        if port is None:
+            port = int(getattr(settings, "QUIZ_WORKER_METRICS_PORT", 0))
+        if port:
+            token = getattr(settings, "METRICS_TOKEN", "")
+            # Same rule as the web /metrics: without a token only local scrapers get in.
+            addr = "0.0.0.0" if token else "127.0.0.1"
+            metrics.start_http_server(port, addr=addr, token=token)
+            self.stdout.write(f"Serving metrics on {addr}:{port}/metrics")
+
+        if not options["no_warmup"]:
+            try:
+                warm_up()
+            except Exception as e:
+                # Not fatal: the model is loaded lazily by the first job instead.
+                self.stderr.write(f"Whisper warm-up failed: {e}")
+
+        self.stdout.write("Quiz worker started.")
+        processed = run_worker(
+            poll_interval=options["poll_interval"],
+            once=options["once"],
+            should_stop=lambda: stop["requested"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Quiz worker stopped after {processed} job(s)."))
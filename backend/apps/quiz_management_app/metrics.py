@@ -0,0 +1,324 @@
+"""
+In-process metrics in the Prometheus text exposition format (no client library needed).
+
+Each process keeps its own counters: the web process serves them on /metrics,
+the quiz worker on `run_quiz_worker --metrics-port`. No Django imports.
+"""
+import hmac
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items
+        ]
+
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # per label set: [bucket counts..., sum, count]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            row = self._values.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            row = self._values.get(self._key(labels))
+            return int(row[-1]) if row else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        lines = self.header()
+        for key, row in items:
+            for bound, n in zip(self.buckets, row):
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(n)}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(row[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {_format_value(row[-1])}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def add_collector(self, fn: Callable[[], None]) -> None:
+        """
+        fn runs right before rendering, e.g. to refresh gauges from current state.
+        """
+        with self._lock:
+            if fn not in self._collectors:
+                self._collectors.append(fn)
+
+    def render(self) -> str:
+        with self._lock:
+            collectors = list(self._collectors)
+            metrics = list(self._metrics.values())
+        for fn in collectors:
+            try:
+                fn()
+            except Exception as e:
+                print(f"[metrics] collector {getattr(fn, '__name__', fn)} failed: {e}", flush=True)
+        lines: List[str] = []
+        for m in metrics:
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, help_text, labelnames))
+
+
+def gauge(name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, help_text, labelnames))
+
+
+def histogram(
+    name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+) -> Histogram:
+    return REGISTRY.register(Histogram(name, help_text, labelnames, buckets))
+
+
+# -----------------------------
+# Pipeline stages
+# -----------------------------
+STAGE_LABELS = ("stage", "model", "cache", "outcome")
+
+STAGE_SECONDS = histogram(
+    "quiz_stage_duration_seconds",
+    "Duration of each quiz pipeline stage.",
+    STAGE_LABELS,
+)
+STAGE_FAILURES = counter(
+    "quiz_stage_failures_total",
+    "Pipeline stage failures by stage and exception type.",
+    ("stage", "error"),
+)
+
+
+class Span:
+    def __init__(self, stage: str, labels: Dict[str, str]):
+        self.stage = stage
+        self.labels = dict(labels)
+
+
+class Trace:
+    """
+    Per-run record of stage durations (summed if a stage repeats) and free-form
+    facts (audio seconds, token counts, ...) for persisted telemetry.
+    Stages can nest (decode runs inside transcribe), so the run's duration is
+    the wall-clock time of the trace, not the sum of its stages.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.info: Dict[str, object] = {}
+        self.failed_stage = ""
+        self._started = time.perf_counter()
+        self._finished: Optional[float] = None
+
+    @property
+    def seconds(self) -> float:
+        """
+        Wall-clock time of the trace block (so far, while it is still open).
+        """
+        end = self._finished if self._finished is not None else time.perf_counter()
+        return end - self._started
+
+
+_local = threading.local()
+
+
+def current_trace() -> Optional[Trace]:
+    return getattr(_local, "trace", None)
+
+
+@contextmanager
+def trace() -> Iterator[Trace]:
+    """
+    Collects the stages run by this thread inside the block.
+    """
+    previous = current_trace()
+    _local.trace = Trace()
+    try:
+        yield _local.trace
+    finally:
+        _local.trace._finished = time.perf_counter()
+        _local.trace = previous
+
+
+def annotate(**info) -> None:
+    """
+    Adds facts to the current trace; no-op outside trace().
+    """
+    t = current_trace()
+    if t is not None:
+        t.info.update({k: v for k, v in info.items() if v is not None})
+
+
+@contextmanager
+def stage(name: str, **labels: str) -> Iterator[Span]:
+    """
+    Times a pipeline stage. Labels (model, cache) can be filled in while the stage
+    runs via span.labels; outcome is "ok" or "error" (which also bumps the failure counter).
+    """
+    span = Span(name, labels)
+    t0 = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield span
+    except BaseException as e:
+        outcome = "error"
+        STAGE_FAILURES.inc(stage=name, error=type(e).__name__)
+        t = current_trace()
+        if t is not None and not t.failed_stage:
+            t.failed_stage = name
+        raise
+    finally:
+        seconds = time.perf_counter() - t0
+        STAGE_SECONDS.observe(seconds, stage=name, outcome=outcome, **span.labels)
+        t = current_trace()
+        if t is not None:
+            t.stages[name] = t.stages.get(name, 0.0) + seconds
+
+
+# -----------------------------
+# Standalone HTTP exposition (worker process)
+# -----------------------------
+def bearer_token_matches(authorization: Optional[str], token: str) -> bool:
+    """
+    Constant-time check of an `Authorization: Bearer <token>` header value.
+    """
+    scheme, _, value = (authorization or "").partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(value.strip().encode(), token.encode())
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        token = getattr(self.server, "metrics_token", "")
+        if token and not bearer_token_matches(self.headers.get("Authorization"), token):
+            self.send_response(401)
+            self.send_header("WWW-Authenticate", "Bearer")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = REGISTRY.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server(port: int, addr: str = "127.0.0.1", token: str = "") -> ThreadingHTTPServer:
+    """
+    Serves GET /metrics from a daemon thread (for processes without Django's URLconf).
+    With a token, requests need `Authorization: Bearer <token>`.
+    """
+    server = ThreadingHTTPServer((addr, port), _Handler)
+    server.metrics_token = token
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
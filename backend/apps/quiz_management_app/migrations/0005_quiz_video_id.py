@@ -0,0 +1,42 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+from apps.quiz_management_app.youtube import extract_youtube_video_id
+
+
+def backfill_video_id(apps, schema_editor):
+    Quiz = apps.get_model("quiz_management_app", "Quiz")
+    batch = []
+    for quiz in Quiz.objects.filter(video_id="").only("id", "video_url").iterator():
+        video_id = extract_youtube_video_id(quiz.video_url)
+        if video_id:
+            quiz.video_id = video_id
+            batch.append(quiz)
+        if len(batch) >= 500:
+            Quiz.objects.bulk_update(batch, ["video_id"])
+            batch = []
+    if batch:
+        Quiz.objects.bulk_update(batch, ["video_id"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_management_app', '0004_transcript_cache'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='video_id',
+            field=models.CharField(blank=True, default='', max_length=11),
+        ),
+        migrations.RunPython(backfill_video_id, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['video_id', '-created_at'], name='quiz_manage_video_i_f60e07_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_management_app', '0005_quiz_video_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizjob',
+            name='fresh',
+            field=models.BooleanField(default=False),
+        ),
+    ]
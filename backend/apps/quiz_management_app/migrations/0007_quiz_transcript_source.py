@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_management_app', '0006_quizjob_fresh'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='transcript_source',
+            field=models.CharField(blank=True, choices=[('whisper', 'Whisper'), ('captions_manual', 'YouTube subtitles'), ('captions_auto', 'YouTube auto-captions')], default='', max_length=32),
+        ),
+    ]
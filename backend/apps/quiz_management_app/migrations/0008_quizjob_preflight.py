@@ -0,0 +1,28 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_management_app', '0007_quiz_transcript_source'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizjob',
+            name='duration_seconds',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='quizjob',
+            name='estimated_seconds',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='quizjob',
+            name='max_seconds',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_management_app', '0008_quizjob_preflight'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizjob',
+            name='whisper_model',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_management_app', '0009_quizjob_whisper_model'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PipelineTelemetry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('outcome', models.CharField(choices=[('ok', 'OK'), ('error', 'Error')], default='ok', max_length=8)),
+                ('failed_stage', models.CharField(blank=True, default='', max_length=32)),
+                ('stages', models.JSONField(default=dict)),
+                ('total_seconds', models.FloatField(default=0.0)),
+                ('audio_seconds', models.FloatField(blank=True, null=True)),
+                ('transcript_chars', models.PositiveIntegerField(blank=True, null=True)),
+                ('transcript_source', models.CharField(blank=True, default='', max_length=20)),
+                ('prompt_tokens', models.PositiveIntegerField(blank=True, null=True)),
+                ('response_tokens', models.PositiveIntegerField(blank=True, null=True)),
+                ('whisper_model', models.CharField(blank=True, default='', max_length=32)),
+                ('llm_model', models.CharField(blank=True, default='', max_length=64)),
+                ('attempts', models.PositiveSmallIntegerField(default=1)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('job', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='telemetry', to='quiz_management_app.quizjob')),
+                ('quiz', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='telemetry', to='quiz_management_app.quiz')),
+            ],
+            options={
+                'ordering': ('-created_at',),
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_management_app', '0010_pipeline_telemetry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizjob',
+            name='partial_questions',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
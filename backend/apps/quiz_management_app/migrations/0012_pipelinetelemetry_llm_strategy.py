@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_management_app', '0011_quizjob_partial_questions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pipelinetelemetry',
+            name='llm_strategy',
+            field=models.CharField(blank=True, default='', max_length=16),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_management_app', '0012_pipelinetelemetry_llm_strategy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizPayloadCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('transcript_hash', models.CharField(max_length=64)),
+                ('prompt_version', models.CharField(max_length=64)),
+                ('model_name', models.CharField(max_length=64)),
+                ('payload', models.JSONField()),
+                ('size_bytes', models.PositiveIntegerField(default=0)),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['last_used_at'], name='quiz_manage_last_us_5432d4_idx'),
+                    models.Index(fields=['created_at'], name='quiz_manage_created_f4f511_idx'),
+                ],
+                'constraints': [models.UniqueConstraint(fields=('transcript_hash', 'prompt_version', 'model_name'), name='uniq_quiz_payload_cache_key')],
+            },
+        ),
+    ]
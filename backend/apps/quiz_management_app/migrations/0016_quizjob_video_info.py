@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 16:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_management_app', '0015_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizjob',
+            name='video_info',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
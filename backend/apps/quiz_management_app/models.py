@@ -1,11 +1,33 @@
 from django.conf import settings
 from django.db import models
 
+from apps.quiz_management_app.youtube import extract_youtube_video_id
+
+
+class TranscriptSource(models.TextChoices):
+    WHISPER = "whisper", "Whisper"
+    CAPTIONS_MANUAL = "captions_manual", "YouTube subtitles"
+    CAPTIONS_AUTO = "captions_auto", "YouTube auto-captions"
+
+
+class QuizQuerySet(models.QuerySet):
+    def for_video(self, url_or_id: str):
+        """
+        Quizzes for the same video, whatever URL shape was submitted.
+        Accepts a URL or a bare video id.
+        """
+        video_id = extract_youtube_video_id(url_or_id) or (url_or_id or "").strip()
+        if not video_id:
+            return self.none()
+        return self.filter(video_id=video_id)
+
 
 class Quiz(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField()
     video_url = models.URLField()
+    video_id = models.CharField(max_length=11, blank=True, default="")
+    transcript_source = models.CharField(max_length=32, choices=TranscriptSource.choices, blank=True, default="")
 
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -16,15 +38,23 @@ class Quiz(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = QuizQuerySet.as_manager()
+
     class Meta:
         ordering = ("-created_at",)
         indexes = [
             models.Index(fields=["user", "-created_at"]),
+            models.Index(fields=["video_id", "-created_at"]),
         ]
 
     def __str__(self) -> str:
         return f"{self.title} (#{self.pk})"
 
+    def save(self, *args, **kwargs):
+        if not self.video_id:
+            self.video_id = extract_youtube_video_id(self.video_url) or ""
+        super().save(*args, **kwargs)
+
 
 class QuizQuestion(models.Model):
     quiz = models.ForeignKey(
@@ -45,4 +75,241 @@ class QuizQuestion(models.Model):
 
     def __str__(self) -> str:
         quiz_id = getattr(self, "quiz_id", None)
-        return f"Q{self.pk} for Quiz#{quiz_id}"
\ No newline at end of file
+        return f"Q{self.pk} for Quiz#{quiz_id}"
+
+
+class QuizJob(models.Model):
+    """
+    A queued quiz generation request.
+    Rows are claimed by `manage.py run_quiz_worker`, so the API never runs the pipeline itself.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="quiz_jobs",
+    )
+    video_url = models.URLField()
+    fresh = models.BooleanField(default=False)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    quiz = models.ForeignKey(
+        Quiz,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="jobs",
+    )
+    error = models.TextField(blank=True, default="")
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    # Filled by the preflight probe at enqueue time.
+    duration_seconds = models.FloatField(null=True, blank=True)
+    estimated_seconds = models.FloatField(null=True, blank=True)
+    max_seconds = models.PositiveIntegerField(null=True, blank=True)
+    # Trimmed yt-dlp info from the probe, so the worker doesn't extract it again (cleared when done).
+    video_info = models.JSONField(null=True, blank=True)
+    # Whisper tier picked when the job ran (see utils.select_whisper_model).
+    whisper_model = models.CharField(max_length=32, blank=True, default="")
+    # Questions validated so far while Gemini streams (settings.GEMINI_STREAMING).
+    partial_questions = models.JSONField(default=list, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"Job#{self.pk} ({self.status})"
+
+
+class IdempotencyKey(models.Model):
+    """
+    Idempotency-Key of a POST /api/createQuiz/ request, per user.
+    `status_code` stays empty while the first request is being handled; replays
+    with the same key get the stored outcome (the job, or the error response).
+    Rows older than settings.IDEMPOTENCY_KEY_TTL are removed by `manage.py purge_idempotency_keys`.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="idempotency_keys",
+    )
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    job = models.ForeignKey(
+        QuizJob,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="idempotency_keys",
+    )
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response = models.JSONField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "key"], name="uniq_idempotency_key_per_user"),
+        ]
+        indexes = [
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"Idempotency-Key {self.key} ({self.status_code or 'pending'})"
+
+
+class PipelineTelemetry(models.Model):
+    """
+    One row per pipeline run (successful or not), for percentile reports across
+    deploys (`manage.py pipeline_report`). stages maps stage name -> seconds.
+    """
+
+    class Outcome(models.TextChoices):
+        OK = "ok", "OK"
+        ERROR = "error", "Error"
+
+    quiz = models.ForeignKey(Quiz, on_delete=models.SET_NULL, null=True, blank=True, related_name="telemetry")
+    job = models.ForeignKey(QuizJob, on_delete=models.SET_NULL, null=True, blank=True, related_name="telemetry")
+    outcome = models.CharField(max_length=8, choices=Outcome.choices, default=Outcome.OK)
+    failed_stage = models.CharField(max_length=32, blank=True, default="")
+
+    stages = models.JSONField(default=dict)
+    total_seconds = models.FloatField(default=0.0)
+    audio_seconds = models.FloatField(null=True, blank=True)
+    transcript_chars = models.PositiveIntegerField(null=True, blank=True)
+    transcript_source = models.CharField(max_length=20, blank=True, default="")
+    prompt_tokens = models.PositiveIntegerField(null=True, blank=True)
+    response_tokens = models.PositiveIntegerField(null=True, blank=True)
+    whisper_model = models.CharField(max_length=32, blank=True, default="")
+    llm_model = models.CharField(max_length=64, blank=True, default="")
+    # "direct" or "map_reduce" (see utils.prepare_transcript)
+    llm_strategy = models.CharField(max_length=16, blank=True, default="")
+    attempts = models.PositiveSmallIntegerField(default=1)
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ("-created_at",)
+
+    def __str__(self) -> str:
+        return f"Telemetry#{self.pk} ({self.outcome}, {self.total_seconds:.1f}s)"
+
+
+class TranscriptCacheEntry(models.Model):
+    """
+    Persistent transcript store, keyed by (video id, Whisper model, transcription options).
+    `last_used_at` drives the LRU eviction in `apps.quiz_management_app.caches`.
+    """
+
+    video_id = models.CharField(max_length=32)
+    model_name = models.CharField(max_length=64)
+    options_key = models.CharField(max_length=64)
+    transcript = models.TextField()
+    size_bytes = models.PositiveIntegerField(default=0)
+    hit_count = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["video_id", "model_name", "options_key"],
+                name="uniq_transcript_cache_key",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["last_used_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"Transcript {self.video_id} ({self.model_name})"
+
+
+class QuizPayloadCacheEntry(models.Model):
+    """
+    Validated Gemini quiz payloads, keyed by (sha256 of the normalized transcript,
+    prompt version, LLM model). TTL and LRU eviction live in `apps.quiz_management_app.caches`.
+    """
+
+    transcript_hash = models.CharField(max_length=64)
+    prompt_version = models.CharField(max_length=64)
+    model_name = models.CharField(max_length=64)
+    payload = models.JSONField()
+    size_bytes = models.PositiveIntegerField(default=0)
+    hit_count = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["transcript_hash", "prompt_version", "model_name"],
+                name="uniq_quiz_payload_cache_key",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["last_used_at"]),
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"Quiz payload {self.transcript_hash[:12]} ({self.model_name})"
+
+
+class InflightLease(models.Model):
+    """
+    Cross-process single-flight lease for one video (see `apps.quiz_management_app.inflight`).
+    `result` stays empty while the owner runs the pipeline; afterwards it holds the
+    shared payload until `expires_at`, so processes waiting for the lease can pick it up.
+    """
+
+    key = models.CharField(max_length=64, unique=True)
+    owner = models.CharField(max_length=64)
+    result = models.JSONField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["expires_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"Lease {self.key} ({'done' if self.result is not None else 'running'})"
+
+
+class CacheCounter(models.Model):
+    """
+    Hit/miss counters per cache, shared by the API and worker processes.
+    """
+
+    name = models.CharField(max_length=64, unique=True)
+    hits = models.PositiveBigIntegerField(default=0)
+    misses = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.hits} hits / {self.misses} misses"
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -0,0 +1,123 @@
+"""
+Incremental parser for a quiz JSON document that arrives in chunks (Gemini streaming).
+
+QuizStreamParser.feed() returns every question object whose closing brace has
+arrived, so questions can be validated and shown before the model has finished
+the whole quiz. Top-level string fields (title, description) are picked up as
+they complete. Text before the first "{" (stray prose, backticks) is skipped,
+like utils.extract_json does for complete responses.
+
+Like gemini_pool, this module has no Django imports.
+"""
+import json
+from typing import Any, Dict, List, Optional
+
+QUESTIONS_KEY = "questions"
+
+
+class QuizStreamParser:
+    def __init__(self):
+        self._buf = ""
+        self._pos = 0
+        self._started = False
+        # Open containers: "{" or "[". The root object is _stack[0].
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        # Root object bookkeeping: last key and whether its value comes next.
+        self._key: Optional[str] = None
+        self._expect_value = False
+        self._in_questions = False
+        self._object_start = 0
+        self.fields: Dict[str, Any] = {}
+        self.questions: List[Any] = []
+
+    @property
+    def text(self) -> str:
+        """
+        Everything fed so far.
+        """
+        return self._buf
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Consumes the next piece of text; returns the questions completed by it.
+        """
+        if not chunk:
+            return []
+        self._buf += chunk
+        completed: List[Any] = []
+
+        buf = self._buf
+        while self._pos < len(buf):
+            i = self._pos
+            ch = buf[i]
+            self._pos += 1
+
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._stack.append("{")
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if len(self._stack) == 1:
+                        self._root_string(buf[self._string_start : i + 1])
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch in "{[":
+                if len(self._stack) == 1 and ch == "[" and self._expect_value and self._key == QUESTIONS_KEY:
+                    self._in_questions = True
+                self._stack.append(ch)
+                if ch == "{" and len(self._stack) == 3 and self._in_questions:
+                    self._object_start = i
+            elif ch in "}]":
+                if not self._stack:
+                    continue
+                if ch == "}" and len(self._stack) == 3 and self._in_questions:
+                    completed.append(self._load(buf[self._object_start : i + 1]))
+                if ch == "]" and len(self._stack) == 2 and self._in_questions:
+                    self._in_questions = False
+                self._stack.pop()
+            elif len(self._stack) == 1:
+                if ch == ":":
+                    self._expect_value = True
+                elif ch == ",":
+                    self._key, self._expect_value = None, False
+
+        self.questions.extend(completed)
+        return completed
+
+    @property
+    def complete(self) -> bool:
+        """
+        True once the root object has been closed.
+        """
+        return self._started and not self._stack
+
+    def _root_string(self, literal: str) -> None:
+        value = self._load(literal)
+        if self._expect_value:
+            if self._key is not None:
+                self.fields[self._key] = value
+            self._expect_value = False
+        else:
+            self._key = value
+
+    @staticmethod
+    def _load(literal: str) -> Any:
+        try:
+            return json.loads(literal)
+        except json.JSONDecodeError:
+            # Handed to _validate_question, which rejects it like any other bad question.
+            return None
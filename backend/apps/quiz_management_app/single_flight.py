@@ -0,0 +1,74 @@
+"""
+In-process request coalescing ("single flight").
+
+SingleFlight.do(key, fn) runs fn once per key at a time: threads that ask for
+the same key while it is running wait for the first call and get its result
+(or its exception) instead of running fn again. Nothing is kept after the call
+finishes; the next caller for the key runs fn again.
+
+After os.fork() the child starts with no calls in flight: the parent's threads
+(and their events) don't exist there.
+
+Like gemini_pool, this module has no Django imports; inflight.py adds the
+cross-process lease on top.
+"""
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._forget)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Returns (result, shared); shared is True for callers that waited for another thread.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value, False
+
+    def waiting(self, key: Hashable) -> int:
+        """
+        Number of threads currently waiting for the call running under key.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            return call.waiters if call is not None else 0
+
+    def _forget(self) -> None:
+        self._lock = threading.Lock()
+        self._calls = {}
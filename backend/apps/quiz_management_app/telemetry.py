@@ -0,0 +1,119 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from django.conf import settings
+
+from apps.quiz_management_app.metrics import Trace
+from apps.quiz_management_app.models import PipelineTelemetry, QuizJob
+
+PERCENTILES = (50, 95, 99)
+
+
+def telemetry_enabled() -> bool:
+    return bool(getattr(settings, "PIPELINE_TELEMETRY_ENABLED", True))
+
+
+# -----------------------------
+# Recording
+# -----------------------------
+def record_pipeline_run(trace: Trace, job: QuizJob, quiz=None) -> Optional[PipelineTelemetry]:
+    """
+    Persists one row for a finished pipeline run. Audio seconds fall back to the
+    preflight duration (capped by max_seconds) when the audio wasn't decoded here.
+    """
+    if not telemetry_enabled():
+        return None
+    info = trace.info
+    audio_seconds = info.get("audio_seconds")
+    if audio_seconds is None and "transcribe" in trace.stages and job.duration_seconds:
+        audio_seconds = min(job.duration_seconds, job.max_seconds or job.duration_seconds)
+
+    return PipelineTelemetry.objects.create(
+        quiz=quiz,
+        job=job,
+        outcome=PipelineTelemetry.Outcome.OK if quiz is not None else PipelineTelemetry.Outcome.ERROR,
+        failed_stage=trace.failed_stage,
+        stages={name: round(seconds, 4) for name, seconds in trace.stages.items()},
+        total_seconds=round(trace.seconds, 4),
+        audio_seconds=audio_seconds,
+        transcript_chars=info.get("transcript_chars"),
+        transcript_source=info.get("transcript_source", ""),
+        prompt_tokens=info.get("prompt_tokens"),
+        response_tokens=info.get("response_tokens"),
+        whisper_model=job.whisper_model if "transcribe" in trace.stages else "",
+        llm_model=info.get("llm_model", ""),
+        llm_strategy=info.get("llm_strategy", ""),
+        attempts=job.attempts or 1,
+    )
+
+
+# -----------------------------
+# Reporting
+# -----------------------------
+def percentile(values: Sequence[float], q: float) -> float:
+    """
+    Linear-interpolated percentile (same as numpy's default); values need not be sorted.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def _summary(values: List[float]) -> Dict[str, Any]:
+    row: Dict[str, Any] = {"count": len(values)}
+    for q in PERCENTILES:
+        row[f"p{q}"] = percentile(values, q)
+    return row
+
+
+def pipeline_report(since: datetime, rows: Optional[Iterable[PipelineTelemetry]] = None) -> Dict[str, Any]:
+    """
+    Per-stage p50/p95/p99, Whisper real-time factor (transcribe seconds per
+    audio second, per model) and LLM seconds/prompt tokens per generation
+    strategy over the runs recorded since `since`.
+    """
+    if rows is None:
+        rows = PipelineTelemetry.objects.filter(created_at__gte=since).only(
+            "outcome", "failed_stage", "stages", "total_seconds", "audio_seconds", "whisper_model",
+            "llm_strategy", "prompt_tokens",
+        )
+
+    stages: Dict[str, List[float]] = defaultdict(list)
+    rtf: Dict[str, List[float]] = defaultdict(list)
+    llm_seconds: Dict[str, List[float]] = defaultdict(list)
+    prompt_tokens: Dict[str, List[float]] = defaultdict(list)
+    totals: List[float] = []
+    outcomes: Dict[str, int] = defaultdict(int)
+    failures: Dict[str, int] = defaultdict(int)
+
+    for row in rows:
+        outcomes[row.outcome] += 1
+        if row.failed_stage:
+            failures[row.failed_stage] += 1
+        totals.append(row.total_seconds)
+        row_stages = row.stages or {}
+        for name, seconds in row_stages.items():
+            stages[name].append(float(seconds))
+        transcribe = row_stages.get("transcribe")
+        if transcribe is not None and row.audio_seconds and row.whisper_model and row.outcome == "ok":
+            rtf[row.whisper_model].append(float(transcribe) / row.audio_seconds)
+        if row.llm_strategy and row.outcome == "ok":
+            llm_seconds[row.llm_strategy].append(float(row_stages.get("llm", 0.0)) + float(row_stages.get("llm_map", 0.0)))
+            if row.prompt_tokens is not None:
+                prompt_tokens[row.llm_strategy].append(float(row.prompt_tokens))
+
+    return {
+        "runs": sum(outcomes.values()),
+        "outcomes": dict(outcomes),
+        "failures": dict(failures),
+        "total": _summary(totals),
+        "stages": {name: _summary(values) for name, values in sorted(stages.items())},
+        "whisper_rtf": {model: _summary(values) for model, values in sorted(rtf.items())},
+        "llm_seconds": {strategy: _summary(values) for strategy, values in sorted(llm_seconds.items())},
+        "prompt_tokens": {strategy: _summary(values) for strategy, values in sorted(prompt_tokens.items())},
+    }
@@ -7,6 +7,25 @@ from apps.quiz_management_app.models import Quiz, QuizQuestion
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def _no_caption_lookups(settings):
+    """
+    The caption fast path and the preflight probe talk to YouTube;
+    tests opt back in explicitly.
+    """
+    settings.CAPTIONS_ENABLED = False
+    settings.VIDEO_PREFLIGHT_ENABLED = False
+
+
+@pytest.fixture(autouse=True)
+def _no_inflight_sharing(settings):
+    """
+    A finished single-flight result is shared for a few seconds, which would
+    turn back-to-back pipeline runs in one test into one; tests opt back in explicitly.
+    """
+    settings.QUIZ_INFLIGHT_ENABLED = False
+
+
 @pytest.fixture
 def api_client():
     return APIClient()
@@ -44,7 +63,7 @@ def quiz(db, user):
     return Quiz.objects.create(
         title="Quiz 1",
         description="Desc 1",
-        video_url="https://www.youtube.com/watch?v=abc123",
+        video_url="https://www.youtube.com/watch?v=abc123def45",
         user=user,
     )
 
@@ -54,7 +73,7 @@ def quiz_with_questions(db, user):
     q = Quiz.objects.create(
         title="Quiz With Qs",
         description="Desc",
-        video_url="https://www.youtube.com/watch?v=abc123",
+        video_url="https://www.youtube.com/watch?v=abc123def45",
         user=user,
     )
     QuizQuestion.objects.create(
@@ -69,4 +88,21 @@ def quiz_with_questions(db, user):
         question_options=["A1", "B1", "C1", "D1"],
         answer="B1",
     )
-    return q
\ No newline at end of file
+    return q
+
+
+@pytest.fixture
+def toy_whisper_checkpoint(tmp_path):
+    """
+    A tiny randomly initialised Whisper checkpoint in the official format (fp16 weights + dims).
+    """
+    import torch
+    from whisper.model import ModelDimensions, Whisper
+
+    dims = ModelDimensions(
+        n_mels=80, n_audio_ctx=16, n_audio_state=8, n_audio_head=2, n_audio_layer=1,
+        n_vocab=51865, n_text_ctx=8, n_text_state=8, n_text_head=2, n_text_layer=2,
+    )
+    path = tmp_path / "toy.pt"
+    torch.save({"dims": dims.__dict__, "model_state_dict": Whisper(dims).half().state_dict()}, path)
+    return str(path)
@@ -1,9 +1,16 @@
-import pytest
+import time
+from datetime import timedelta
+from io import StringIO
 from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
 from rest_framework import status
 
-from apps.quiz_management_app.models import Quiz, QuizQuestion
-from apps.quiz_management_app.utils import QuizCreationError, InvalidYouTubeUrlError
+from apps.quiz_management_app.idempotency import request_fingerprint, store_idempotent_response
+from apps.quiz_management_app.models import IdempotencyKey, QuizJob
+from apps.quiz_management_app.utils import VideoTooLongError
 
 
 @pytest.mark.django_db
@@ -11,7 +18,7 @@ class TestCreateQuizEndpoint:
     url = "/api/createQuiz/"
 
     def test_requires_auth(self, api_client):
-        resp = api_client.post(self.url, {"url": "https://www.youtube.com/watch?v=abc"}, format="json")
+        resp = api_client.post(self.url, {"url": "https://www.youtube.com/watch?v=abc123def45"}, format="json")
         assert resp.status_code == status.HTTP_401_UNAUTHORIZED
 
     def test_missing_url_returns_400(self, auth_client):
@@ -19,39 +26,153 @@ class TestCreateQuizEndpoint:
         assert resp.status_code == status.HTTP_400_BAD_REQUEST
         assert "url" in resp.data
 
-    @patch("apps.quiz_management_app.api.views.create_quiz_from_url")
-    def test_non_youtube_returns_400(self, mocked_create, auth_client, user):
-        mocked_create.side_effect = InvalidYouTubeUrlError("Not a YouTube URL.")
+    def test_non_youtube_returns_400(self, auth_client, user):
         resp = auth_client.post(self.url, {"url": "https://vimeo.com/123"}, format="json")
         assert resp.status_code == status.HTTP_400_BAD_REQUEST
         assert resp.data["detail"] == "Only YouTube URLs are allowed."
+        assert not QuizJob.objects.exists()
 
-    @patch("apps.quiz_management_app.api.views.create_quiz_from_url")
-    def test_quiz_creation_error_returns_500(self, mocked_create, auth_client):
-        mocked_create.side_effect = QuizCreationError("boom")
-        resp = auth_client.post(self.url, {"url": "https://www.youtube.com/watch?v=abc"}, format="json")
-        assert resp.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
-        assert resp.data["detail"] == "boom"
-
-    @patch("apps.quiz_management_app.api.views.create_quiz_from_url")
-    def test_success_returns_quiz_with_questions(self, mocked_create, auth_client, user):
-        quiz = Quiz.objects.create(
-            title="T",
-            description="D",
-            video_url="https://www.youtube.com/watch?v=abc",
-            user=user,
-        )
-        QuizQuestion.objects.create(
-            quiz=quiz,
-            question_title="Q1?",
-            question_options=["A", "B", "C", "D"],
-            answer="A",
+    def test_success_enqueues_job_and_returns_202(self, auth_client, user):
+        resp = auth_client.post(self.url, {"url": "https://youtu.be/abc123def45?si=x"}, format="json")
+        assert resp.status_code == status.HTTP_202_ACCEPTED
+
+        job = QuizJob.objects.get(id=resp.data["id"])
+        assert job.user_id == user.id
+        assert job.status == QuizJob.Status.PENDING
+        assert job.video_url == "https://www.youtube.com/watch?v=abc123def45"
+        assert resp.data["status"] == "pending"
+        assert resp.data["quiz"] is None
+        assert resp["Location"] == f"/api/jobs/{job.id}/"
+
+    def test_fresh_query_param_is_stored_on_job(self, auth_client):
+        resp = auth_client.post(self.url + "?fresh=1", {"url": "https://youtu.be/abc123def45"}, format="json")
+        assert resp.status_code == status.HTTP_202_ACCEPTED
+        assert QuizJob.objects.get(id=resp.data["id"]).fresh is True
+
+    def test_rejected_video_returns_422(self, auth_client):
+        with patch(
+            "apps.quiz_management_app.jobs.probe_video",
+            side_effect=VideoTooLongError("This video is too long (300 min). The maximum is 120 min."),
+        ):
+            resp = auth_client.post(self.url, {"url": "https://youtu.be/abc123def45"}, format="json")
+        assert resp.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert "too long" in resp.data["detail"]
+        assert not QuizJob.objects.exists()
+
+
+@pytest.mark.django_db
+class TestCreateQuizIdempotency:
+    url = "/api/createQuiz/"
+    body = {"url": "https://youtu.be/abc123def45"}
+
+    def _post(self, client, key="key-1", body=None, path=None):
+        return client.post(path or self.url, body or self.body, format="json", HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_replay_returns_the_same_job_with_its_current_state(self, auth_client):
+        first = self._post(auth_client)
+        QuizJob.objects.filter(id=first.data["id"]).update(status=QuizJob.Status.RUNNING)
+        second = self._post(auth_client)
+
+        assert second.status_code == status.HTTP_202_ACCEPTED
+        assert second.data["id"] == first.data["id"]
+        assert second.data["status"] == "running"
+        assert second["Location"] == first["Location"]
+        assert second["Idempotent-Replayed"] == "true"
+        assert QuizJob.objects.count() == 1
+
+    def test_key_reused_for_a_different_request_returns_422(self, auth_client):
+        self._post(auth_client)
+        resp = self._post(auth_client, body={"url": "https://youtu.be/zzz123def45"})
+        fresh = self._post(auth_client, path=self.url + "?fresh=1")
+
+        assert resp.status_code == fresh.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert "different request" in resp.data["detail"]
+        assert QuizJob.objects.count() == 1
+
+    def test_keys_are_per_user(self, auth_client, api_client, other_user):
+        self._post(auth_client)
+        api_client.force_authenticate(user=other_user)
+        resp = self._post(api_client)
+
+        assert resp.status_code == status.HTTP_202_ACCEPTED
+        assert "Idempotent-Replayed" not in resp
+        assert QuizJob.objects.count() == 2
+
+    def test_error_response_is_replayed_without_running_again(self, auth_client):
+        with patch(
+            "apps.quiz_management_app.jobs.probe_video",
+            side_effect=VideoTooLongError("This video is too long (300 min). The maximum is 120 min."),
+        ) as probe:
+            first = self._post(auth_client)
+            second = self._post(auth_client)
+
+        probe.assert_called_once()
+        assert first.status_code == second.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert second.data == first.data
+        assert second["Idempotent-Replayed"] == "true"
+
+    def test_invalid_body_does_not_use_up_the_key(self, auth_client):
+        assert self._post(auth_client, body={"nope": 1}).status_code == status.HTTP_400_BAD_REQUEST
+        assert self._post(auth_client).status_code == status.HTTP_202_ACCEPTED
+        assert IdempotencyKey.objects.get(key="key-1").status_code == status.HTTP_202_ACCEPTED
+
+    def test_invalid_key_returns_400(self, auth_client):
+        assert self._post(auth_client, key=" ").status_code == status.HTTP_400_BAD_REQUEST
+        assert self._post(auth_client, key="k" * 256).status_code == status.HTTP_400_BAD_REQUEST
+        assert not QuizJob.objects.exists()
+
+    def test_concurrent_replay_waits_for_the_first_request(self, auth_client, user, settings):
+        settings.IDEMPOTENCY_POLL_SECONDS = 0
+        record = IdempotencyKey.objects.create(
+            user=user, key="key-1", fingerprint=request_fingerprint(self.url, [], self.body)
         )
-        mocked_create.return_value = quiz
-
-        resp = auth_client.post(self.url, {"url": "https://www.youtube.com/watch?v=abc"}, format="json")
-        assert resp.status_code == status.HTTP_201_CREATED
-        assert resp.data["id"] == quiz.id
-        assert resp.data["title"] == "T"
-        assert isinstance(resp.data["questions"], list)
-        assert len(resp.data["questions"]) == 1
\ No newline at end of file
+        job = QuizJob.objects.create(user=user, video_url="https://www.youtube.com/watch?v=abc123def45")
+
+        def first_request_finishes(_seconds):
+            store_idempotent_response(record, status.HTTP_202_ACCEPTED, {"id": job.id}, job=job)
+
+        with patch("apps.quiz_management_app.idempotency.time.sleep", side_effect=first_request_finishes) as sleep:
+            resp = self._post(auth_client)
+
+        sleep.assert_called_once()
+        assert resp.status_code == status.HTTP_202_ACCEPTED
+        assert resp.data["id"] == job.id
+        assert QuizJob.objects.count() == 1
+
+    def test_still_running_after_the_wait_returns_409(self, auth_client, user, settings):
+        settings.IDEMPOTENCY_WAIT_SECONDS = 0
+        IdempotencyKey.objects.create(user=user, key="key-1", fingerprint=request_fingerprint(self.url, [], self.body))
+
+        resp = self._post(auth_client)
+        assert resp.status_code == status.HTTP_409_CONFLICT
+        assert resp["Retry-After"] == "1"
+        assert not QuizJob.objects.exists()
+
+    def test_default_wait_is_short(self, auth_client, user, settings):
+        del settings.IDEMPOTENCY_WAIT_SECONDS
+        IdempotencyKey.objects.create(user=user, key="key-1", fingerprint=request_fingerprint(self.url, [], self.body))
+
+        started = time.monotonic()
+        resp = self._post(auth_client)
+
+        assert resp.status_code == status.HTTP_409_CONFLICT
+        assert time.monotonic() - started < 5
+
+    def test_expired_key_starts_a_new_request(self, auth_client):
+        first = self._post(auth_client)
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(hours=25))
+        second = self._post(auth_client)
+
+        assert second.data["id"] != first.data["id"]
+        assert IdempotencyKey.objects.count() == 1
+
+    def test_purge_command_deletes_expired_keys(self, user):
+        IdempotencyKey.objects.create(user=user, key="old", fingerprint="x")
+        IdempotencyKey.objects.create(user=user, key="new", fingerprint="x")
+        IdempotencyKey.objects.filter(key="old").update(created_at=timezone.now() - timedelta(hours=25))
+
+        out = StringIO()
+        call_command("purge_idempotency_keys", stdout=out)
+
+        assert list(IdempotencyKey.objects.values_list("key", flat=True)) == ["new"]
+        assert "Deleted 1 idempotency key(s)" in out.getvalue()
@@ -0,0 +1,51 @@
+import pytest
+from rest_framework import status
+
+from apps.quiz_management_app.models import QuizJob
+
+
+@pytest.fixture
+def job(db, user):
+    return QuizJob.objects.create(user=user, video_url="https://www.youtube.com/watch?v=abc123def45")
+
+
+@pytest.mark.django_db
+class TestJobStatusEndpoint:
+    def test_requires_auth(self, api_client, job):
+        resp = api_client.get(f"/api/jobs/{job.id}/")
+        assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_pending_job(self, auth_client, job):
+        resp = auth_client.get(f"/api/jobs/{job.id}/")
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data["status"] == "pending"
+        assert resp.data["quiz"] is None
+
+    def test_succeeded_job_embeds_quiz(self, auth_client, job, quiz_with_questions):
+        job.status = QuizJob.Status.SUCCEEDED
+        job.quiz = quiz_with_questions
+        job.save()
+
+        resp = auth_client.get(f"/api/jobs/{job.id}/")
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data["status"] == "succeeded"
+        assert resp.data["quiz"]["id"] == quiz_with_questions.id
+        assert len(resp.data["quiz"]["questions"]) == 2
+
+    def test_failed_job_exposes_error(self, auth_client, job):
+        job.status = QuizJob.Status.FAILED
+        job.error = "boom"
+        job.save()
+
+        resp = auth_client.get(f"/api/jobs/{job.id}/")
+        assert resp.data["status"] == "failed"
+        assert resp.data["error"] == "boom"
+
+    def test_forbidden_for_other_user(self, auth_client, other_user, job):
+        auth_client.force_authenticate(user=other_user)
+        resp = auth_client.get(f"/api/jobs/{job.id}/")
+        assert resp.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_not_found(self, auth_client):
+        resp = auth_client.get("/api/jobs/999999/")
+        assert resp.status_code == status.HTTP_404_NOT_FOUND
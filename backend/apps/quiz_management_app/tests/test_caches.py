@@ -0,0 +1,193 @@
+import json
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.quiz_management_app import caches, metrics, utils
+from apps.quiz_management_app.models import CacheCounter, Quiz, QuizPayloadCacheEntry, TranscriptCacheEntry
+from apps.quiz_management_app.utils import QuizCreationError, create_quiz_from_url, get_transcript
+
+OPTS = {"fp16": False}
+
+
+@pytest.mark.django_db
+class TestTranscriptCache:
+    def test_miss_then_hit_updates_counters(self):
+        assert caches.get_cached_transcript("vid", "small", OPTS) is None
+
+        caches.store_transcript("vid", "small", OPTS, "hello world")
+        assert caches.get_cached_transcript("vid", "small", OPTS) == "hello world"
+
+        stats = caches.transcript_cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["entries"] == 1
+        assert stats["size_bytes"] == len("hello world")
+        assert TranscriptCacheEntry.objects.get().hit_count == 1
+
+    def test_key_includes_model_and_options(self):
+        caches.store_transcript("vid", "small", OPTS, "small text")
+        assert caches.get_cached_transcript("vid", "base", OPTS) is None
+        assert caches.get_cached_transcript("vid", "small", {"fp16": False, "language": "de"}) is None
+
+    def test_without_video_id_is_a_no_op(self):
+        caches.store_transcript(None, "small", OPTS, "text")
+        assert caches.get_cached_transcript(None, "small", OPTS) is None
+        assert not TranscriptCacheEntry.objects.exists()
+        assert not CacheCounter.objects.exists()
+
+    def test_disabled_by_setting(self, settings):
+        settings.TRANSCRIPT_CACHE_ENABLED = False
+        caches.store_transcript("vid", "small", OPTS, "text")
+        assert not TranscriptCacheEntry.objects.exists()
+
+    def test_evicts_least_recently_used(self, settings):
+        settings.TRANSCRIPT_CACHE_MAX_BYTES = 10
+        caches.store_transcript("a", "small", OPTS, "aaaa")
+        caches.store_transcript("b", "small", OPTS, "bbbb")
+        caches.get_cached_transcript("a", "small", OPTS)
+
+        caches.store_transcript("c", "small", OPTS, "cccc")
+
+        remaining = set(TranscriptCacheEntry.objects.values_list("video_id", flat=True))
+        assert remaining == {"a", "c"}
+
+    def test_options_key_is_order_independent(self):
+        k1 = caches.transcription_options_key({"a": 1, "b": 2})
+        k2 = caches.transcription_options_key({"b": 2, "a": 1})
+        assert k1 == k2
+
+
+@pytest.mark.django_db
+class TestGetTranscript:
+    @patch("apps.quiz_management_app.utils.generate_transcript")
+    @patch("apps.quiz_management_app.utils.download_audio_from_video")
+    def test_second_call_skips_download_and_whisper(self, mock_dl, mock_tr, settings):
+        settings.WHISPER_MODEL = "small"
+        mock_tr.return_value = "fresh transcript"
+        url = "https://www.youtube.com/watch?v=abc123def45"
+
+        assert get_transcript(url).text == "fresh transcript"
+        assert get_transcript("https://youtu.be/abc123def45").text == "fresh transcript"
+
+        assert mock_dl.call_count == 1
+        assert mock_tr.call_count == 1
+
+    @patch("apps.quiz_management_app.utils.generate_transcript", return_value="fresh transcript")
+    @patch("apps.quiz_management_app.utils.download_audio_from_video")
+    def test_cache_hit_is_labelled_as_such(self, mock_dl, mock_tr, settings):
+        settings.WHISPER_MODEL = "small"
+        url = "https://www.youtube.com/watch?v=abc123def45"
+        assert get_transcript(url).cached is False
+
+        hits = metrics.STAGE_SECONDS.count(stage="transcript_cache", model="small", cache="hit", outcome="ok")
+        transcribed = metrics.STAGE_SECONDS.count(stage="transcribe", model="small", outcome="ok")
+        transcript = get_transcript(url)
+
+        assert transcript.cached is True
+        assert metrics.STAGE_SECONDS.count(stage="transcript_cache", model="small", cache="hit", outcome="ok") == hits + 1
+        assert metrics.STAGE_SECONDS.count(stage="transcribe", model="small", outcome="ok") == transcribed
+
+
+def _payload(title="T"):
+    questions = [{"question_title": f"Q{i}?", "question_options": ["A", "B", "C", "D"], "answer": "A"} for i in range(10)]
+    return {"title": title, "description": "D", "questions": questions}
+
+
+@pytest.mark.django_db
+class TestQuizPayloadCache:
+    def test_miss_then_hit(self):
+        assert caches.get_cached_quiz_payload("h", "v1", "gemini") is None
+        caches.store_quiz_payload("h", "v1", "gemini", _payload())
+
+        assert caches.get_cached_quiz_payload("h", "v1", "gemini") == _payload()
+        assert caches.get_cached_quiz_payload("h", "v2", "gemini") is None
+        assert caches.get_cached_quiz_payload("h", "v1", "other-model") is None
+        stats = caches.quiz_payload_cache_stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 3, 1)
+
+    def test_hash_ignores_whitespace_only(self):
+        assert caches.normalized_transcript_hash("a  b\nc ") == caches.normalized_transcript_hash("a b c")
+        assert caches.normalized_transcript_hash("a b c") != caches.normalized_transcript_hash("a b d")
+
+    def test_expired_entries_miss_and_are_evicted(self, settings):
+        settings.LLM_CACHE_TTL = timedelta(hours=1)
+        caches.store_quiz_payload("old", "v1", "gemini", _payload())
+        QuizPayloadCacheEntry.objects.update(created_at=timezone.now() - timedelta(hours=2))
+
+        assert caches.get_cached_quiz_payload("old", "v1", "gemini") is None
+        caches.store_quiz_payload("new", "v1", "gemini", _payload())
+        assert list(QuizPayloadCacheEntry.objects.values_list("transcript_hash", flat=True)) == ["new"]
+
+    def test_evicts_least_recently_used(self, settings):
+        size = len(json.dumps(_payload()).encode("utf-8"))
+        settings.LLM_CACHE_MAX_BYTES = 2 * size
+        caches.store_quiz_payload("a", "v1", "gemini", _payload())
+        caches.store_quiz_payload("b", "v1", "gemini", _payload())
+        caches.get_cached_quiz_payload("a", "v1", "gemini")
+
+        caches.store_quiz_payload("c", "v1", "gemini", _payload())
+
+        assert set(QuizPayloadCacheEntry.objects.values_list("transcript_hash", flat=True)) == {"a", "c"}
+
+
+@pytest.mark.django_db
+class TestQuizPayloadCacheInPipeline:
+    url = "https://www.youtube.com/watch?v=abc123def45"
+
+    @pytest.fixture(autouse=True)
+    def _transcript(self):
+        with patch("apps.quiz_management_app.utils.get_transcript", return_value=utils.Transcript("same words", "whisper")):
+            yield
+
+    @patch("apps.quiz_management_app.utils.get_ai_response", return_value=SimpleNamespace(text=json.dumps(_payload())))
+    def test_repeat_skips_gemini(self, mock_ai, user, other_user):
+        first = create_quiz_from_url(self.url, user)
+        second = create_quiz_from_url(self.url, other_user, fresh=True)
+
+        assert mock_ai.call_count == 1
+        assert second.id != first.id and second.user_id == other_user.id
+        assert second.questions.count() == 10
+
+    @patch("apps.quiz_management_app.utils.get_ai_response", return_value=SimpleNamespace(text=json.dumps(_payload())))
+    def test_prompt_change_invalidates(self, mock_ai, user):
+        create_quiz_from_url(self.url, user)
+        with patch("apps.quiz_management_app.utils.build_quiz_prompt", side_effect=lambda t: "v2 " + t):
+            create_quiz_from_url(self.url, user)
+        assert mock_ai.call_count == 2
+
+    def test_repair_prompt_and_schema_are_part_of_the_version(self, settings):
+        settings.GEMINI_STRUCTURED_OUTPUT = True
+        version = utils.quiz_prompt_version()
+
+        with patch("apps.quiz_management_app.utils.build_repair_prompt", return_value="v2"):
+            assert utils.quiz_prompt_version() != version
+        with patch("apps.quiz_management_app.utils.repair_generation_config", return_value={"response_schema": "v2"}):
+            assert utils.quiz_prompt_version() != version
+        assert utils.quiz_prompt_version() == version
+
+    @patch("apps.quiz_management_app.utils.get_ai_response", return_value=SimpleNamespace(text='{"title": "T"}'))
+    def test_invalid_payload_is_not_cached(self, mock_ai, user):
+        with pytest.raises(QuizCreationError):
+            create_quiz_from_url(self.url, user)
+        assert not QuizPayloadCacheEntry.objects.exists()
+
+
+@pytest.mark.django_db
+def test_cache_stats_command(capsys, quiz):
+    caches.store_transcript("vid", "small", OPTS, "text")
+    caches.get_cached_transcript("vid", "small", OPTS)
+    Quiz.objects.filter(pk=quiz.pk).update(transcript_source="captions_auto")
+
+    call_command("cache_stats")
+
+    out = capsys.readouterr().out
+    assert "transcript: 1 entries" in out
+    assert "quiz payload: 0 entries" in out
+    assert "1 hits, 0 misses" in out
+    assert "captions_auto=1 (100%)" in out
@@ -0,0 +1,145 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from apps.quiz_management_app import utils
+from apps.quiz_management_app.models import TranscriptSource
+
+VTT = """WEBVTT
+Kind: captions
+Language: en
+
+NOTE
+generated by a tool
+
+00:00:00.000 --> 00:00:02.000 align:start position:0%
+hello<00:00:00.500><c> world</c>
+
+00:00:02.000 --> 00:00:04.000
+hello world
+
+00:00:04.000 --> 00:00:06.000
+this &amp; that
+"""
+
+SRT = """1
+00:00:00,000 --> 00:00:02,000
+First line
+
+2
+00:00:02,000 --> 00:00:04,000
+<i>Second</i> line
+"""
+
+
+def test_captions_to_text_vtt_strips_timing_tags_and_rolling_duplicates():
+    assert utils.captions_to_text(VTT) == "hello world this & that"
+
+
+def test_captions_to_text_srt():
+    assert utils.captions_to_text(SRT) == "First line Second line"
+
+
+def _track(lang_url):
+    return [{"ext": "json3", "url": lang_url + ".json"}, {"ext": "vtt", "url": lang_url + ".vtt"}]
+
+
+class TestPickCaptionTrack:
+    def test_prefers_manual_subtitles(self):
+        info = {"subtitles": {"de": _track("de")}, "automatic_captions": {"en": _track("auto-en")}}
+        assert utils._pick_caption_track(info) == ("de.vtt", "vtt", TranscriptSource.CAPTIONS_MANUAL)
+
+    def test_auto_captions_only_in_original_language(self, settings):
+        settings.CAPTIONS_LANGUAGES = ["en"]
+        info = {
+            "language": "fr",
+            "automatic_captions": {"en": _track("translated-en"), "fr-orig": _track("fr-orig")},
+        }
+        assert utils._pick_caption_track(info) == ("fr-orig.vtt", "vtt", TranscriptSource.CAPTIONS_AUTO)
+
+    def test_auto_captions_can_be_disabled(self, settings):
+        settings.CAPTIONS_ALLOW_AUTO = False
+        info = {"language": "en", "automatic_captions": {"en": _track("en")}}
+        assert utils._pick_caption_track(info) is None
+
+    def test_no_tracks(self):
+        assert utils._pick_caption_track({}) is None
+
+
+def _mock_ydl(ydl_cls, info, raw=""):
+    ydl = MagicMock()
+    ydl.extract_info.return_value = info
+    ydl.urlopen.return_value.read.return_value = raw.encode()
+    ydl_cls.return_value.__enter__.return_value = ydl
+    return ydl
+
+
+class TestFetchCaptionTranscript:
+    url = "https://www.youtube.com/watch?v=abc123def45"
+
+    def test_returns_text_and_source(self, settings):
+        settings.CAPTIONS_ENABLED = True
+        settings.CAPTIONS_MIN_WORDS = 3
+        with patch("yt_dlp.YoutubeDL") as ydl_cls:
+            ydl = _mock_ydl(ydl_cls, {"subtitles": {"en": _track("en")}}, VTT)
+            result = utils.fetch_caption_transcript(self.url)
+
+        assert result == ("hello world this & that", TranscriptSource.CAPTIONS_MANUAL)
+        ydl.urlopen.assert_called_once_with("en.vtt")
+
+    def test_probe_info_skips_extraction(self, settings):
+        settings.CAPTIONS_ENABLED = True
+        settings.CAPTIONS_MIN_WORDS = 3
+        with patch("yt_dlp.YoutubeDL") as ydl_cls:
+            ydl = _mock_ydl(ydl_cls, {}, VTT)
+            result = utils.fetch_caption_transcript(self.url, info={"subtitles": {"en": _track("en")}})
+
+        assert result == ("hello world this & that", TranscriptSource.CAPTIONS_MANUAL)
+        ydl.extract_info.assert_not_called()
+
+    def test_too_short_captions_are_rejected(self, settings):
+        settings.CAPTIONS_ENABLED = True
+        settings.CAPTIONS_MIN_WORDS = 50
+        with patch("yt_dlp.YoutubeDL") as ydl_cls:
+            _mock_ydl(ydl_cls, {"subtitles": {"en": _track("en")}}, VTT)
+            assert utils.fetch_caption_transcript(self.url) is None
+
+    def test_errors_fall_back_to_none(self, settings):
+        settings.CAPTIONS_ENABLED = True
+        with patch("yt_dlp.YoutubeDL") as ydl_cls:
+            ydl_cls.return_value.__enter__.return_value.extract_info.side_effect = Exception("blocked")
+            assert utils.fetch_caption_transcript(self.url) is None
+
+    def test_disabled(self):
+        with patch("yt_dlp.YoutubeDL") as ydl_cls:
+            assert utils.fetch_caption_transcript(self.url) is None
+        ydl_cls.assert_not_called()
+
+
+@pytest.mark.django_db
+class TestGetTranscriptFastPath:
+    url = "https://www.youtube.com/watch?v=abc123def45"
+
+    @patch("apps.quiz_management_app.utils.generate_transcript")
+    @patch("apps.quiz_management_app.utils.download_audio_from_video")
+    @patch("apps.quiz_management_app.utils.fetch_caption_transcript")
+    def test_captions_skip_whisper(self, mock_captions, mock_dl, mock_tr):
+        mock_captions.return_value = ("caption text", TranscriptSource.CAPTIONS_AUTO)
+
+        transcript = utils.get_transcript(self.url)
+
+        assert transcript == utils.Transcript("caption text", TranscriptSource.CAPTIONS_AUTO)
+        mock_dl.assert_not_called()
+        mock_tr.assert_not_called()
+
+    @patch("apps.quiz_management_app.utils.generate_transcript")
+    @patch("apps.quiz_management_app.utils.download_audio_from_video")
+    @patch("apps.quiz_management_app.utils.fetch_caption_transcript")
+    def test_falls_back_to_whisper(self, mock_captions, mock_dl, mock_tr):
+        mock_captions.return_value = None
+        mock_tr.return_value = "whisper text"
+
+        transcript = utils.get_transcript(self.url)
+
+        assert transcript == utils.Transcript("whisper text", TranscriptSource.WHISPER)
+        mock_dl.assert_called_once()
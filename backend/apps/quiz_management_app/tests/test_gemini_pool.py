@@ -0,0 +1,126 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from apps.quiz_management_app import gemini_pool, utils
+from apps.quiz_management_app.gemini_pool import ClientConfig, ClientHolder
+
+BODY = json.dumps(
+    {
+        "candidates": [{"content": {"role": "model", "parts": [{"text": "{}"}]}}],
+        "usageMetadata": {"promptTokenCount": 7, "candidatesTokenCount": 2},
+    }
+).encode()
+
+
+class _Stub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    _Stub.connections = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Stub)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def fresh_clients():
+    holder = ClientHolder()
+    with patch.object(gemini_pool, "CLIENTS", holder):
+        yield holder
+    holder.reset()
+
+
+class TestClientHolder:
+    def test_reuses_client_until_config_changes(self):
+        holder = ClientHolder()
+        with patch.object(gemini_pool, "build_client", side_effect=lambda cfg: object()) as build:
+            a = holder.get(ClientConfig(api_key="k"))
+            b = holder.get(ClientConfig(api_key="k"))
+            c = holder.get(ClientConfig(api_key="other"))
+
+        assert a is b
+        assert c is not a
+        assert build.call_count == 2
+
+    def test_concurrent_first_use_builds_once(self):
+        holder = ClientHolder()
+        with patch.object(gemini_pool, "build_client", side_effect=lambda cfg: object()):
+            threads = [threading.Thread(target=holder.get, args=(ClientConfig(api_key="k"),)) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        assert holder.builds == 1
+
+    def test_build_client_applies_pool_and_timeouts(self):
+        client = gemini_pool.build_client(
+            ClientConfig(api_key="k", timeout=42, connect_timeout=3, max_connections=4, keepalive_expiry=9)
+        )
+        http = client._api_client._httpx_client
+        assert http.timeout.read == 42 and http.timeout.connect == 3
+        pool = http._transport._pool
+        assert pool._max_connections == 4 and pool._keepalive_expiry == 9
+        assert client._api_client._http_options.timeout == 42000
+        http.close()
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+    def test_forked_child_drops_inherited_client(self):
+        holder = ClientHolder()
+        with patch.object(gemini_pool, "build_client", side_effect=lambda cfg: object()):
+            holder.get(ClientConfig(api_key="k"))
+        pid = os.fork()
+        if pid == 0:
+            os._exit(0 if holder._client is None else 1)
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert holder._client is not None
+
+
+@pytest.mark.django_db
+class TestGeminiClient:
+    def test_settings_are_wired(self, settings, fresh_clients):
+        settings.GEMINI_API_KEY = "key"
+        settings.GEMINI_TIMEOUT = 30
+        settings.GEMINI_BASE_URL = " http://proxy.local "
+        config = utils.gemini_client_config()
+        assert config.api_key == "key"
+        assert config.timeout == 30.0
+        assert config.base_url == "http://proxy.local"
+
+    def test_requests_share_one_connection(self, settings, stub_server, fresh_clients):
+        settings.GEMINI_API_KEY = "stub"
+        settings.GEMINI_BASE_URL = stub_server
+
+        first = utils.get_ai_response("transcript one")
+        second = utils.get_ai_response("transcript two")
+
+        assert first.text == "{}" and second.text == "{}"
+        assert utils.response_token_counts(second) == {"prompt_tokens": 7, "response_tokens": 2}
+        assert _Stub.connections == 1
+        assert fresh_clients.builds == 1
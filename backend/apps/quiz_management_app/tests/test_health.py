@@ -0,0 +1,95 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from django.core.management import call_command
+
+from apps.quiz_management_app import warmup
+from core import views
+
+
+@pytest.fixture(autouse=True)
+def _reset_state(settings):
+    settings.READINESS_CACHE_SECONDS = 0
+    settings.WHISPER_TRANSCRIBE_MODE = "full"
+    views._readiness_cache.update(at=0.0, ok=False, checks={})
+    warmup._ready.clear()
+    warmup._error = None
+    yield
+    warmup._ready.clear()
+    warmup._error = None
+
+
+def test_healthz_is_always_ok(client):
+    resp = client.get("/healthz")
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "ok"}
+
+
+@pytest.mark.django_db
+def test_readyz_checks_database(client):
+    resp = client.get("/readyz")
+    assert resp.status_code == 200
+    assert resp.json()["checks"] == {"database": True}
+
+
+@pytest.mark.django_db
+def test_readyz_unavailable_when_database_is_down(client):
+    with patch("core.views._check_database", return_value=False):
+        resp = client.get("/readyz")
+    assert resp.status_code == 503
+    assert resp.json()["status"] == "unavailable"
+
+
+@pytest.mark.django_db
+def test_readyz_waits_for_warm_model_with_preload(client, settings):
+    settings.WHISPER_PRELOAD = True
+    assert client.get("/readyz").status_code == 503
+
+    warmup._ready.set()
+    resp = client.get("/readyz")
+    assert resp.status_code == 200
+    assert resp.json()["checks"] == {"database": True, "whisper": True}
+
+
+@pytest.mark.django_db
+def test_readyz_results_are_cached(client, settings):
+    settings.READINESS_CACHE_SECONDS = 60
+    with patch("core.views._check_database", return_value=True) as check:
+        client.get("/readyz")
+        client.get("/readyz")
+    check.assert_called_once()
+
+
+def test_warm_up_runs_dummy_inference():
+    model = MagicMock()
+    with patch("apps.quiz_management_app.warmup.utils.get_whisper_model", return_value=model):
+        warmup.warm_up()
+
+    audio = model.transcribe.call_args[0][0]
+    assert isinstance(audio, np.ndarray) and len(audio) == 16000
+    assert warmup.is_warm()
+
+
+def test_warm_up_parallel_mode_starts_pool(settings):
+    settings.WHISPER_TRANSCRIBE_MODE = "parallel"
+    settings.WHISPER_PARALLEL_WORKERS = 3
+    with patch("apps.quiz_management_app.warmup.whisper_pool.transcribe_parallel") as parallel:
+        warmup.warm_up()
+    assert parallel.call_args.kwargs["workers"] == 3
+    assert parallel.call_args.kwargs["min_chunk_seconds"] == 1
+
+
+def test_warm_up_failure_is_recorded():
+    with patch("apps.quiz_management_app.warmup.utils.get_whisper_model", side_effect=OSError("no model")):
+        with pytest.raises(OSError):
+            warmup.warm_up()
+    assert not warmup.is_warm()
+    assert warmup.warmup_error() == "no model"
+
+
+@pytest.mark.django_db
+def test_worker_command_warms_up_before_polling():
+    with patch("apps.quiz_management_app.management.commands.run_quiz_worker.warm_up") as warm:
+        call_command("run_quiz_worker", "--once")
+    warm.assert_called_once()
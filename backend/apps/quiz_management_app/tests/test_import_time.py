@@ -0,0 +1,41 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[3]
+# Same default budget as benchmarks/bench_import_time.py; slow CI runners can raise it.
+BUDGET_SECONDS = float(os.environ.get("IMPORT_TIME_BUDGET", "1.0"))
+
+PROBE = """
+import json, os, sys, time
+t0 = time.perf_counter()
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+import apps.quiz_management_app.jobs
+seconds = time.perf_counter() - t0
+modules = sorted(m for m in ("torch", "whisper", "numba", "yt_dlp", "google.genai") if m in sys.modules)
+print(json.dumps({"seconds": seconds, "modules": modules}))
+"""
+
+
+def _probe() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND, env=os.environ.copy(), capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_django_boot_does_not_import_ml_or_downloader_stacks():
+    assert _probe()["modules"] == []
+
+
+def test_django_boot_stays_within_the_time_budget():
+    _probe()  # warm the filesystem cache / .pyc files
+    median = statistics.median(_probe()["seconds"] for _ in range(3))
+    assert median <= BUDGET_SECONDS, f"django.setup() + urls took {median:.3f}s (budget {BUDGET_SECONDS:.3f}s)"
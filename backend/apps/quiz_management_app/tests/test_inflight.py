@@ -0,0 +1,208 @@
+import threading
+import time
+from datetime import timedelta
+from unittest.mock import ANY, MagicMock, patch
+
+import pytest
+from django.utils import timezone
+
+from apps.quiz_management_app import inflight, utils
+from apps.quiz_management_app.models import InflightLease, Quiz
+from apps.quiz_management_app.single_flight import SingleFlight
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+class TestSingleFlight:
+    def test_concurrent_callers_share_one_call(self):
+        flights = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return {"quiz": 1}
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(flights.do("v1", compute))) for _ in range(5)]
+        threads[0].start()
+        _wait_for(lambda: calls)
+        for t in threads[1:]:
+            t.start()
+        _wait_for(lambda: flights.waiting("v1") == 4)
+        release.set()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+        assert all(value == {"quiz": 1} for value, _ in results)
+
+    def test_error_reaches_waiters_and_key_is_released(self):
+        flights = SingleFlight()
+        release = threading.Event()
+        errors = []
+
+        def failing():
+            release.wait(5)
+            raise ValueError("boom")
+
+        def call():
+            try:
+                flights.do("v1", failing)
+            except ValueError as e:
+                errors.append(str(e))
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        _wait_for(lambda: flights._calls)
+        follower = threading.Thread(target=call)
+        follower.start()
+        _wait_for(lambda: flights.waiting("v1") == 1)
+        release.set()
+        leader.join()
+        follower.join()
+
+        assert errors == ["boom", "boom"]
+        assert flights.do("v1", lambda: 2) == (2, False)
+
+    def test_different_keys_run_independently(self):
+        flights = SingleFlight()
+        assert flights.do("a", lambda: 1) == (1, False)
+        assert flights.do("b", lambda: 2) == (2, False)
+
+
+@pytest.mark.django_db
+class TestLease:
+    @pytest.fixture(autouse=True)
+    def _enabled(self, settings):
+        settings.QUIZ_INFLIGHT_ENABLED = True
+        settings.QUIZ_INFLIGHT_POLL_SECONDS = 0
+
+    def test_leader_stores_result_for_waiting_processes(self):
+        assert inflight.coalesce("v1", lambda: {"n": 1}) == {"n": 1}
+
+        lease = InflightLease.objects.get(key="v1")
+        assert lease.result == {"n": 1}
+        assert lease.expires_at <= timezone.now() + timedelta(seconds=30)
+
+    def test_waits_for_another_process_and_uses_its_result(self):
+        InflightLease.objects.create(key="v1", owner="other", expires_at=timezone.now() + timedelta(minutes=5))
+        compute = MagicMock()
+
+        def other_process_finishes(_seconds):
+            InflightLease.objects.filter(key="v1").update(result={"n": 2})
+
+        before = inflight.INFLIGHT_REQUESTS.value(role=inflight.PROCESS)
+        with patch("apps.quiz_management_app.inflight.time.sleep", side_effect=other_process_finishes) as sleep:
+            assert inflight.coalesce("v1", compute) == {"n": 2}
+
+        sleep.assert_called_once()
+        compute.assert_not_called()
+        assert inflight.INFLIGHT_REQUESTS.value(role=inflight.PROCESS) == before + 1
+
+    def test_failed_owner_lets_the_waiter_run(self):
+        InflightLease.objects.create(key="v1", owner="other", expires_at=timezone.now() + timedelta(minutes=5))
+
+        def other_process_fails(_seconds):
+            InflightLease.objects.filter(key="v1", owner="other").delete()
+
+        with patch("apps.quiz_management_app.inflight.time.sleep", side_effect=other_process_fails):
+            assert inflight.coalesce("v1", lambda: {"n": 3}) == {"n": 3}
+        assert InflightLease.objects.get(key="v1").owner != "other"
+
+    def test_expired_lease_is_taken_over(self):
+        InflightLease.objects.create(key="v1", owner="dead", expires_at=timezone.now() - timedelta(seconds=1))
+        with patch("apps.quiz_management_app.inflight.time.sleep") as sleep:
+            assert inflight.coalesce("v1", lambda: {"n": 4}) == {"n": 4}
+        sleep.assert_not_called()
+
+    def test_owner_renews_its_lease_while_running(self, settings):
+        settings.QUIZ_INFLIGHT_LEASE_SECONDS = 60
+        InflightLease.objects.create(key="v1", owner="me", expires_at=timezone.now() + timedelta(seconds=1))
+
+        assert inflight.renew_lease("v1", "me")
+        assert InflightLease.objects.get(key="v1").expires_at > timezone.now() + timedelta(seconds=50)
+
+    def test_renewal_never_touches_another_owners_lease(self):
+        expires_at = timezone.now() + timedelta(seconds=1)
+        InflightLease.objects.create(key="v1", owner="new-owner", expires_at=expires_at)
+
+        assert not inflight.renew_lease("v1", "dead-owner")
+        assert InflightLease.objects.get(key="v1").expires_at == expires_at
+
+    def test_owner_renews_while_compute_runs(self, settings):
+        settings.QUIZ_INFLIGHT_LEASE_SECONDS = 1
+        with patch("apps.quiz_management_app.inflight.renew_lease", return_value=True) as renew:
+
+            def slow_compute():
+                _wait_for(lambda: renew.called)
+                return {"n": 6}
+
+            assert inflight.coalesce("v1", slow_compute) == {"n": 6}
+        renew.assert_called_with("v1", ANY)
+
+    def test_error_releases_the_lease(self):
+        with pytest.raises(utils.QuizCreationError):
+            inflight.coalesce("v1", MagicMock(side_effect=utils.QuizCreationError("boom")))
+        assert not InflightLease.objects.exists()
+
+    def test_disabled_always_computes(self, settings):
+        settings.QUIZ_INFLIGHT_ENABLED = False
+        compute = MagicMock(return_value={"n": 5})
+        inflight.coalesce("v1", compute)
+        inflight.coalesce("v1", compute)
+        assert compute.call_count == 2
+        assert not InflightLease.objects.exists()
+
+
+@pytest.mark.django_db
+class TestCoalescedQuizCreation:
+    url = "https://www.youtube.com/watch?v=abc123def45"
+
+    @pytest.fixture(autouse=True)
+    def _enabled(self, settings):
+        settings.QUIZ_INFLIGHT_ENABLED = True
+
+    def _result(self):
+        questions = [{"question_title": f"Q{i}?", "question_options": ["A", "B", "C", "D"], "answer": "A"} for i in range(10)]
+        return {"payload": {"title": "T", "description": "D", "questions": questions}, "transcript_source": "captions_manual"}
+
+    def test_second_request_saves_its_own_copy_of_the_shared_payload(self, user, other_user):
+        with patch("apps.quiz_management_app.utils.compute_quiz_payload", return_value=self._result()) as compute:
+            first = utils.create_quiz_from_url(self.url, user)
+            second = utils.create_quiz_from_url(self.url, other_user)
+
+        compute.assert_called_once()
+        assert first.pk != second.pk
+        assert (first.user, second.user) == (user, other_user)
+        assert second.transcript_source == "captions_manual"
+        assert [q.question_title for q in second.questions.all()] == [f"Q{i}?" for i in range(10)]
+        assert Quiz.objects.count() == 2
+
+    def test_different_whisper_model_or_audio_cap_runs_its_own_pipeline(self, user):
+        with patch("apps.quiz_management_app.utils.compute_quiz_payload", return_value=self._result()) as compute:
+            utils.create_quiz_from_url(self.url, user, model_name="tiny")
+            utils.create_quiz_from_url(self.url, user, model_name="small")
+            utils.create_quiz_from_url(self.url, user, model_name="small", max_seconds=600)
+
+        assert compute.call_count == 3
+
+    def test_fresh_never_waits(self, user):
+        with patch("apps.quiz_management_app.utils.compute_quiz_payload", return_value=self._result()) as compute:
+            utils.create_quiz_from_url(self.url, user)
+            utils.create_quiz_from_url(self.url, user, fresh=True)
+
+        assert compute.call_count == 2
+
+
+def test_inflight_key_fits_the_lease_column():
+    assert utils.inflight_key("abc123def45", max_seconds=600, model_name="small") == "abc123def45:small:600"
+    assert len(utils.inflight_key("abc123def45", model_name="x" * 80)) == 64
+    assert utils.inflight_key(None) is None
@@ -0,0 +1,235 @@
+import threading
+import time
+from datetime import timedelta
+from unittest.mock import ANY, patch
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.quiz_management_app import jobs
+from apps.quiz_management_app.models import QuizJob
+from apps.quiz_management_app.utils import (
+    InvalidYouTubeUrlError,
+    QuizCreationError,
+    VideoProbe,
+    VideoRejectedError,
+)
+
+
+def _job(user, **kwargs):
+    return QuizJob.objects.create(user=user, video_url="https://www.youtube.com/watch?v=abc123def45", **kwargs)
+
+
+@pytest.mark.django_db
+class TestEnqueue:
+    def test_rejects_non_youtube_url(self, user):
+        with pytest.raises(InvalidYouTubeUrlError):
+            jobs.enqueue_quiz_job("https://vimeo.com/123", user)
+
+    def test_stores_normalized_url(self, user):
+        job = jobs.enqueue_quiz_job("https://youtu.be/abc123def45", user)
+        assert job.video_url == "https://www.youtube.com/watch?v=abc123def45"
+        assert job.status == QuizJob.Status.PENDING
+        assert job.estimated_seconds is None
+
+    def test_stores_preflight_estimate(self, user, settings):
+        settings.VIDEO_DURATION_POLICY = "cap"
+        settings.MAX_VIDEO_DURATION = 600
+        probe = VideoProbe(
+            duration=1200.0, live_status="not_live", availability="public", has_captions=False, info={"formats": []}
+        )
+        with patch("apps.quiz_management_app.jobs.probe_video", return_value=probe):
+            job = jobs.enqueue_quiz_job("https://youtu.be/abc123def45", user)
+
+        assert job.duration_seconds == 1200.0
+        assert job.max_seconds == 600
+        assert job.estimated_seconds > 0
+        assert job.video_info == {"formats": []}
+
+    def test_rejected_video_creates_no_job(self, user):
+        probe = VideoProbe(duration=None, live_status="is_live", availability="public", has_captions=False)
+        with patch("apps.quiz_management_app.jobs.probe_video", return_value=probe):
+            with pytest.raises(VideoRejectedError):
+                jobs.enqueue_quiz_job("https://youtu.be/abc123def45", user)
+        assert not QuizJob.objects.exists()
+
+
+@pytest.mark.django_db
+class TestClaim:
+    def test_claims_oldest_pending_job_once(self, user):
+        first = _job(user)
+        second = _job(user)
+
+        claimed = jobs.claim_next_job()
+        assert claimed.id == first.id
+        assert claimed.status == QuizJob.Status.RUNNING
+        assert claimed.attempts == 1
+        assert claimed.started_at is not None
+
+        assert jobs.claim_next_job().id == second.id
+        assert jobs.claim_next_job() is None
+
+    def test_claims_shortest_estimate_first(self, user):
+        long_job = _job(user, estimated_seconds=3600)
+        unknown = _job(user)
+        short = _job(user, estimated_seconds=30)
+
+        assert jobs.claim_next_job().id == short.id
+        assert jobs.claim_next_job().id == long_job.id
+        assert jobs.claim_next_job().id == unknown.id
+
+    def test_overdue_jobs_are_claimed_first(self, user, settings):
+        settings.QUIZ_JOB_MAX_WAIT = 60
+        long_job = _job(user, estimated_seconds=3600)
+        QuizJob.objects.filter(id=long_job.id).update(created_at=timezone.now() - timedelta(seconds=120))
+        _job(user, estimated_seconds=30)
+
+        assert jobs.claim_next_job().id == long_job.id
+
+    def test_requeues_stale_running_jobs(self, user, settings):
+        settings.QUIZ_JOB_STALE_AFTER = 60
+        settings.QUIZ_JOB_MAX_ATTEMPTS = 2
+        old = timezone.now() - timedelta(seconds=120)
+        retry = _job(user, status=QuizJob.Status.RUNNING, started_at=old, attempts=1)
+        give_up = _job(user, status=QuizJob.Status.RUNNING, started_at=old, attempts=2)
+        fresh = _job(user, status=QuizJob.Status.RUNNING, started_at=timezone.now(), attempts=1)
+        # updated_at is auto_now, so age the heartbeat with a queryset update.
+        QuizJob.objects.filter(pk__in=[retry.pk, give_up.pk]).update(updated_at=old)
+
+        assert jobs.requeue_stale_jobs() == 2
+
+        retry.refresh_from_db()
+        give_up.refresh_from_db()
+        fresh.refresh_from_db()
+        assert retry.status == QuizJob.Status.PENDING
+        assert give_up.status == QuizJob.Status.FAILED
+        assert fresh.status == QuizJob.Status.RUNNING
+
+    def test_long_job_with_recent_heartbeat_is_not_requeued(self, user, settings):
+        settings.QUIZ_JOB_STALE_AFTER = 60
+        job = _job(user, status=QuizJob.Status.RUNNING, started_at=timezone.now() - timedelta(hours=1), attempts=1)
+        QuizJob.objects.filter(pk=job.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+
+        jobs.touch_job(job.pk)
+
+        assert jobs.requeue_stale_jobs() == 0
+        job.refresh_from_db()
+        assert job.status == QuizJob.Status.RUNNING
+
+    def test_touch_ignores_finished_jobs(self, user):
+        old = timezone.now() - timedelta(hours=1)
+        job = _job(user, status=QuizJob.Status.SUCCEEDED)
+        QuizJob.objects.filter(pk=job.pk).update(updated_at=old)
+
+        jobs.touch_job(job.pk)
+
+        job.refresh_from_db()
+        assert job.updated_at == old
+
+
+class TestHeartbeat:
+    def test_beats_until_the_job_is_done(self):
+        beats = threading.Event()
+        with patch("apps.quiz_management_app.jobs.touch_job", side_effect=lambda _id: beats.set()) as touch:
+            with jobs.JobHeartbeat(7, interval=0.01):
+                assert beats.wait(5)
+            calls = touch.call_count
+            time.sleep(0.05)
+
+        assert calls >= 1
+        assert touch.call_count == calls
+        touch.assert_called_with(7)
+
+    def test_failed_beat_does_not_stop_the_heartbeat(self):
+        beats = []
+        done = threading.Event()
+
+        def flaky(_id):
+            beats.append(1)
+            if len(beats) == 1:
+                raise RuntimeError("db gone")
+            done.set()
+
+        with patch("apps.quiz_management_app.jobs.touch_job", side_effect=flaky):
+            with jobs.JobHeartbeat(7, interval=0.01):
+                assert done.wait(5)
+
+
+@pytest.mark.django_db
+class TestRunJob:
+    @patch("apps.quiz_management_app.jobs.create_quiz_from_url")
+    def test_success_links_quiz(self, mocked_create, user, quiz):
+        mocked_create.return_value = quiz
+        job = jobs.run_job(_job(user))
+
+        job.refresh_from_db()
+        assert job.status == QuizJob.Status.SUCCEEDED
+        assert job.quiz_id == quiz.id
+        assert job.finished_at is not None
+        mocked_create.assert_called_once_with(
+            job.video_url,
+            job.user,
+            fresh=False,
+            max_seconds=None,
+            model_name="small",
+            on_question=ANY,
+            video_info=None,
+        )
+        assert job.whisper_model == "small"
+
+    @patch("apps.quiz_management_app.jobs.create_quiz_from_url")
+    def test_adaptive_tier_uses_capped_duration_and_queue(self, mocked_create, user, quiz, settings):
+        settings.WHISPER_TIER_POLICY = "adaptive"
+        mocked_create.return_value = quiz
+        job = _job(user, duration_seconds=7200, max_seconds=600)
+        _job(user)
+
+        with patch("apps.quiz_management_app.jobs.select_whisper_model", return_value="base") as select:
+            jobs.run_job(job)
+
+        select.assert_called_once_with(600, 2)
+        assert mocked_create.call_args.kwargs["model_name"] == "base"
+
+    @pytest.mark.parametrize(
+        "exc, message",
+        [
+            (QuizCreationError("boom"), "boom"),
+            (InvalidYouTubeUrlError("nope"), "Only YouTube URLs are allowed."),
+            (RuntimeError("secret internals"), "Unexpected error while creating the quiz."),
+        ],
+    )
+    def test_failures_are_recorded(self, user, exc, message):
+        with patch("apps.quiz_management_app.jobs.create_quiz_from_url", side_effect=exc):
+            job = jobs.run_job(_job(user))
+
+        job.refresh_from_db()
+        assert job.status == QuizJob.Status.FAILED
+        assert job.error == message
+        assert job.quiz is None
+
+
+@pytest.mark.django_db
+class TestWorker:
+    @patch("apps.quiz_management_app.jobs.create_quiz_from_url")
+    def test_run_worker_once_drains_queue(self, mocked_create, user, quiz):
+        mocked_create.return_value = quiz
+        _job(user)
+        _job(user)
+
+        assert jobs.run_worker(once=True) == 2
+        assert QuizJob.objects.filter(status=QuizJob.Status.SUCCEEDED).count() == 2
+
+    def test_run_worker_honours_stop_flag(self, user):
+        _job(user)
+        assert jobs.run_worker(once=True, should_stop=lambda: True) == 0
+
+    @patch("apps.quiz_management_app.jobs.create_quiz_from_url")
+    def test_management_command(self, mocked_create, user, quiz, capsys):
+        mocked_create.return_value = quiz
+        _job(user)
+
+        call_command("run_quiz_worker", "--once", "--no-warmup")
+
+        assert "stopped after 1 job(s)" in capsys.readouterr().out
+        assert QuizJob.objects.get().status == QuizJob.Status.SUCCEEDED
@@ -0,0 +1,170 @@
+import json
+import urllib.error
+import urllib.request
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+
+from apps.quiz_management_app import metrics, utils
+from apps.quiz_management_app.models import QuizJob
+from apps.quiz_management_app.utils import QuizCreationError, create_quiz_from_url
+
+
+def _ok_response():
+    questions = [{"question_title": f"Q{i}?", "question_options": ["A", "B", "C", "D"], "answer": "A"} for i in range(10)]
+    return SimpleNamespace(text=json.dumps({"title": "T", "description": "D", "questions": questions}))
+
+
+def _count(stage, **labels):
+    return metrics.STAGE_SECONDS.count(stage=stage, **labels)
+
+
+class TestExposition:
+    def test_histogram_renders_cumulative_buckets(self):
+        h = metrics.Histogram("t_seconds", "Test.", ("stage",), buckets=(1, 5))
+        h.observe(0.5, stage="a")
+        h.observe(3, stage="a")
+        lines = h.render()
+
+        assert "# TYPE t_seconds histogram" in lines
+        assert 't_seconds_bucket{stage="a",le="1"} 1' in lines
+        assert 't_seconds_bucket{stage="a",le="5"} 2' in lines
+        assert 't_seconds_bucket{stage="a",le="+Inf"} 2' in lines
+        assert 't_seconds_sum{stage="a"} 3.5' in lines
+        assert 't_seconds_count{stage="a"} 2' in lines
+
+    def test_label_values_are_escaped(self):
+        c = metrics.Counter("t_total", "Test.", ("error",))
+        c.inc(error='say "hi"\n')
+        assert 't_total{error="say \\"hi\\"\\n"} 1' in c.render()
+
+    def test_stage_records_outcome_and_failures(self):
+        before_ok = _count("unit", outcome="ok", model="m")
+        before_err = metrics.STAGE_FAILURES.value(stage="unit", error="ValueError")
+
+        with metrics.stage("unit", model="m"):
+            pass
+        with pytest.raises(ValueError):
+            with metrics.stage("unit") as span:
+                span.labels["cache"] = "hit"
+                raise ValueError("boom")
+
+        assert _count("unit", outcome="ok", model="m") == before_ok + 1
+        assert _count("unit", outcome="error", cache="hit") >= 1
+        assert metrics.STAGE_FAILURES.value(stage="unit", error="ValueError") == before_err + 1
+
+
+@pytest.mark.django_db
+class TestPipelineStages:
+    @patch("apps.quiz_management_app.utils.download_audio_from_video")
+    @patch("apps.quiz_management_app.utils.generate_transcript", return_value="transcript")
+    @patch("apps.quiz_management_app.utils.get_ai_response", return_value=_ok_response())
+    def test_success_records_every_stage(self, mock_ai, mock_transcript, mock_dl, user, settings):
+        settings.WHISPER_MODEL = "small"
+        stages = [
+            ("transcript_cache", {"model": "small", "cache": "miss"}),
+            ("captions", {"cache": "miss"}),
+            ("download", {}),
+            ("transcribe", {"model": "small"}),
+            ("llm", {"model": "gemini-2.5-flash"}),
+            ("parse", {}),
+            ("validate", {}),
+            ("persist", {}),
+        ]
+        before = {name: _count(name, outcome="ok", **labels) for name, labels in stages}
+
+        create_quiz_from_url("https://www.youtube.com/watch?v=abc123def45", user)
+
+        for name, labels in stages:
+            assert _count(name, outcome="ok", **labels) == before[name] + 1, name
+
+    @patch("apps.quiz_management_app.utils.download_audio_from_video")
+    @patch("apps.quiz_management_app.utils.generate_transcript", return_value="transcript")
+    def test_llm_output_validity_is_counted_per_mode(self, mock_transcript, mock_dl, user, settings):
+        settings.GEMINI_STRUCTURED_OUTPUT = False
+        settings.LLM_CACHE_ENABLED = False
+        labels = {"model": "gemini-2.5-flash", "mode": "prompt"}
+        ok = utils.LLM_OUTPUTS.value(result="ok", **labels)
+        invalid = utils.LLM_OUTPUTS.value(result="invalid", **labels)
+
+        with patch("apps.quiz_management_app.utils.get_ai_response", return_value=_ok_response()):
+            create_quiz_from_url("https://www.youtube.com/watch?v=abc123def45", user)
+        with patch("apps.quiz_management_app.utils.get_ai_response", return_value=SimpleNamespace(text="not json")):
+            with pytest.raises(QuizCreationError):
+                create_quiz_from_url("https://www.youtube.com/watch?v=abc123def45", user, fresh=True)
+
+        assert utils.LLM_OUTPUTS.value(result="ok", **labels) == ok + 1
+        assert utils.LLM_OUTPUTS.value(result="invalid", **labels) == invalid + 1
+
+    @patch("apps.quiz_management_app.utils.download_audio_from_video")
+    @patch("apps.quiz_management_app.utils.generate_transcript", return_value="transcript")
+    @patch("apps.quiz_management_app.utils.get_ai_response", return_value=SimpleNamespace(text="not json"))
+    def test_failure_is_counted_by_stage(self, mock_ai, mock_transcript, mock_dl, user):
+        before = metrics.STAGE_FAILURES.value(stage="parse", error="QuizCreationError")
+        with pytest.raises(QuizCreationError):
+            create_quiz_from_url("https://www.youtube.com/watch?v=abc123def45", user)
+        assert metrics.STAGE_FAILURES.value(stage="parse", error="QuizCreationError") == before + 1
+
+
+@pytest.mark.django_db
+class TestEndpoints:
+    def test_metrics_endpoint(self, client, user, settings):
+        QuizJob.objects.create(user=user, video_url="https://www.youtube.com/watch?v=abc123def45")
+        resp = client.get("/metrics")
+
+        assert resp.status_code == 200
+        assert resp["Content-Type"].startswith("text/plain; version=0.0.4")
+        body = resp.content.decode()
+        assert "# TYPE quiz_stage_duration_seconds histogram" in body
+        assert 'quiz_jobs{status="pending"} 1' in body
+
+    def test_metrics_can_be_disabled(self, client, settings):
+        settings.METRICS_ENABLED = False
+        assert client.get("/metrics").status_code == 404
+
+    def test_remote_scrape_without_token_is_refused(self, client, settings):
+        settings.METRICS_TOKEN = ""
+        assert client.get("/metrics", REMOTE_ADDR="203.0.113.7").status_code == 401
+
+    def test_token_is_required_when_configured(self, client, settings):
+        settings.METRICS_TOKEN = "s3cret"
+
+        assert client.get("/metrics").status_code == 401
+        assert client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong").status_code == 401
+        resp = client.get("/metrics", REMOTE_ADDR="203.0.113.7", HTTP_AUTHORIZATION="Bearer s3cret")
+        assert resp.status_code == 200
+
+    def test_worker_serves_metrics_on_port(self):
+        with patch("apps.quiz_management_app.management.commands.run_quiz_worker.metrics.start_http_server") as start:
+            call_command("run_quiz_worker", "--once", "--no-warmup", "--metrics-port", "9109")
+        start.assert_called_once_with(9109, addr="127.0.0.1", token="")
+
+    def test_worker_exporter_listens_publicly_only_with_a_token(self, settings):
+        settings.METRICS_TOKEN = "s3cret"
+        with patch("apps.quiz_management_app.management.commands.run_quiz_worker.metrics.start_http_server") as start:
+            call_command("run_quiz_worker", "--once", "--no-warmup", "--metrics-port", "9109")
+        start.assert_called_once_with(9109, addr="0.0.0.0", token="s3cret")
+
+    def test_standalone_http_server(self):
+        server = metrics.start_http_server(0, addr="127.0.0.1")
+        try:
+            port = server.server_address[1]
+            body = urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5).read().decode()
+        finally:
+            server.shutdown()
+        assert "quiz_stage_failures_total" in body
+
+    def test_standalone_http_server_checks_the_token(self):
+        server = metrics.start_http_server(0, addr="127.0.0.1", token="s3cret")
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with pytest.raises(urllib.error.HTTPError) as denied:
+                urllib.request.urlopen(url, timeout=5)
+            request = urllib.request.Request(url, headers={"Authorization": "Bearer s3cret"})
+            body = urllib.request.urlopen(request, timeout=5).read().decode()
+        finally:
+            server.shutdown()
+        assert denied.value.code == 401
+        assert "quiz_stage_failures_total" in body
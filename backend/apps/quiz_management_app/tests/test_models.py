@@ -9,7 +9,7 @@ class TestModels:
         quiz = Quiz.objects.create(
             title="My Quiz",
             description="Desc",
-            video_url="https://www.youtube.com/watch?v=abc123",
+            video_url="https://www.youtube.com/watch?v=abc123def45",
             user=user,
         )
         assert str(quiz) == f"My Quiz (#{quiz.pk})"
@@ -18,7 +18,7 @@ class TestModels:
         quiz = Quiz.objects.create(
             title="My Quiz",
             description="Desc",
-            video_url="https://www.youtube.com/watch?v=abc123",
+            video_url="https://www.youtube.com/watch?v=abc123def45",
             user=user,
         )
         qq = QuizQuestion.objects.create(
@@ -27,4 +27,42 @@ class TestModels:
             question_options=["A", "B", "C", "D"],
             answer="A",
         )
-        assert str(qq) == f"Q{qq.pk} for Quiz#{quiz.pk}"
\ No newline at end of file
+        assert str(qq) == f"Q{qq.pk} for Quiz#{quiz.pk}"
+
+
+@pytest.mark.django_db
+class TestQuizVideoId:
+    def test_save_fills_video_id_from_url(self, user):
+        quiz = Quiz.objects.create(
+            title="T",
+            description="D",
+            video_url="https://youtu.be/abc123def45?si=x",
+            user=user,
+        )
+        assert quiz.video_id == "abc123def45"
+
+    def test_for_video_matches_any_url_shape(self, user, other_user, quiz):
+        other = Quiz.objects.create(
+            title="T",
+            description="D",
+            video_url="https://m.youtube.com/watch?v=abc123def45&t=3",
+            user=other_user,
+        )
+        Quiz.objects.create(title="X", description="D", video_url="https://www.youtube.com/watch?v=zzzzzzzzzzz", user=user)
+
+        ids = set(Quiz.objects.for_video("https://www.youtube.com/shorts/abc123def45").values_list("id", flat=True))
+        assert ids == {quiz.id, other.id}
+        assert Quiz.objects.for_video("abc123def45").count() == 2
+        assert Quiz.objects.for_video("").count() == 0
+
+    def test_backfill_migration_sets_missing_ids(self, quiz):
+        from importlib import import_module
+
+        from django.apps import apps
+
+        Quiz.objects.filter(pk=quiz.pk).update(video_id="")
+        migration = import_module("apps.quiz_management_app.migrations.0005_quiz_video_id")
+        migration.backfill_video_id(apps, None)
+
+        quiz.refresh_from_db()
+        assert quiz.video_id == "abc123def45"
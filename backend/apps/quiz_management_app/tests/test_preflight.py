@@ -0,0 +1,205 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+import yt_dlp
+
+from apps.quiz_management_app import utils
+from apps.quiz_management_app.utils import VideoProbe, VideoRejectedError, VideoTooLongError
+
+
+def _probe(**kwargs):
+    data = {"duration": 600.0, "live_status": "not_live", "availability": "public", "has_captions": False}
+    data.update(kwargs)
+    return VideoProbe(**data)
+
+
+def _ydl_returning(info=None, side_effect=None):
+    ydl = MagicMock()
+    ydl.__enter__.return_value = ydl
+    ydl.extract_info.return_value = info
+    ydl.extract_info.side_effect = side_effect
+    return ydl
+
+
+class TestProbeVideo:
+    def test_disabled_returns_none(self, settings):
+        settings.VIDEO_PREFLIGHT_ENABLED = False
+        with patch("yt_dlp.YoutubeDL") as mocked:
+            assert utils.probe_video("https://www.youtube.com/watch?v=abc123def45") is None
+        mocked.assert_not_called()
+
+    def test_reads_metadata_without_download(self, settings):
+        settings.VIDEO_PREFLIGHT_ENABLED = True
+        info = {"duration": 95, "live_status": "not_live", "availability": "public"}
+        ydl = _ydl_returning(info)
+        with patch("yt_dlp.YoutubeDL", return_value=ydl) as mocked:
+            probe = utils.probe_video("https://www.youtube.com/watch?v=abc123def45")
+
+        assert probe == _probe(duration=95.0)
+        assert mocked.call_args[0][0]["skip_download"] is True
+        ydl.extract_info.assert_called_once_with("https://www.youtube.com/watch?v=abc123def45", download=False)
+
+    @pytest.mark.parametrize(
+        "message",
+        [
+            "ERROR: [youtube] abc123def45: Video unavailable",
+            "ERROR: [youtube] abc123def45: Private video. Sign in if you've been granted access to this video",
+            "ERROR: [youtube] abc123def45: This video has been removed by the uploader",
+            "ERROR: [youtube] abc123def45: The uploader has not made this video available in your country",
+        ],
+    )
+    def test_unavailable_video_is_rejected(self, settings, message):
+        settings.VIDEO_PREFLIGHT_ENABLED = True
+        ydl = _ydl_returning(side_effect=yt_dlp.utils.DownloadError(message))
+        with patch("yt_dlp.YoutubeDL", return_value=ydl):
+            with pytest.raises(VideoRejectedError):
+                utils.probe_video("https://www.youtube.com/watch?v=abc123def45")
+
+    @pytest.mark.parametrize(
+        "message",
+        [
+            "ERROR: [youtube] abc123def45: Sign in to confirm you're not a bot",
+            "ERROR: [youtube] abc123def45: Video unavailable. This content isn't available, try again later.",
+            "ERROR: Unable to download webpage: HTTP Error 429: Too Many Requests",
+            "ERROR: Unable to download webpage: <urlopen error timed out>",
+        ],
+    )
+    def test_transient_download_error_admits_without_probe(self, settings, message):
+        settings.VIDEO_PREFLIGHT_ENABLED = True
+        ydl = _ydl_returning(side_effect=yt_dlp.utils.DownloadError(message))
+        with patch("yt_dlp.YoutubeDL", return_value=ydl):
+            assert utils.probe_video("https://www.youtube.com/watch?v=abc123def45") is None
+
+    def test_keeps_trimmed_info_for_the_pipeline(self, settings):
+        settings.VIDEO_PREFLIGHT_ENABLED = True
+        settings.CAPTIONS_LANGUAGES = ["en"]
+        info = {
+            "duration": 95,
+            "language": "de",
+            "formats": [{"format_id": "140", "url": "https://example.invalid/a"}],
+            "thumbnails": [{"url": "t"}] * 50,
+            "automatic_captions": {"de-orig": [], "en": [], "fr": [], "ja": []},
+        }
+        with patch("yt_dlp.YoutubeDL", return_value=_ydl_returning(info)):
+            probe = utils.probe_video("https://www.youtube.com/watch?v=abc123def45")
+
+        assert probe.info["formats"] == info["formats"]
+        assert "thumbnails" not in probe.info
+        assert set(probe.info["automatic_captions"]) == {"de-orig", "en"}
+
+    def test_slow_probe_is_skipped_after_the_timeout(self, settings):
+        settings.VIDEO_PREFLIGHT_ENABLED = True
+        settings.VIDEO_PREFLIGHT_TIMEOUT = 0.05
+        entered, release = threading.Event(), threading.Event()
+
+        def hang(*args, **kwargs):
+            entered.set()
+            release.wait(5)
+            return {"duration": 95}
+
+        try:
+            with patch("yt_dlp.YoutubeDL", return_value=_ydl_returning(side_effect=hang)) as mocked:
+                started = time.monotonic()
+                assert utils.probe_video("https://www.youtube.com/watch?v=abc123def45") is None
+                assert time.monotonic() - started < 2
+                assert entered.wait(5)
+                assert mocked.call_args[0][0]["socket_timeout"] == 0.05
+        finally:
+            release.set()
+
+    def test_unexpected_error_admits_without_probe(self, settings):
+        settings.VIDEO_PREFLIGHT_ENABLED = True
+        ydl = _ydl_returning(side_effect=OSError("network down"))
+        with patch("yt_dlp.YoutubeDL", return_value=ydl):
+            assert utils.probe_video("https://www.youtube.com/watch?v=abc123def45") is None
+
+
+class TestAdmitVideo:
+    def test_no_probe_is_admitted(self):
+        assert utils.admit_video(None) is None
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{"live_status": "is_live"}, {"live_status": "is_upcoming"}, {"availability": "private"}],
+    )
+    def test_rejects_live_and_private(self, kwargs):
+        with pytest.raises(VideoRejectedError):
+            utils.admit_video(_probe(**kwargs))
+
+    def test_short_video_is_admitted_uncapped(self, settings):
+        settings.MAX_VIDEO_DURATION = 1200
+        assert utils.admit_video(_probe(duration=600.0)) is None
+
+    def test_long_video_rejected_by_default(self, settings):
+        settings.MAX_VIDEO_DURATION = 1200
+        settings.VIDEO_DURATION_POLICY = "reject"
+        with pytest.raises(VideoTooLongError, match="too long"):
+            utils.admit_video(_probe(duration=5000.0))
+
+    def test_long_video_capped_with_cap_policy(self, settings):
+        settings.MAX_VIDEO_DURATION = 1200
+        settings.VIDEO_DURATION_POLICY = "cap"
+        assert utils.admit_video(_probe(duration=5000.0)) == 1200
+
+    def test_zero_limit_disables_duration_check(self, settings):
+        settings.MAX_VIDEO_DURATION = 0
+        assert utils.admit_video(_probe(duration=50000.0)) is None
+
+
+class TestEstimate:
+    def test_unknown_duration(self):
+        assert utils.estimate_processing_seconds(None) is None
+        assert utils.estimate_processing_seconds(_probe(duration=None)) is None
+
+    def test_scales_with_duration_and_cap(self, settings):
+        settings.WHISPER_REALTIME_FACTOR = 0.5
+        full = utils.estimate_processing_seconds(_probe(duration=1000.0))
+        capped = utils.estimate_processing_seconds(_probe(duration=1000.0), max_seconds=200)
+        assert full - capped == pytest.approx(400.0)
+
+    def test_captions_are_cheap(self):
+        with_captions = utils.estimate_processing_seconds(_probe(duration=3600.0, has_captions=True))
+        assert with_captions < utils.estimate_processing_seconds(_probe(duration=3600.0))
+
+
+class TestDurationCap:
+    def test_captions_cut_at_max_seconds(self):
+        raw = "WEBVTT\n\n00:00:00.000 --> 00:00:02.000\nfirst\n\n00:00:10.000 --> 00:00:12.000\nlater\n"
+        assert utils.captions_to_text(raw, max_seconds=5) == "first"
+
+    def test_download_requests_only_the_first_seconds(self, settings):
+        settings.AUDIO_PIPELINE = "mp3"
+        with patch("yt_dlp.YoutubeDL") as mocked:
+            utils.download_audio_from_video(
+                "https://www.youtube.com/watch?v=abc123def45", utils.TempAudio(base_path="/tmp/a"), max_seconds=60
+            )
+        assert "download_ranges" in mocked.call_args[0][0]
+
+    def test_options_key_changes_with_cap(self):
+        assert utils.transcription_options() == utils.TRANSCRIBE_OPTIONS
+        assert utils.transcription_options(60)["max_seconds"] == 60
+
+
+class TestProbeInfoReuse:
+    url = "https://www.youtube.com/watch?v=abc123def45"
+    info = {"id": "abc123def45", "formats": [{"format_id": "140", "url": "https://example.invalid/a"}]}
+
+    def test_download_uses_probe_info(self, settings):
+        settings.AUDIO_PIPELINE = "mp3"
+        with patch("yt_dlp.YoutubeDL") as mocked:
+            utils.download_audio_from_video(self.url, utils.TempAudio(base_path="/tmp/a"), info=self.info)
+
+        ydl = mocked.return_value.__enter__.return_value
+        ydl.process_ie_result.assert_called_once_with(self.info, download=True)
+        ydl.download.assert_not_called()
+
+    def test_expired_probe_info_falls_back_to_extraction(self, settings):
+        settings.AUDIO_PIPELINE = "mp3"
+        with patch("yt_dlp.YoutubeDL") as mocked:
+            ydl = mocked.return_value.__enter__.return_value
+            ydl.process_ie_result.side_effect = yt_dlp.utils.DownloadError("HTTP Error 403: Forbidden")
+            utils.download_audio_from_video(self.url, utils.TempAudio(base_path="/tmp/a"), info=self.info)
+
+        ydl.download.assert_called_once_with([self.url])
@@ -0,0 +1,116 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from apps.quiz_management_app import utils
+from apps.quiz_management_app.models import Quiz
+from apps.quiz_management_app.utils import QuizCreationError, create_quiz_from_url, repair_quiz_payload
+
+
+def _question(i, answer="A"):
+    return {"question_title": f"Q{i}?", "question_options": ["A", "B", "C", "D"], "answer": answer}
+
+
+def _payload(questions):
+    return {"title": "T", "description": "D", "questions": questions}
+
+
+def _client(*answers):
+    client = MagicMock()
+    client.models.generate_content.side_effect = [SimpleNamespace(text=a) for a in answers]
+    return client
+
+
+def _questions_json(*indexes):
+    return json.dumps({"questions": [_question(i) for i in indexes]})
+
+
+class TestRepairQuizPayload:
+    def test_only_missing_questions_are_requested(self):
+        questions = [_question(i) for i in range(8)] + [_question(8, answer="Z")]
+        client = _client(_questions_json(20, 21))
+
+        with patch("apps.quiz_management_app.utils.gemini_client", return_value=client):
+            repaired = repair_quiz_payload(_payload(questions), "transcript")
+
+        assert [q["question_title"] for q in repaired["questions"]] == [f"Q{i}?" for i in [*range(8), 20, 21]]
+        assert repaired["title"] == "T"
+        call = client.models.generate_content.call_args.kwargs
+        assert "2 more question(s)" in call["contents"]
+        assert "Answer must be one of the options" in call["contents"]
+        assert "- Q0?" in call["contents"]
+        if call["config"] is not None:
+            schema = call["config"]["response_schema"]["properties"]["questions"]
+            assert (schema["min_items"], schema["max_items"]) == (2, 2)
+
+    def test_extra_questions_are_trimmed_without_a_call(self):
+        client = _client()
+        with patch("apps.quiz_management_app.utils.gemini_client", return_value=client):
+            repaired = repair_quiz_payload(_payload([_question(i) for i in range(12)]), "transcript")
+
+        assert len(repaired["questions"]) == 10
+        client.models.generate_content.assert_not_called()
+
+    def test_duplicates_and_bad_rounds_are_retried(self):
+        client = _client(_questions_json(0, 30), "not json")
+        with patch("apps.quiz_management_app.utils.gemini_client", return_value=client):
+            with pytest.raises(QuizCreationError, match="9 valid after 2 repair round"):
+                repair_quiz_payload(_payload([_question(i) for i in range(8)]), "transcript")
+
+        last_prompt = client.models.generate_content.call_args.kwargs["contents"]
+        assert "Duplicate of an existing question" in last_prompt
+
+    def test_rounds_are_bounded(self, settings):
+        settings.QUIZ_REPAIR_MAX_ROUNDS = 1
+        client = _client("not json", _questions_json(20))
+        with patch("apps.quiz_management_app.utils.gemini_client", return_value=client):
+            with pytest.raises(QuizCreationError):
+                repair_quiz_payload(_payload([_question(i) for i in range(9)]), "transcript")
+        assert client.models.generate_content.call_count == 1
+
+
+@pytest.mark.django_db
+class TestRepairInPipeline:
+    url = "https://www.youtube.com/watch?v=abc123def45"
+
+    @pytest.fixture(autouse=True)
+    def _transcript(self):
+        with patch("apps.quiz_management_app.utils.get_transcript", return_value=utils.Transcript("words", "whisper")):
+            yield
+
+    def test_nine_questions_are_completed_instead_of_failing(self, user):
+        first = SimpleNamespace(text=json.dumps(_payload([_question(i) for i in range(9)])))
+        labels = {"model": utils.GEMINI_MODEL, "mode": utils.gemini_output_mode()}
+        before = utils.LLM_OUTPUTS.value(result="repaired", **labels)
+        repaired_before = utils.REPAIRED_QUESTIONS.value()
+
+        with patch("apps.quiz_management_app.utils.get_ai_response", return_value=first) as ai, patch(
+            "apps.quiz_management_app.utils.gemini_client", return_value=_client(_questions_json(9))
+        ):
+            quiz = create_quiz_from_url(self.url, user)
+
+        ai.assert_called_once()
+        assert quiz.questions.count() == 10
+        assert utils.LLM_OUTPUTS.value(result="repaired", **labels) == before + 1
+        assert utils.REPAIRED_QUESTIONS.value() == repaired_before + 1
+
+    def test_broken_header_is_not_repaired(self, user):
+        bad = SimpleNamespace(text=json.dumps({"title": "T", "questions": [_question(i) for i in range(9)]}))
+        client = _client()
+        with patch("apps.quiz_management_app.utils.get_ai_response", return_value=bad), patch(
+            "apps.quiz_management_app.utils.gemini_client", return_value=client
+        ):
+            with pytest.raises(QuizCreationError, match="missing required keys"):
+                create_quiz_from_url(self.url, user)
+
+        client.models.generate_content.assert_not_called()
+        assert not Quiz.objects.exists()
+
+    def test_disabled_keeps_failing_fast(self, user, settings):
+        settings.QUIZ_REPAIR_MAX_ROUNDS = 0
+        nine = SimpleNamespace(text=json.dumps(_payload([_question(i) for i in range(9)])))
+        with patch("apps.quiz_management_app.utils.get_ai_response", return_value=nine):
+            with pytest.raises(QuizCreationError, match="exactly 10 questions"):
+                create_quiz_from_url(self.url, user)
@@ -0,0 +1,210 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.utils import timezone
+
+from apps.quiz_management_app import jobs, utils
+from apps.quiz_management_app.models import Quiz, QuizJob
+from apps.quiz_management_app.quiz_stream import QuizStreamParser
+from apps.quiz_management_app.utils import QuizCreationError, create_quiz_from_url
+
+
+def _questions(n=10):
+    return [{"question_title": f"Q{i}?", "question_options": ["A", "B", "C", "D"], "answer": "A"} for i in range(n)]
+
+
+def _quiz_text(questions=None):
+    payload = {"title": "T", "description": "D", "questions": _questions() if questions is None else questions}
+    return json.dumps(payload, indent=2)
+
+
+def _chunks(text, size):
+    return [
+        SimpleNamespace(text=text[i : i + size], usage_metadata=None) for i in range(0, len(text), size)
+    ] + [SimpleNamespace(text="", usage_metadata=SimpleNamespace(prompt_token_count=900, candidates_token_count=300))]
+
+
+def _stream_client(chunks):
+    client = MagicMock()
+    client.models.generate_content_stream.return_value = iter(chunks)
+    return client
+
+
+class TestQuizStreamParser:
+    @pytest.mark.parametrize("size", [1, 5, 64, 10_000])
+    def test_emits_each_question_once_whatever_the_chunking(self, size):
+        text = _quiz_text()
+        parser = QuizStreamParser()
+        emitted = []
+        for i in range(0, len(text), size):
+            emitted += parser.feed(text[i : i + size])
+
+        assert emitted == _questions()
+        assert parser.fields == {"title": "T", "description": "D"}
+        assert parser.complete
+        assert parser.text == text
+
+    def test_question_is_emitted_when_its_object_closes(self):
+        text = _quiz_text()
+        cut = text.index("}") + 1
+        parser = QuizStreamParser()
+
+        assert parser.feed(text[: cut - 1]) == []
+        assert parser.feed(text[cut - 1 : cut]) == [_questions()[0]]
+
+    def test_braces_and_quotes_inside_strings_are_ignored(self):
+        question = {"question_title": 'What does "{x}" mean, [really]?', "question_options": ["}", "]", "\\", '"'], "answer": "}"}
+        text = json.dumps({"title": "questions", "description": "{", "questions": [question]})
+
+        parser = QuizStreamParser()
+        assert [q for ch in text for q in parser.feed(ch)] == [question]
+        assert parser.fields == {"title": "questions", "description": "{"}
+
+    def test_skips_leading_prose_and_backticks(self):
+        parser = QuizStreamParser()
+        emitted = parser.feed("Sure! ```json\n" + _quiz_text(_questions(2)) + "\n```")
+        assert emitted == _questions(2)
+        assert parser.complete
+
+    def test_nested_objects_outside_questions_are_not_emitted(self):
+        parser = QuizStreamParser()
+        assert parser.feed('{"meta": {"a": [{"b": 1}]}, "questions": []}') == []
+
+
+@pytest.mark.django_db
+class TestStreamingOrchestrator:
+    url = "https://www.youtube.com/watch?v=abc123def45"
+
+    @pytest.fixture(autouse=True)
+    def _streaming(self, settings):
+        settings.GEMINI_STREAMING = True
+
+    @patch("apps.quiz_management_app.utils.download_audio_from_video")
+    @patch("apps.quiz_management_app.utils.generate_transcript", return_value="transcript")
+    def test_questions_are_delivered_before_the_quiz_is_saved(self, _t, _dl, user):
+        seen = []
+
+        def on_question(question):
+            seen.append((question["question_title"], Quiz.objects.count()))
+
+        client = _stream_client(_chunks(_quiz_text(), 40))
+        with patch("apps.quiz_management_app.utils.gemini_client", return_value=client), patch.object(
+            utils.LLM_FIRST_QUESTION_SECONDS, "observe"
+        ) as first_question:
+            quiz = create_quiz_from_url(self.url, user, on_question=on_question)
+
+        assert seen == [(f"Q{i}?", 0) for i in range(10)]
+        assert quiz.questions.count() == 10
+        first_question.assert_called_once()
+        assert first_question.call_args.kwargs == {"model": utils.GEMINI_MODEL}
+
+    @patch("apps.quiz_management_app.utils.download_audio_from_video")
+    @patch("apps.quiz_management_app.utils.generate_transcript", return_value="transcript")
+    def test_invalid_question_stops_the_stream_without_repair(self, _t, _dl, user, settings):
+        settings.QUIZ_REPAIR_MAX_ROUNDS = 0
+        bad = _questions(3)
+        bad[1]["answer"] = "E"
+        seen = []
+
+        client = _stream_client(_chunks(_quiz_text(bad), 16))
+        with patch("apps.quiz_management_app.utils.gemini_client", return_value=client):
+            with pytest.raises(QuizCreationError, match="Answer must be one of the options"):
+                create_quiz_from_url(self.url, user, on_question=seen.append)
+
+        assert seen == _questions(1)
+        assert Quiz.objects.count() == 0
+
+    @patch("apps.quiz_management_app.utils.download_audio_from_video")
+    @patch("apps.quiz_management_app.utils.generate_transcript", return_value="transcript")
+    def test_invalid_question_is_skipped_and_repaired(self, _t, _dl, user):
+        questions = _questions()
+        questions[4]["answer"] = "E"
+        fixed = {"question_title": "Fixed?", "question_options": ["A", "B", "C", "D"], "answer": "B"}
+        seen = []
+
+        client = _stream_client(_chunks(_quiz_text(questions), 32))
+        client.models.generate_content.return_value = SimpleNamespace(text=json.dumps({"questions": [fixed]}))
+        with patch("apps.quiz_management_app.utils.gemini_client", return_value=client):
+            quiz = create_quiz_from_url(self.url, user, on_question=seen.append)
+
+        expected = [q for i, q in enumerate(_questions()) if i != 4] + [fixed]
+        assert seen == expected
+        assert [q.question_title for q in quiz.questions.all()] == [q["question_title"] for q in expected]
+
+    def test_streamed_response_reports_usage_from_last_chunk(self):
+        client = _stream_client(_chunks(_quiz_text(), 100))
+        with patch("apps.quiz_management_app.utils.gemini_client", return_value=client):
+            resp = utils.stream_ai_response("transcript")
+
+        assert json.loads(resp.text)["questions"] == _questions()
+        assert utils.response_token_counts(resp) == {"prompt_tokens": 900, "response_tokens": 300}
+        assert resp.first_question_seconds is not None
+
+    @patch("apps.quiz_management_app.utils.download_audio_from_video")
+    @patch("apps.quiz_management_app.utils.generate_transcript", return_value="transcript")
+    def test_job_exposes_partial_questions(self, _t, _dl, user):
+        job = QuizJob.objects.create(
+            user=user,
+            video_url=self.url,
+            status=QuizJob.Status.RUNNING,
+            started_at=timezone.now(),
+            attempts=1,
+            partial_questions=[{"stale": True}],
+        )
+        client = _stream_client(_chunks(_quiz_text(), 40))
+        with patch("apps.quiz_management_app.utils.gemini_client", return_value=client):
+            jobs.run_job(job)
+
+        job.refresh_from_db()
+        assert job.status == QuizJob.Status.SUCCEEDED
+        # the stale entry from an earlier attempt is dropped
+        assert job.partial_questions == _questions()
+
+    def _running_job(self, user):
+        return QuizJob.objects.create(
+            user=user, video_url=self.url, status=QuizJob.Status.RUNNING, started_at=timezone.now(), attempts=1
+        )
+
+    @patch("apps.quiz_management_app.utils.download_audio_from_video")
+    @patch("apps.quiz_management_app.utils.generate_transcript", return_value="transcript")
+    def test_finished_job_shows_the_repaired_quiz_not_the_stream(self, _t, _dl, user):
+        # 11 valid questions stream in; the repair pass trims the quiz back to 10.
+        streamed = _questions(11)
+        job = self._running_job(user)
+        published = []
+        saver = jobs._question_saver(job)
+
+        def on_question(question):
+            published.append(question)
+            saver(question)
+
+        client = _stream_client(_chunks(_quiz_text(streamed), 40))
+        with (
+            patch("apps.quiz_management_app.utils.gemini_client", return_value=client),
+            patch("apps.quiz_management_app.jobs._question_saver", return_value=on_question),
+        ):
+            jobs.run_job(job)
+
+        job.refresh_from_db()
+        assert published == streamed
+        assert job.status == QuizJob.Status.SUCCEEDED
+        assert job.partial_questions == _questions(10)
+        assert [q.question_title for q in job.quiz.questions.all()] == [q["question_title"] for q in _questions(10)]
+
+    @patch("apps.quiz_management_app.utils.download_audio_from_video")
+    @patch("apps.quiz_management_app.utils.generate_transcript", return_value="transcript")
+    def test_failed_job_drops_streamed_questions(self, _t, _dl, user, settings):
+        settings.QUIZ_REPAIR_MAX_ROUNDS = 0
+        questions = _questions(3)
+        questions[2]["answer"] = "E"
+        job = self._running_job(user)
+
+        client = _stream_client(_chunks(_quiz_text(questions), 40))
+        with patch("apps.quiz_management_app.utils.gemini_client", return_value=client):
+            jobs.run_job(job)
+
+        job.refresh_from_db()
+        assert job.status == QuizJob.Status.FAILED
+        assert job.partial_questions == []
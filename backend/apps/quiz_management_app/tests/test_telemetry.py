@@ -0,0 +1,191 @@
+import json
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.quiz_management_app import jobs, metrics
+from apps.quiz_management_app.models import PipelineTelemetry, QuizJob
+from apps.quiz_management_app.telemetry import percentile, pipeline_report
+
+
+def _ok_response():
+    questions = [{"question_title": f"Q{i}?", "question_options": ["A", "B", "C", "D"], "answer": "A"} for i in range(10)]
+    return SimpleNamespace(
+        text=json.dumps({"title": "T", "description": "D", "questions": questions}),
+        usage_metadata=SimpleNamespace(prompt_token_count=1200, candidates_token_count=340),
+    )
+
+
+def _running_job(user, **kwargs):
+    return QuizJob.objects.create(
+        user=user,
+        video_url="https://www.youtube.com/watch?v=abc123def45",
+        status=QuizJob.Status.RUNNING,
+        started_at=timezone.now(),
+        attempts=1,
+        **kwargs,
+    )
+
+
+class TestTrace:
+    def test_trace_sums_repeated_stages_and_keeps_annotations(self):
+        with metrics.trace() as t:
+            with metrics.stage("persist"):
+                pass
+            with metrics.stage("persist"):
+                pass
+            metrics.annotate(audio_seconds=12.5, prompt_tokens=None)
+
+        assert list(t.stages) == ["persist"]
+        assert t.info == {"audio_seconds": 12.5}
+        assert metrics.current_trace() is None
+
+    def test_failed_stage_is_the_innermost_failure(self):
+        with metrics.trace() as t:
+            with pytest.raises(ValueError):
+                with metrics.stage("outer"):
+                    with metrics.stage("inner"):
+                        raise ValueError("boom")
+        assert t.failed_stage == "inner"
+
+    def test_nested_stages_are_not_counted_twice(self):
+        with metrics.trace() as t:
+            with metrics.stage("transcribe"):
+                with metrics.stage("decode"):
+                    time.sleep(0.02)
+        assert t.seconds >= t.stages["transcribe"] >= t.stages["decode"] >= 0.02
+        assert t.seconds < t.stages["transcribe"] + t.stages["decode"]
+
+    def test_annotate_outside_trace_is_noop(self):
+        metrics.annotate(audio_seconds=1.0)
+        assert metrics.current_trace() is None
+
+
+@pytest.mark.django_db
+class TestRecording:
+    @patch("apps.quiz_management_app.utils.download_audio_from_video")
+    @patch("apps.quiz_management_app.utils.generate_transcript", return_value="a transcript")
+    @patch("apps.quiz_management_app.utils.get_ai_response", return_value=_ok_response())
+    def test_successful_job_records_telemetry(self, mock_ai, mock_transcript, mock_dl, user, settings):
+        settings.WHISPER_MODEL = "small"
+        job = _running_job(user, duration_seconds=600.0, max_seconds=300)
+
+        jobs.run_job(job)
+
+        row = PipelineTelemetry.objects.get(job=job)
+        assert row.outcome == PipelineTelemetry.Outcome.OK
+        assert row.quiz_id == job.quiz_id
+        assert {"transcript_cache", "captions", "download", "transcribe", "llm", "persist"} <= set(row.stages)
+        assert row.audio_seconds == 300.0  # preflight duration capped by max_seconds
+        assert row.transcript_chars == len("a transcript")
+        assert row.transcript_source == "whisper"
+        assert (row.prompt_tokens, row.response_tokens) == (1200, 340)
+        assert row.whisper_model == "small"
+        assert row.llm_model == "gemini-2.5-flash"
+        assert row.attempts == 1
+        assert row.total_seconds >= max(row.stages.values())
+
+    @patch("apps.quiz_management_app.utils.download_audio_from_video")
+    @patch("apps.quiz_management_app.utils.generate_transcript", return_value="a transcript")
+    @patch("apps.quiz_management_app.utils.get_ai_response", return_value=_ok_response())
+    def test_cached_transcript_is_not_counted_as_a_whisper_run(self, mock_ai, mock_transcript, mock_dl, user):
+        jobs.run_job(_running_job(user))
+        job = jobs.run_job(_running_job(user, fresh=True))
+
+        row = PipelineTelemetry.objects.get(job=job)
+        assert mock_transcript.call_count == 1
+        assert row.transcript_source == "transcript_cache"
+        assert "transcribe" not in row.stages
+        assert row.whisper_model == ""
+        assert job.quiz.transcript_source == "whisper"
+
+    @patch("apps.quiz_management_app.utils.download_audio_from_video")
+    @patch("apps.quiz_management_app.utils.generate_transcript", return_value="a transcript")
+    @patch("apps.quiz_management_app.utils.get_ai_response", return_value=SimpleNamespace(text="not json"))
+    def test_failed_job_records_failed_stage(self, mock_ai, mock_transcript, mock_dl, user):
+        job = _running_job(user)
+
+        jobs.run_job(job)
+
+        row = PipelineTelemetry.objects.get(job=job)
+        assert row.outcome == PipelineTelemetry.Outcome.ERROR
+        assert row.failed_stage == "parse"
+        assert row.quiz is None
+
+    @patch("apps.quiz_management_app.jobs.create_quiz_from_url")
+    def test_can_be_disabled(self, mocked_create, user, quiz, settings):
+        settings.PIPELINE_TELEMETRY_ENABLED = False
+        mocked_create.return_value = quiz
+        jobs.run_job(_running_job(user))
+        assert not PipelineTelemetry.objects.exists()
+
+
+class TestReport:
+    def test_percentile_interpolates(self):
+        values = [4, 1, 3, 2, 5]
+        assert percentile(values, 50) == 3
+        assert percentile(values, 95) == pytest.approx(4.8)
+        assert percentile([], 99) == 0.0
+
+    def test_report_aggregates_stages_and_rtf(self):
+        rows = [
+            PipelineTelemetry(
+                outcome="ok", stages={"transcribe": 30.0 + i, "llm": 5.0}, total_seconds=35.0 + i,
+                audio_seconds=120.0, whisper_model="base",
+            )
+            for i in range(10)
+        ]
+        rows.append(PipelineTelemetry(outcome="error", failed_stage="llm", stages={"llm": 60.0}, total_seconds=60.0))
+
+        report = pipeline_report(timezone.now(), rows=rows)
+
+        assert report["runs"] == 11
+        assert report["outcomes"] == {"ok": 10, "error": 1}
+        assert report["failures"] == {"llm": 1}
+        assert report["stages"]["transcribe"]["count"] == 10
+        assert report["stages"]["transcribe"]["p50"] == pytest.approx(34.5)
+        assert report["stages"]["llm"]["p99"] == pytest.approx(54.5)
+        assert report["whisper_rtf"]["base"]["p50"] == pytest.approx(34.5 / 120)
+
+    def test_report_splits_llm_time_and_tokens_by_strategy(self):
+        rows = [
+            PipelineTelemetry(outcome="ok", stages={"llm": 10.0}, llm_strategy="direct", prompt_tokens=20000),
+            PipelineTelemetry(
+                outcome="ok", stages={"llm_map": 12.0, "llm": 6.0}, llm_strategy="map_reduce", prompt_tokens=90000
+            ),
+            PipelineTelemetry(outcome="error", stages={"llm": 99.0}, llm_strategy="direct", prompt_tokens=1),
+        ]
+
+        report = pipeline_report(timezone.now(), rows=rows)
+
+        assert report["llm_seconds"]["direct"] == {"count": 1, "p50": 10.0, "p95": 10.0, "p99": 10.0}
+        assert report["llm_seconds"]["map_reduce"]["p50"] == pytest.approx(18.0)
+        assert report["prompt_tokens"]["map_reduce"]["p50"] == 90000
+
+
+@pytest.mark.django_db
+class TestReportCommand:
+    def test_prints_window(self, quiz, capsys):
+        PipelineTelemetry.objects.create(
+            quiz=quiz, stages={"transcribe": 40.0, "llm": 8.0}, total_seconds=48.0,
+            audio_seconds=100.0, whisper_model="base",
+        )
+        old = PipelineTelemetry.objects.create(stages={"llm": 999.0}, total_seconds=999.0)
+        PipelineTelemetry.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=3))
+
+        call_command("pipeline_report", "--hours", "24")
+        out = capsys.readouterr().out
+
+        assert "1 (ok=1)" in out
+        assert "transcribe" in out and "40.000" in out
+        assert "999" not in out
+        assert "base" in out and "0.400" in out
+
+    def test_empty_window(self, capsys):
+        call_command("pipeline_report")
+        assert "no pipeline runs" in capsys.readouterr().out
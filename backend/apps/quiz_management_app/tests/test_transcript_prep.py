@@ -0,0 +1,126 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from apps.quiz_management_app import metrics, utils
+from apps.quiz_management_app.transcript_prep import collapse_repetitions, count_tokens, split_by_tokens
+
+
+def _quiz_response():
+    questions = [{"question_title": f"Q{i}?", "question_options": ["A", "B", "C", "D"], "answer": "A"} for i in range(10)]
+    return SimpleNamespace(
+        text=json.dumps({"title": "T", "description": "D", "questions": questions}),
+        usage_metadata=SimpleNamespace(prompt_token_count=2000, candidates_token_count=400),
+    )
+
+
+def _summary_response(prompt):
+    part = prompt.split("part ", 1)[1].split(" ", 1)[0]
+    return SimpleNamespace(
+        text=f"summary {part}",
+        usage_metadata=SimpleNamespace(prompt_token_count=1000, candidates_token_count=100),
+    )
+
+
+class TestCollapseRepetitions:
+    def test_collapses_short_phrase_loops(self):
+        text = "We are done. Thank you. Thank you. thank you! Thank you. Bye."
+        assert collapse_repetitions(text) == "We are done. Thank you. Bye."
+
+    def test_collapses_a_repeated_long_sentence(self):
+        sentence = "The mitochondria is the powerhouse of the cell, remember that."
+        assert collapse_repetitions(f"{sentence} {sentence} Next topic.") == f"{sentence} Next topic."
+
+    def test_keeps_short_natural_repeats(self):
+        text = "Yes, yes. It is very very important."
+        assert collapse_repetitions(text) == text
+
+    def test_normalizes_whitespace(self):
+        assert collapse_repetitions("  a\n b\t c ") == "a b c"
+        assert collapse_repetitions("") == ""
+
+
+class TestSplitByTokens:
+    def test_chunks_respect_budget_and_keep_sentences(self):
+        text = " ".join(f"Sentence number {i} is here." for i in range(300))
+        chunks = split_by_tokens(text, 200)
+
+        assert len(chunks) > 1
+        assert all(count_tokens(c) <= 200 for c in chunks)
+        assert " ".join(chunks) == text
+        assert all(c.endswith(".") for c in chunks)
+
+    def test_oversized_sentence_is_split_between_words(self):
+        chunks = split_by_tokens("word " * 2000, 100)
+        assert len(chunks) > 1
+        assert sum(len(c.split()) for c in chunks) == 2000
+
+
+class TestPrepareTranscript:
+    def test_short_transcript_goes_direct(self, settings):
+        settings.LLM_TRANSCRIPT_TOKEN_BUDGET = 1000
+        prepared = utils.prepare_transcript("Hello. Hello. Hello. Hello. Short lecture.")
+
+        assert prepared.strategy == utils.DIRECT
+        assert prepared.text == "Hello. Short lecture."
+        assert prepared.tokens < prepared.raw_tokens
+        assert prepared.chunks == []
+
+    def test_long_transcript_uses_map_reduce(self, settings):
+        settings.LLM_TRANSCRIPT_TOKEN_BUDGET = 1000
+        settings.LLM_MAP_CHUNK_TOKENS = 500
+        text = " ".join(f"Fact number {i} about the topic." for i in range(1000))
+
+        prepared = utils.prepare_transcript(text)
+
+        assert prepared.strategy == utils.MAP_REDUCE
+        assert len(prepared.chunks) >= 2
+        assert all(count_tokens(c) <= 500 for c in prepared.chunks)
+
+    def test_budget_zero_disables_map_reduce(self, settings):
+        settings.LLM_TRANSCRIPT_TOKEN_BUDGET = 0
+        text = " ".join(f"Fact number {i} about the topic." for i in range(10000))
+        assert utils.prepare_transcript(text).strategy == utils.DIRECT
+
+
+@pytest.mark.django_db
+class TestMapReduceGeneration:
+    url = "https://www.youtube.com/watch?v=abc123def45"
+
+    @patch("apps.quiz_management_app.utils.download_audio_from_video")
+    def test_quiz_is_written_from_ordered_chunk_summaries(self, _dl, user, settings):
+        settings.LLM_TRANSCRIPT_TOKEN_BUDGET = 1000
+        settings.LLM_MAP_CHUNK_TOKENS = 500
+        settings.LLM_MAP_CONCURRENCY = 3
+        transcript = " ".join(f"Fact number {i} about the topic." for i in range(1000))
+        n_chunks = len(utils.prepare_transcript(transcript).chunks)
+
+        client = MagicMock()
+        client.models.generate_content.side_effect = lambda model, contents, config=None: (
+            _quiz_response() if config is not None else _summary_response(contents)
+        )
+        before = utils.LLM_SECONDS.count(strategy=utils.MAP_REDUCE)
+        with patch("apps.quiz_management_app.utils.generate_transcript", return_value=transcript), patch(
+            "apps.quiz_management_app.utils.gemini_client", return_value=client
+        ), metrics.trace() as trace:
+            quiz = utils.create_quiz_from_url(self.url, user)
+
+        assert quiz.questions.count() == 10
+        final_prompt = client.models.generate_content.call_args_list[-1].kwargs["contents"]
+        assert "Fact number" not in final_prompt
+        positions = [final_prompt.index(f"[Part {i}/{n_chunks}]\nsummary {i}") for i in range(1, n_chunks + 1)]
+        assert positions == sorted(positions)
+
+        assert {"compact", "llm_map", "llm"} <= set(trace.stages)
+        assert trace.info["llm_strategy"] == utils.MAP_REDUCE
+        assert trace.info["prompt_tokens"] == 2000 + 1000 * n_chunks
+        assert utils.LLM_SECONDS.count(strategy=utils.MAP_REDUCE) == before + 1
+
+    def test_empty_summary_fails(self):
+        client = MagicMock()
+        client.models.generate_content.return_value = SimpleNamespace(text=" ")
+        with patch("apps.quiz_management_app.utils.gemini_client", return_value=client):
+            with pytest.raises(utils.QuizCreationError, match="part 1"):
+                utils.summarize_chunks(["a", "b"])
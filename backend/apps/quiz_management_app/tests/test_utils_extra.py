@@ -1,6 +1,8 @@
 import json
+import subprocess
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
 from django.conf import settings
 
@@ -15,7 +17,7 @@ from apps.quiz_management_app.models import Quiz, QuizQuestion
 def test_download_audio_from_video_on_error_cleans_up_and_raises_quizcreationerror():
     tmp = utils.TempAudio(base_path="/tmp/fake-audio")
     with (
-        patch("apps.quiz_management_app.utils.yt_dlp.YoutubeDL") as ydl_cls,
+        patch("yt_dlp.YoutubeDL") as ydl_cls,
         patch("apps.quiz_management_app.utils.cleanup_audio") as cleanup,
     ):
         ydl = MagicMock()
@@ -29,6 +31,107 @@ def test_download_audio_from_video_on_error_cleans_up_and_raises_quizcreationerr
         cleanup.assert_called_once_with(tmp)
 
 
+def _fake_ydl(ydl_cls, write_file=None):
+    captured = {}
+
+    def _init(opts):
+        captured.update(opts)
+        ydl = MagicMock()
+
+        def _download(urls):
+            if write_file:
+                with open(write_file, "wb") as f:
+                    f.write(b"x" * 100)
+                for hook in opts["progress_hooks"]:
+                    hook({"status": "finished", "total_bytes": 100})
+
+        ydl.download.side_effect = _download
+        ctx = MagicMock()
+        ctx.__enter__.return_value = ydl
+        return ctx
+
+    ydl_cls.side_effect = _init
+    return captured
+
+
+def test_download_audio_pcm_pipeline_keeps_native_stream(tmp_path, settings):
+    settings.AUDIO_PIPELINE = "pcm"
+    tmp = utils.TempAudio(base_path=str(tmp_path / "audio"))
+
+    with patch("yt_dlp.YoutubeDL") as ydl_cls:
+        opts = _fake_ydl(ydl_cls, write_file=str(tmp_path / "audio.webm"))
+        utils.download_audio_from_video("https://youtube.com/watch?v=abc123def45", tmp)
+
+    assert "postprocessors" not in opts
+    assert opts["format"].startswith("worstaudio")
+    assert tmp.source_path == str(tmp_path / "audio.webm")
+    assert tmp.downloaded_bytes == 100
+
+
+def test_download_audio_pcm_pipeline_without_file_raises(tmp_path, settings):
+    settings.AUDIO_PIPELINE = "pcm"
+    tmp = utils.TempAudio(base_path=str(tmp_path / "audio"))
+
+    with patch("yt_dlp.YoutubeDL") as ydl_cls:
+        _fake_ydl(ydl_cls)
+        with pytest.raises(utils.QuizCreationError, match="no audio file"):
+            utils.download_audio_from_video("https://youtube.com/watch?v=abc123def45", tmp)
+
+
+def test_download_audio_mp3_pipeline_transcodes(tmp_path, settings):
+    settings.AUDIO_PIPELINE = "mp3"
+    tmp = utils.TempAudio(base_path=str(tmp_path / "audio"))
+
+    with patch("yt_dlp.YoutubeDL") as ydl_cls:
+        opts = _fake_ydl(ydl_cls)
+        utils.download_audio_from_video("https://youtube.com/watch?v=abc123def45", tmp)
+
+    assert opts["postprocessors"][0]["key"] == "FFmpegExtractAudio"
+    assert tmp.source_path is None
+
+
+def test_decode_audio_pcm_returns_float32_16khz_samples():
+    samples = np.array([0, 16384, -32768], dtype=np.int16).tobytes()
+    with patch("apps.quiz_management_app.utils.subprocess.run") as run:
+        run.return_value = MagicMock(stdout=samples)
+        audio = utils.decode_audio_pcm("/tmp/in.webm")
+
+    cmd = run.call_args[0][0]
+    assert cmd[cmd.index("-ar") + 1] == "16000"
+    assert audio.dtype == np.float32
+    assert audio.tolist() == [0.0, 0.5, -1.0]
+
+
+def test_decode_audio_pcm_error_raises_quizcreationerror():
+    err = subprocess.CalledProcessError(1, "ffmpeg", stderr=b"Invalid data found")
+    with patch("apps.quiz_management_app.utils.subprocess.run", side_effect=err):
+        with pytest.raises(utils.QuizCreationError, match="Invalid data found"):
+            utils.decode_audio_pcm("/tmp/in.webm")
+
+
+def test_generate_transcript_passes_decoded_array_to_whisper():
+    tmp = utils.TempAudio(base_path="/tmp/abc", source_path="/tmp/abc.webm")
+    audio = np.zeros(16000, dtype=np.float32)
+
+    with (
+        patch("apps.quiz_management_app.utils.get_whisper_model") as get_model,
+        patch("apps.quiz_management_app.utils.decode_audio_pcm", return_value=audio) as decode,
+    ):
+        get_model.return_value.transcribe.return_value = {"text": " hello "}
+        assert utils.generate_transcript(tmp) == "hello"
+
+    decode.assert_called_once_with("/tmp/abc.webm")
+    assert get_model.return_value.transcribe.call_args[0][0] is audio
+
+
+def test_cleanup_audio_also_removes_downloaded_source():
+    tmp = utils.TempAudio(base_path="/tmp/abc", source_path="/tmp/abc.webm")
+    with patch("apps.quiz_management_app.utils.safe_remove") as rm:
+        utils.cleanup_audio(tmp)
+        rm.assert_any_call("/tmp/abc.webm")
+        assert rm.call_count == 3
+
+
 def test_cleanup_audio_calls_safe_remove_for_base_and_mp3():
     tmp = utils.TempAudio(base_path="/tmp/abc")
     with patch("apps.quiz_management_app.utils.safe_remove") as rm:
@@ -43,10 +146,10 @@ def test_cleanup_audio_calls_safe_remove_for_base_and_mp3():
 # -----------------------------------------------------------------------------
 
 def test_get_whisper_model_caches_model_and_uses_settings_model_name(settings):
-    utils._whisper_model = None
+    utils.whisper_models.clear()
     settings.WHISPER_MODEL = "small"
 
-    with patch("apps.quiz_management_app.utils.whisper.load_model") as load_model:
+    with patch("whisper.load_model") as load_model:
         fake_model = MagicMock()
         load_model.return_value = fake_model
 
@@ -58,6 +161,73 @@ def test_get_whisper_model_caches_model_and_uses_settings_model_name(settings):
         load_model.assert_called_once_with("small")
 
 
+def test_get_whisper_model_keeps_one_entry_per_tier(settings):
+    utils.whisper_models.clear()
+    settings.WHISPER_MODEL = "small"
+
+    with patch("whisper.load_model", side_effect=lambda name: MagicMock(name=name)):
+        tiny = utils.get_whisper_model("tiny")
+        small = utils.get_whisper_model()
+
+        assert tiny is not small
+        assert utils.get_whisper_model("tiny") is tiny
+        assert {m["name"] for m in utils.whisper_models.snapshot()} == {"tiny", "small"}
+    utils.whisper_models.clear()
+
+
+class TestSelectWhisperModel:
+    @pytest.fixture(autouse=True)
+    def _adaptive(self, settings):
+        settings.WHISPER_TIER_POLICY = "adaptive"
+        settings.WHISPER_MODEL = "small"
+        settings.WHISPER_MODEL_TIERS = "tiny,base,small"
+        settings.WHISPER_REALTIME_FACTOR = 0.5
+        settings.WHISPER_LATENCY_BUDGET = 300
+
+    def test_fixed_policy_uses_settings_model(self, settings):
+        settings.WHISPER_TIER_POLICY = "fixed"
+        assert utils.select_whisper_model(10000.0, queue_depth=50) == "small"
+
+    def test_unknown_duration_uses_settings_model(self):
+        assert utils.select_whisper_model(None) == "small"
+
+    def test_short_clip_keeps_best_tier(self):
+        assert utils.select_whisper_model(120.0) == "small"
+
+    def test_long_video_drops_to_faster_tier(self):
+        # small: 0.5 s/s, base: ~0.29 s/s, tiny: 0.2 s/s
+        assert utils.select_whisper_model(900.0) == "base"
+        assert utils.select_whisper_model(1400.0) == "tiny"
+
+    def test_queue_depth_shrinks_the_budget(self):
+        assert utils.select_whisper_model(500.0, queue_depth=0) == "small"
+        assert utils.select_whisper_model(500.0, queue_depth=1) == "base"
+        assert utils.select_whisper_model(500.0, queue_depth=3) == "tiny"
+
+    def test_falls_back_to_fastest_tier(self):
+        assert utils.select_whisper_model(100000.0) == "tiny"
+
+    @pytest.mark.parametrize(
+        "name, family",
+        [
+            ("small.en", "small"),
+            ("large-v2", "large"),
+            ("large-v3", "large"),
+            ("large-v3-turbo", "turbo"),
+            ("turbo", "turbo"),
+            ("Medium.en", "medium"),
+        ],
+    )
+    def test_model_names_map_to_their_speed_family(self, name, family):
+        assert utils.whisper_model_family(name) == family
+
+    def test_versioned_large_model_is_not_treated_like_the_baseline(self, settings):
+        settings.WHISPER_MODEL_TIERS = "small,large-v3"
+        # large is 4x slower than small: 2.0 s/s, not the 0.5 s/s measured for small
+        assert utils.whisper_realtime_factor("large-v3") == pytest.approx(2.0)
+        assert utils.select_whisper_model(300.0) == "small"
+
+
 def test_generate_transcript_on_error_cleans_up_and_raises_quizcreationerror():
     tmp = utils.TempAudio(base_path="/tmp/abc")
 
@@ -215,7 +385,7 @@ def test_create_quiz_from_url_always_cleans_up_temp_audio_on_exception(settings,
         ai.return_value = resp
 
         with pytest.raises(utils.QuizCreationError):
-            utils.create_quiz_from_url("https://www.youtube.com/watch?v=abc", user=user)
+            utils.create_quiz_from_url("https://www.youtube.com/watch?v=abc123def45", user=user)
 
         cleanup.assert_called_once_with(tmp)
 
@@ -237,7 +407,7 @@ def test_persist_quiz_creates_quiz_and_bulk_questions(django_user_model):
         ],
     }
 
-    quiz = utils._persist_quiz(payload, "https://www.youtube.com/watch?v=xyz", user)
+    quiz = utils._persist_quiz(payload, "https://www.youtube.com/watch?v=xyz123def45", user)
 
     assert isinstance(quiz, Quiz)
     assert quiz.user_id == user.id
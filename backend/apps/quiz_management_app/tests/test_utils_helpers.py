@@ -4,27 +4,71 @@ from apps.quiz_management_app.utils import (
     extract_json,
     is_youtube_url,
     normalize_youtube_url,
+    youtube_video_id,
 )
 
 
 def test_normalize_youtube_url_converts_short_url():
-    assert normalize_youtube_url("https://youtu.be/abc123?si=foo") == "https://www.youtube.com/watch?v=abc123"
+    assert normalize_youtube_url("https://youtu.be/abc123def45?si=foo") == "https://www.youtube.com/watch?v=abc123def45"
 
 
 def test_normalize_youtube_url_keeps_normal_url():
-    url = "https://www.youtube.com/watch?v=abc123"
+    url = "https://www.youtube.com/watch?v=abc123def45"
     assert normalize_youtube_url(url) == url
 
 
 def test_is_youtube_url_true_cases():
-    assert is_youtube_url("https://www.youtube.com/watch?v=abc123") is True
-    assert is_youtube_url("https://youtu.be/abc123") is True
+    assert is_youtube_url("https://www.youtube.com/watch?v=abc123def45") is True
+    assert is_youtube_url("https://youtu.be/abc123def45") is True
 
 
 def test_is_youtube_url_false_case():
     assert is_youtube_url("https://vimeo.com/123") is False
 
 
+def test_youtube_video_id_from_watch_and_short_urls():
+    assert youtube_video_id("https://www.youtube.com/watch?v=abc123def45&t=5") == "abc123def45"
+    assert youtube_video_id("https://youtu.be/abc123def45?si=foo") == "abc123def45"
+    assert youtube_video_id("https://www.youtube.com/") is None
+
+
 def test_extract_json_strips_leading_and_backticks():
     raw = "hello ``` {\"a\": 1} ```"
-    assert extract_json(raw).startswith("{")
\ No newline at end of file
+    assert extract_json(raw).startswith("{")
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://www.youtube.com/watch?v=abc123def45",
+        "https://m.youtube.com/watch?v=abc123def45&t=42s",
+        "https://music.youtube.com/watch?v=abc123def45&list=PL123",
+        "https://www.youtube.com/watch?list=PL123&index=2&v=abc123def45",
+        "https://youtu.be/abc123def45?si=tracking&t=10",
+        "https://www.youtube.com/shorts/abc123def45",
+        "https://www.youtube.com/embed/abc123def45?start=3",
+        "https://www.youtube-nocookie.com/embed/abc123def45",
+        "https://www.youtube.com/live/abc123def45?feature=share",
+        "youtube.com/watch?v=abc123def45",
+        "  HTTP://WWW.YOUTUBE.COM/watch?v=abc123def45  ",
+    ],
+)
+def test_url_shapes_share_one_canonical_url(url):
+    assert youtube_video_id(url) == "abc123def45"
+    assert normalize_youtube_url(url) == "https://www.youtube.com/watch?v=abc123def45"
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://www.youtube.com/watch?v=tooshort",
+        "https://www.youtube.com/playlist?list=PL123",
+        "https://notyoutube.com/watch?v=abc123def45",
+        "https://vimeo.com/youtube.com/watch?v=abc123def45",
+        "ftp://youtube.com/watch?v=abc123def45",
+        "",
+    ],
+)
+def test_non_video_urls_have_no_id(url):
+    assert youtube_video_id(url) is None
+    assert is_youtube_url(url) is False
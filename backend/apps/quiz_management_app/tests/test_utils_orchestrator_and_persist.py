@@ -6,6 +6,7 @@ from apps.quiz_management_app.models import Quiz, QuizQuestion
 from apps.quiz_management_app.utils import (
     InvalidYouTubeUrlError,
     QuizCreationError,
+    Transcript,
     create_quiz_from_url,
 )
 
@@ -36,14 +37,85 @@ class TestCreateQuizFromUrl:
         mock_transcript.return_value = "transcript"
         mock_ai.return_value = SimpleNamespace(text='{"title":"Generated Title","description":"Generated Desc","questions":' + str(_payload()["questions"]).replace("'", '"') + "}")
 
-        quiz = create_quiz_from_url("https://www.youtube.com/watch?v=abc123", user)
+        quiz = create_quiz_from_url("https://www.youtube.com/watch?v=abc123def45", user)
 
         assert Quiz.objects.filter(id=quiz.id).exists()
         assert QuizQuestion.objects.filter(quiz=quiz).count() == 10
         assert quiz.user_id == user.id
+        assert quiz.transcript_source == "whisper"
 
     @patch("apps.quiz_management_app.utils.download_audio_from_video")
     def test_download_error_becomes_quiz_creation_error(self, mock_dl, user):
         mock_dl.side_effect = QuizCreationError("download failed")
         with pytest.raises(QuizCreationError, match="download failed"):
-            create_quiz_from_url("https://www.youtube.com/watch?v=abc123", user)
\ No newline at end of file
+            create_quiz_from_url("https://www.youtube.com/watch?v=abc123def45", user)
+
+
+@pytest.mark.django_db
+class TestQuizReuse:
+    url = "https://youtu.be/abc123def45?t=3"
+
+    def _source(self, owner):
+        from apps.quiz_management_app.utils import _persist_quiz
+
+        return _persist_quiz(_payload(), "https://www.youtube.com/watch?v=abc123def45", owner)
+
+    @patch("apps.quiz_management_app.utils.get_transcript")
+    def test_clones_existing_quiz_for_other_user(self, mock_transcript, settings, user, other_user):
+        settings.QUIZ_REUSE_ENABLED = True
+        source = self._source(other_user)
+
+        quiz = create_quiz_from_url(self.url, user)
+
+        mock_transcript.assert_not_called()
+        assert quiz.id != source.id
+        assert quiz.user_id == user.id
+        assert quiz.video_id == "abc123def45"
+        assert quiz.title == "Generated Title"
+        assert [q.question_title for q in quiz.questions.all()] == [f"Q{i}?" for i in range(10)]
+        assert QuizQuestion.objects.filter(quiz=source).count() == 10
+
+    @patch("apps.quiz_management_app.utils.get_ai_response")
+    @patch("apps.quiz_management_app.utils.get_transcript")
+    def test_disabled_by_default(self, mock_transcript, mock_ai, user, other_user):
+        self._source(other_user)
+        mock_transcript.return_value = Transcript("t", "whisper")
+        mock_ai.side_effect = QuizCreationError("pipeline ran")
+
+        with pytest.raises(QuizCreationError, match="pipeline ran"):
+            create_quiz_from_url(self.url, user)
+
+    @patch("apps.quiz_management_app.utils.get_ai_response")
+    @patch("apps.quiz_management_app.utils.get_transcript")
+    def test_fresh_bypasses_reuse(self, mock_transcript, mock_ai, settings, user, other_user):
+        settings.QUIZ_REUSE_ENABLED = True
+        self._source(other_user)
+        mock_transcript.return_value = Transcript("t", "whisper")
+        mock_ai.side_effect = QuizCreationError("pipeline ran")
+
+        with pytest.raises(QuizCreationError, match="pipeline ran"):
+            create_quiz_from_url(self.url, user, fresh=True)
+
+    def test_ignores_quizzes_outside_freshness_window(self, settings, other_user):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from apps.quiz_management_app.utils import find_reusable_quiz
+
+        settings.QUIZ_REUSE_ENABLED = True
+        settings.QUIZ_REUSE_MAX_AGE = timedelta(hours=1)
+        source = self._source(other_user)
+        assert find_reusable_quiz("abc123def45") == source
+
+        Quiz.objects.filter(pk=source.pk).update(created_at=timezone.now() - timedelta(hours=2))
+        assert find_reusable_quiz("abc123def45") is None
+
+    def test_ignores_incomplete_quizzes(self, settings, other_user):
+        from apps.quiz_management_app.utils import find_reusable_quiz
+
+        settings.QUIZ_REUSE_ENABLED = True
+        source = self._source(other_user)
+        source.questions.first().delete()
+
+        assert find_reusable_quiz("abc123def45") is None
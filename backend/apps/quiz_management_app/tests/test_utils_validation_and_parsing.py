@@ -1,8 +1,11 @@
 import pytest
 import json
+from unittest.mock import MagicMock, patch
 
 from apps.quiz_management_app.utils import (
+    QUIZ_RESPONSE_SCHEMA,
     QuizCreationError,
+    get_ai_response,
     parse_quiz_json,
     validate_quiz_payload,
 )
@@ -31,6 +34,36 @@ def test_parse_quiz_json_invalid_raises():
         parse_quiz_json("not json")
 
 
+def test_parse_quiz_json_strict_does_not_strip_prose():
+    text = "Here is your quiz: " + json.dumps(_good_payload())
+    assert parse_quiz_json(text)["title"] == "T"
+    with pytest.raises(QuizCreationError):
+        parse_quiz_json(text, strict=True)
+
+
+def test_response_schema_matches_validation_rules():
+    questions = QUIZ_RESPONSE_SCHEMA["properties"]["questions"]
+    options = questions["items"]["properties"]["question_options"]
+    assert (questions["min_items"], questions["max_items"]) == (10, 10)
+    assert (options["min_items"], options["max_items"]) == (4, 4)
+    assert QUIZ_RESPONSE_SCHEMA["property_ordering"] == ["title", "description", "questions"]
+    assert set(QUIZ_RESPONSE_SCHEMA["required"]) == set(_good_payload())
+
+
+@pytest.mark.parametrize("structured, expected", [(True, "application/json"), (False, None)])
+def test_get_ai_response_requests_json_with_schema(settings, structured, expected):
+    settings.GEMINI_STRUCTURED_OUTPUT = structured
+    client = MagicMock()
+    with patch("apps.quiz_management_app.utils.gemini_client", return_value=client):
+        get_ai_response("transcript")
+
+    config = client.models.generate_content.call_args.kwargs["config"]
+    if expected is None:
+        assert config is None
+    else:
+        assert config == {"response_mime_type": expected, "response_schema": QUIZ_RESPONSE_SCHEMA}
+
+
 def test_validate_quiz_payload_ok():
     validate_quiz_payload(_good_payload())
 
@@ -0,0 +1,49 @@
+from unittest.mock import patch
+
+import pytest
+import torch
+import whisper
+
+from apps.quiz_management_app import utils, whisper_mmap
+
+
+@pytest.fixture
+def checkpoint(toy_whisper_checkpoint):
+    return toy_whisper_checkpoint
+
+
+def test_mmap_path_for_names_and_files(checkpoint, tmp_path):
+    assert whisper_mmap.mmap_checkpoint_path("base", "/models") == "/models/base.fp32.mmap.pt"
+    assert whisper_mmap.mmap_checkpoint_path(checkpoint) == str(tmp_path / "toy.fp32.mmap.pt")
+
+
+def test_mmap_load_matches_regular_load(checkpoint):
+    expected = whisper.load_model(checkpoint, device="cpu").state_dict()
+    model = whisper_mmap.load_model_mmap(checkpoint)
+
+    state = model.state_dict()
+    assert state.keys() == expected.keys()
+    for name, tensor in state.items():
+        assert tensor.dtype == torch.float32
+        assert torch.equal(tensor, expected[name])
+
+
+def test_checkpoint_is_converted_only_once(checkpoint):
+    whisper_mmap.load_model_mmap(checkpoint)
+    with patch.object(whisper_mmap, "convert_checkpoint") as convert:
+        whisper_mmap.load_model_mmap(checkpoint)
+    convert.assert_not_called()
+
+
+def test_registry_uses_mmap_loader_on_cpu(settings):
+    settings.WHISPER_MMAP = True
+    settings.WHISPER_DEVICE = "cpu"
+    utils.whisper_models.clear()
+    with (
+        patch("apps.quiz_management_app.utils.whisper_mmap.load_model_mmap") as load_mmap,
+        patch("whisper.load_model") as load_model,
+    ):
+        assert utils.get_whisper_model("tiny") is load_mmap.return_value
+    load_mmap.assert_called_once_with("tiny", "")
+    load_model.assert_not_called()
+    utils.whisper_models.clear()
@@ -0,0 +1,104 @@
+from unittest.mock import patch
+
+import numpy as np
+
+from apps.quiz_management_app import utils, whisper_pool
+
+SR = whisper_pool.SAMPLE_RATE
+
+
+def _tone(seconds: float) -> np.ndarray:
+    return np.full(int(seconds * SR), 0.5, dtype=np.float32)
+
+
+def _silence(seconds: float) -> np.ndarray:
+    return np.zeros(int(seconds * SR), dtype=np.float32)
+
+
+class TestSplitAtSilence:
+    def test_cut_moves_to_nearby_silence(self):
+        audio = np.concatenate([_tone(8), _silence(0.5), _tone(11.5)])
+        first, second = whisper_pool.split_at_silence(audio, 2, search_seconds=3)
+
+        assert 8 * SR <= len(first) <= 8.5 * SR
+        assert len(first) + len(second) == len(audio)
+
+    def test_chunks_cover_audio_in_order(self):
+        audio = np.arange(10 * SR, dtype=np.float32)
+        chunks = whisper_pool.split_at_silence(audio, 4)
+
+        assert len(chunks) == 4
+        assert np.array_equal(np.concatenate(chunks), audio)
+
+    def test_single_chunk(self):
+        audio = _tone(1)
+        assert whisper_pool.split_at_silence(audio, 1)[0] is audio
+
+
+class _InlinePool:
+    def map(self, fn, *iterables):
+        return map(fn, *iterables)
+
+
+class TestTranscribeParallel:
+    def test_stitches_chunks_in_order(self):
+        seen = []
+
+        def fake_chunk(chunk, options):
+            seen.append(len(chunk))
+            return f"part{len(seen)}"
+
+        with (
+            patch.object(whisper_pool, "get_pool", return_value=_InlinePool()) as get_pool,
+            patch.object(whisper_pool, "_transcribe_chunk", side_effect=fake_chunk),
+        ):
+            text = whisper_pool.transcribe_parallel(
+                _tone(90), "base", "", workers=3, torch_threads=1, options={"fp16": False}
+            )
+
+        assert text == "part1 part2 part3"
+        assert sum(seen) == 90 * SR
+        get_pool.assert_called_once_with("base", "", 3, 1, False, "fp32")
+
+    def test_short_audio_is_not_split(self):
+        with (
+            patch.object(whisper_pool, "get_pool", return_value=_InlinePool()),
+            patch.object(whisper_pool, "_transcribe_chunk", return_value="only") as chunk,
+        ):
+            whisper_pool.transcribe_parallel(_tone(40), "base", "", workers=4, torch_threads=1, options={})
+
+        assert chunk.call_count == 1
+
+    def test_pool_is_reused_for_same_config(self):
+        with patch.object(whisper_pool, "ProcessPoolExecutor") as executor:
+            try:
+                p1 = whisper_pool.get_pool("base", "", 2, 1)
+                p2 = whisper_pool.get_pool("base", "", 2, 1)
+                p3 = whisper_pool.get_pool("tiny", "", 2, 1)
+            finally:
+                whisper_pool.shutdown_pool()
+
+        assert p1 is p2
+        assert executor.call_count == 2
+        assert p3 is executor.return_value
+
+
+def test_generate_transcript_parallel_mode_uses_settings(settings):
+    settings.WHISPER_TRANSCRIBE_MODE = "parallel"
+    settings.WHISPER_MODEL = "base"
+    settings.WHISPER_PARALLEL_WORKERS = 4
+    settings.WHISPER_TORCH_THREADS = 2
+    tmp = utils.TempAudio(base_path="/tmp/abc", source_path="/tmp/abc.webm")
+    audio = _tone(1)
+
+    with (
+        patch("apps.quiz_management_app.utils.decode_audio_pcm", return_value=audio),
+        patch("apps.quiz_management_app.utils.whisper_pool.transcribe_parallel", return_value="fast") as parallel,
+        patch("apps.quiz_management_app.utils.get_whisper_model") as get_model,
+    ):
+        assert utils.generate_transcript(tmp) == "fast"
+
+    get_model.assert_not_called()
+    kwargs = parallel.call_args.kwargs
+    assert parallel.call_args.args[0] is audio
+    assert (kwargs["model_name"], kwargs["workers"], kwargs["torch_threads"]) == ("base", 4, 2)
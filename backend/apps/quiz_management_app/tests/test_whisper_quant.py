@@ -0,0 +1,60 @@
+from unittest.mock import patch
+
+import torch
+import whisper
+from torch.ao.nn.quantized.dynamic import Linear as DynamicQuantizedLinear
+from whisper.model import Linear as WhisperLinear
+
+from apps.quiz_management_app import utils, whisper_quant
+from apps.quiz_management_app.whisper_registry import model_footprint
+
+
+def _linears(model, cls):
+    return [m for m in model.modules() if type(m) is cls]
+
+
+def test_quantize_model_converts_all_linear_layers(toy_whisper_checkpoint):
+    model = whisper.load_model(toy_whisper_checkpoint, device="cpu")
+    n_linear = len(_linears(model, WhisperLinear))
+    mel = torch.randn(1, 80, 32)
+    expected = model.embed_audio(mel)
+    fp32_bytes = model_footprint(model)
+
+    quantized = whisper_quant.quantize_model(model)
+
+    assert quantized is model
+    assert not _linears(quantized, WhisperLinear)
+    assert len(_linears(quantized, DynamicQuantizedLinear)) == n_linear
+    assert model_footprint(quantized) < fp32_bytes
+    assert torch.allclose(quantized.embed_audio(mel), expected, atol=0.1)
+
+
+def test_load_model_int8_quantizes_once(toy_whisper_checkpoint):
+    real_load = whisper.load_model
+    with patch("whisper.load_model", side_effect=lambda name, **kw: real_load(toy_whisper_checkpoint, device="cpu")) as load:
+        first = whisper_quant.load_model_int8(toy_whisper_checkpoint)
+        cached = whisper_quant.load_model_int8(toy_whisper_checkpoint)
+
+    load.assert_called_once()
+    assert _linears(cached, DynamicQuantizedLinear)
+    mel = torch.randn(1, 80, 32)
+    assert torch.equal(cached.embed_audio(mel), first.embed_audio(mel))
+
+
+def test_int8_precision_selects_quantized_loader_and_cache_key(settings):
+    settings.WHISPER_PRECISION = "int8"
+    settings.WHISPER_DEVICE = "cpu"
+    utils.whisper_models.clear()
+
+    assert utils.whisper_precision() == "int8"
+    assert utils.transcription_options()["precision"] == "int8"
+    with patch("apps.quiz_management_app.utils.whisper_quant.load_model_int8") as load_int8:
+        assert utils.get_whisper_model("tiny") is load_int8.return_value
+    load_int8.assert_called_once_with("tiny", "")
+    utils.whisper_models.clear()
+
+
+def test_int8_is_ignored_on_gpu(settings):
+    settings.WHISPER_PRECISION = "int8"
+    settings.WHISPER_DEVICE = "cuda"
+    assert utils.whisper_precision() == "fp32"
@@ -0,0 +1,110 @@
+import threading
+import time
+
+import pytest
+import torch
+
+from apps.quiz_management_app.whisper_registry import ModelKey, ModelRegistry, model_footprint
+
+TINY = ModelKey("tiny", "cpu", "fp32")
+BASE = ModelKey("base", "cpu", "fp32")
+SMALL = ModelKey("small", "cpu", "fp32")
+
+
+def _module(n_floats):
+    return torch.nn.Linear(n_floats, 1, bias=False)
+
+
+def test_model_footprint_counts_parameters():
+    assert model_footprint(_module(256)) == 256 * 4
+    assert model_footprint(object()) == 0
+
+
+def test_concurrent_gets_load_once():
+    calls = []
+
+    def loader(key):
+        calls.append(key)
+        time.sleep(0.05)
+        return object()
+
+    registry = ModelRegistry(loader)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get(TINY))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls == [TINY]
+    assert len({id(r) for r in results}) == 1
+    assert registry.snapshot()[0]["uses"] == 8
+
+
+def test_loader_error_reaches_all_waiters_and_is_not_cached():
+    attempts = []
+
+    def loader(key):
+        attempts.append(key)
+        raise RuntimeError("download failed")
+
+    registry = ModelRegistry(loader)
+    with pytest.raises(RuntimeError):
+        registry.get(TINY)
+    assert TINY not in registry
+    with pytest.raises(RuntimeError):
+        registry.get(TINY)
+    assert len(attempts) == 2
+
+
+def test_budget_evicts_least_recently_used():
+    sizes = {"tiny": 100, "base": 200, "small": 300}
+    # no RSS readings: footprints are the weight sizes
+    registry = ModelRegistry(lambda key: _module(sizes[key.name]), budget_bytes=500 * 4, rss=lambda: None)
+
+    registry.get(TINY)
+    registry.get(BASE)
+    registry.get(TINY)  # base is now the least recently used
+    registry.get(SMALL)
+
+    assert TINY in registry
+    assert SMALL in registry
+    assert BASE not in registry
+    assert registry.resident_bytes() == 400 * 4
+
+
+def test_footprint_is_the_rss_growth_of_the_load():
+    readings = iter([1000, 1000 + 3000 * 4, 13000, 13000 + 10])
+    registry = ModelRegistry(lambda key: _module(100), rss=lambda: next(readings))
+
+    registry.get(TINY)
+    registry.get(BASE)
+
+    footprints = {m["name"]: m["footprint_bytes"] for m in registry.snapshot()}
+    # tiny grew RSS well past its weights; base's growth is under its weights, which are the floor
+    assert footprints == {"tiny": 3000 * 4, "base": 100 * 4}
+
+
+def test_budget_counts_rss_growth():
+    registry = ModelRegistry(lambda key: _module(10), budget_bytes=5000, rss=iter([0, 4000, 4000, 8000]).__next__)
+
+    registry.get(TINY)
+    registry.get(BASE)
+
+    assert TINY not in registry
+    assert BASE in registry
+
+
+def test_model_over_budget_is_still_served():
+    registry = ModelRegistry(lambda key: _module(1000), budget_bytes=10)
+    assert registry.get(SMALL) is not None
+    assert [m["name"] for m in registry.snapshot()] == ["small"]
+
+
+def test_device_and_precision_are_part_of_the_key():
+    registry = ModelRegistry(lambda key: object())
+    cpu = registry.get(TINY)
+    gpu = registry.get(ModelKey("tiny", "cuda", "fp16"))
+    assert cpu is not gpu
+    assert registry.evict(TINY) is True
+    assert registry.evict(TINY) is False
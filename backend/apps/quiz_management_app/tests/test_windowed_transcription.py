@@ -0,0 +1,87 @@
+import io
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from apps.quiz_management_app import utils
+
+
+def _fake_ffmpeg(pcm: bytes, returncode: int = 0, stderr: bytes = b""):
+    proc = MagicMock()
+    proc.stdout = io.BytesIO(pcm)
+    proc.stderr = io.BytesIO(stderr)
+    proc.wait.return_value = returncode
+    return proc
+
+
+def _pcm(seconds: float) -> bytes:
+    return np.full(int(seconds * utils.AUDIO_SAMPLE_RATE), 8192, dtype=np.int16).tobytes()
+
+
+class TestIterPcmWindows:
+    def test_splits_stream_into_fixed_windows(self):
+        with patch("apps.quiz_management_app.utils.subprocess.Popen", return_value=_fake_ffmpeg(_pcm(2.5))):
+            windows = list(utils.iter_pcm_windows("/tmp/a.webm", window_seconds=1))
+
+        assert [len(w) for w in windows] == [16000, 16000, 8000]
+        assert all(w.dtype == np.float32 for w in windows)
+        assert windows[0][0] == 0.25
+
+    def test_ffmpeg_failure_raises(self):
+        proc = _fake_ffmpeg(b"", returncode=1, stderr=b"moov atom not found")
+        with patch("apps.quiz_management_app.utils.subprocess.Popen", return_value=proc):
+            with pytest.raises(utils.QuizCreationError, match="moov atom not found"):
+                list(utils.iter_pcm_windows("/tmp/a.webm", window_seconds=1))
+
+    def test_early_close_kills_ffmpeg(self):
+        proc = _fake_ffmpeg(_pcm(3))
+        with patch("apps.quiz_management_app.utils.subprocess.Popen", return_value=proc):
+            gen = utils.iter_pcm_windows("/tmp/a.webm", window_seconds=1)
+            next(gen)
+            gen.close()
+
+        proc.kill.assert_called_once()
+
+
+def test_transcribe_windowed_assembles_text_with_context(settings):
+    settings.WHISPER_WINDOW_SECONDS = 1
+    model = MagicMock()
+    model.transcribe.side_effect = [{"text": " one "}, {"text": ""}, {"text": "three"}]
+
+    with patch("apps.quiz_management_app.utils.subprocess.Popen", return_value=_fake_ffmpeg(_pcm(3))):
+        text = utils.transcribe_windowed(model, "/tmp/a.webm")
+
+    assert text == "one three"
+    prompts = [c.kwargs["initial_prompt"] for c in model.transcribe.call_args_list]
+    assert prompts == [None, "one", "one"]
+    assert model.transcribe.call_args.kwargs["fp16"] is False
+
+
+def test_transcribe_windowed_prompt_is_the_last_200_characters(settings):
+    settings.WHISPER_WINDOW_SECONDS = 1
+    model = MagicMock()
+    texts = ["a" * 150, "b" * 150, "c"]
+    model.transcribe.side_effect = [{"text": t} for t in texts]
+
+    with patch("apps.quiz_management_app.utils.subprocess.Popen", return_value=_fake_ffmpeg(_pcm(3))):
+        text = utils.transcribe_windowed(model, "/tmp/a.webm")
+
+    prompts = [c.kwargs["initial_prompt"] for c in model.transcribe.call_args_list]
+    assert prompts == [None, "a" * 150, ("a" * 150 + " " + "b" * 150)[-200:]]
+    assert text == " ".join(texts)
+
+
+def test_generate_transcript_windowed_mode(settings):
+    settings.WHISPER_TRANSCRIBE_MODE = "windowed"
+    tmp = utils.TempAudio(base_path="/tmp/abc", source_path="/tmp/abc.webm")
+
+    with (
+        patch("apps.quiz_management_app.utils.get_whisper_model") as get_model,
+        patch("apps.quiz_management_app.utils.transcribe_windowed", return_value="streamed") as windowed,
+        patch("apps.quiz_management_app.utils.decode_audio_pcm") as decode,
+    ):
+        assert utils.generate_transcript(tmp) == "streamed"
+
+    windowed.assert_called_once_with(get_model.return_value, "/tmp/abc.webm")
+    decode.assert_not_called()
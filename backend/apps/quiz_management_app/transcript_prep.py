@@ -0,0 +1,134 @@
+"""
+Transcript preprocessing before the Gemini prompt is built.
+
+- count_tokens(): tiktoken's cl100k_base as an estimate of Gemini's tokenizer
+  (close enough for budgeting; ~4 chars/token if tiktoken can't load its encoding).
+- collapse_repetitions(): removes Whisper repetition loops ("thank you thank you
+  thank you ...", the same sentence over and over) that only inflate the prompt.
+- split_by_tokens(): sentence-aligned chunks for the map step of map-reduce generation.
+
+Like whisper_registry, this module has no Django imports; utils.py wires it to settings.
+"""
+import re
+import threading
+from typing import List, Optional
+
+# Longest phrase (in words) checked for repetition loops.
+MAX_LOOP_WORDS = 30
+# Short phrases must repeat this often to count as a loop; phrases of at least
+# LONG_LOOP_WORDS words already count when repeated once ("same sentence twice").
+MIN_LOOP_REPEATS = 3
+LONG_LOOP_WORDS = 8
+
+_CHARS_PER_TOKEN = 4
+_WORD_KEY = re.compile(r"[^\w]+", re.UNICODE)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+_encoding_lock = threading.Lock()
+_encoding = None
+_encoding_failed = False
+
+
+def _get_encoding():
+    global _encoding, _encoding_failed
+    if _encoding is not None or _encoding_failed:
+        return _encoding
+    with _encoding_lock:
+        if _encoding is None and not _encoding_failed:
+            try:
+                import tiktoken
+
+                _encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception:
+                # Not installed, or the BPE file can't be downloaded (offline container).
+                _encoding_failed = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return -(-len(text) // _CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _word_key(word: str) -> str:
+    return _WORD_KEY.sub("", word).lower()
+
+
+def _loop_length(keys: List[str], i: int) -> Optional[int]:
+    """
+    Length n of the shortest phrase starting at i that repeats back to back
+    often enough to be a loop, or None.
+    """
+    for n in range(1, min(MAX_LOOP_WORDS, (len(keys) - i) // 2) + 1):
+        if keys[i + n] != keys[i]:
+            continue
+        phrase = keys[i : i + n]
+        if not any(phrase):
+            continue
+        repeats = 1
+        while keys[i + repeats * n : i + (repeats + 1) * n] == phrase:
+            repeats += 1
+        if repeats >= MIN_LOOP_REPEATS or (repeats >= 2 and n >= LONG_LOOP_WORDS):
+            return n
+    return None
+
+
+def collapse_repetitions(text: str) -> str:
+    """
+    Keeps one copy of every phrase that is repeated back to back (case and
+    punctuation are ignored when comparing). Whitespace is normalized to single spaces.
+    """
+    words = (text or "").split()
+    keys = [_word_key(w) for w in words]
+    out: List[str] = []
+    i = 0
+    while i < len(words):
+        n = _loop_length(keys, i)
+        if n is None:
+            out.append(words[i])
+            i += 1
+            continue
+        out.extend(words[i : i + n])
+        phrase = keys[i : i + n]
+        i += n
+        while keys[i : i + n] == phrase:
+            i += n
+    return " ".join(out)
+
+
+def split_by_tokens(text: str, max_tokens: int) -> List[str]:
+    """
+    Packs whole sentences into chunks of at most max_tokens; a single sentence
+    longer than that is split between words.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    def flush():
+        nonlocal current, current_tokens
+        if current:
+            chunks.append(" ".join(current))
+        current, current_tokens = [], 0
+
+    for sentence in _SENTENCE_END.split((text or "").strip()):
+        if not sentence:
+            continue
+        tokens = count_tokens(sentence)
+        if tokens > max_tokens:
+            flush()
+            words = sentence.split()
+            per_piece = max(1, len(words) * max_tokens // tokens)
+            pieces = [" ".join(words[j : j + per_piece]) for j in range(0, len(words), per_piece)]
+            chunks.extend(pieces)
+            continue
+        if current_tokens + tokens > max_tokens:
+            flush()
+        current.append(sentence)
+        current_tokens += tokens + 1
+    flush()
+    return chunks
@@ -0,0 +1,81 @@
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+from django.conf import settings
+
+from apps.quiz_management_app import utils, whisper_pool
+
+_ready = threading.Event()
+_started = threading.Lock()
+_error: Optional[str] = None
+
+
+def warm_up() -> None:
+    """
+    Loads the Whisper model and runs one tiny inference on silence, so the first
+    real job doesn't pay for model loading and lazy torch initialisation.
+    In "parallel" mode the pool workers are started and warmed instead.
+    """
+    global _error
+    t0 = time.time()
+    try:
+        if utils.transcribe_mode() == "parallel":
+            workers = int(getattr(settings, "WHISPER_PARALLEL_WORKERS", 2))
+            silence = np.zeros(whisper_pool.SAMPLE_RATE * workers, dtype=np.float32)
+            whisper_pool.transcribe_parallel(
+                silence,
+                model_name=utils.whisper_model_name(),
+                download_root=str(getattr(settings, "WHISPER_DOWNLOAD_ROOT", "")).strip(),
+                workers=workers,
+                torch_threads=int(getattr(settings, "WHISPER_TORCH_THREADS", 1)),
+                options=utils.TRANSCRIBE_OPTIONS,
+                min_chunk_seconds=1,
+                mmap=utils.whisper_mmap_enabled(),
+                precision=utils.whisper_precision(),
+            )
+        else:
+            model = utils.get_whisper_model()
+            model.transcribe(np.zeros(whisper_pool.SAMPLE_RATE, dtype=np.float32), **utils.TRANSCRIBE_OPTIONS)
+    except Exception as e:
+        _error = str(e)
+        print(f"[warmup] failed: {e}", flush=True)
+        raise
+
+    _error = None
+    _ready.set()
+    print(f"[warmup] whisper ready in {time.time() - t0:.2f}s", flush=True)
+
+
+def start_background_warmup() -> None:
+    """
+    Warms up in a daemon thread so the process can answer /healthz right away;
+    /readyz reports 503 until the model is warm. Safe to call more than once.
+    """
+    if not _started.acquire(blocking=False):
+        return
+
+    def _run():
+        try:
+            warm_up()
+        except Exception:
+            pass
+
+    threading.Thread(target=_run, name="whisper-warmup", daemon=True).start()
+
+
+def preload_enabled() -> bool:
+    """
+    settings.WHISPER_PRELOAD: this web process warms Whisper at start and is
+    only ready once it is warm.
+    """
+    return bool(getattr(settings, "WHISPER_PRELOAD", False))
+
+
+def is_warm() -> bool:
+    return _ready.is_set()
+
+
+def warmup_error() -> Optional[str]:
+    return _error
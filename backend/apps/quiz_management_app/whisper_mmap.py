@@ -0,0 +1,95 @@
+"""
+Memory-mapped Whisper checkpoints.
+
+whisper.load_model reads the (fp16) .pt file and copies the weights into
+private fp32 tensors, so every process holds its own copy. Here the checkpoint
+is converted once to an fp32 file next to the original, and later loads map
+that file read-only: the weights live in the OS page cache and are shared by
+all processes (gunicorn workers, quiz worker, pool workers) on the machine.
+
+CPU only; no Django imports (used from whisper_pool workers).
+"""
+import os
+import tempfile
+import time
+from typing import Optional
+
+MMAP_SUFFIX = ".fp32.mmap.pt"
+
+
+def default_download_root() -> str:
+    default = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(os.getenv("XDG_CACHE_HOME", default), "whisper")
+
+
+def mmap_checkpoint_path(name: str, download_root: str = "") -> str:
+    """
+    Official model names live in download_root, checkpoint paths get a sibling file.
+    """
+    if os.path.isfile(name):
+        return os.path.splitext(name)[0] + MMAP_SUFFIX
+    return os.path.join(download_root or default_download_root(), name + MMAP_SUFFIX)
+
+
+def _source_checkpoint(name: str, download_root: str) -> str:
+    import whisper
+
+    if name in whisper._MODELS:
+        return whisper._download(whisper._MODELS[name], download_root or default_download_root(), False)
+    if os.path.isfile(name):
+        return name
+    raise RuntimeError(f"Model {name} not found; available models = {whisper.available_models()}")
+
+
+def convert_checkpoint(src: str, dst: str) -> str:
+    """
+    Writes an fp32, contiguous copy of the checkpoint that torch.load(mmap=True) can map.
+    The file is written to a temp name and renamed, so concurrent converters are safe.
+    """
+    import torch
+
+    checkpoint = torch.load(src, map_location="cpu", weights_only=True)
+    state = {k: v.float().contiguous() if v.is_floating_point() else v.contiguous()
+             for k, v in checkpoint["model_state_dict"].items()}
+
+    os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(dst) or ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        torch.save({"dims": checkpoint["dims"], "model_state_dict": state}, tmp)
+        os.replace(tmp, dst)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return dst
+
+
+def ensure_mmap_checkpoint(name: str, download_root: str = "") -> str:
+    dst = mmap_checkpoint_path(name, download_root)
+    if not os.path.exists(dst):
+        t0 = time.time()
+        convert_checkpoint(_source_checkpoint(name, download_root), dst)
+        print(f"[whisper] converted {name} to {dst} in {time.time() - t0:.2f}s", flush=True)
+    return dst
+
+
+def load_model_mmap(name: str, download_root: str = "", path: Optional[str] = None):
+    """
+    Same result as whisper.load_model(name, device="cpu"), but the weights are
+    mapped from the converted checkpoint instead of copied into process memory.
+    """
+    import torch
+    import whisper
+    from whisper.model import ModelDimensions, Whisper
+
+    path = path or ensure_mmap_checkpoint(name, download_root)
+    checkpoint = torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+
+    model = Whisper(ModelDimensions(**checkpoint["dims"]))
+    # assign=True swaps in the mapped tensors instead of copying into the freshly allocated ones.
+    model.load_state_dict(checkpoint["model_state_dict"], assign=True)
+
+    alignment_heads = whisper._ALIGNMENT_HEADS.get(name)
+    if alignment_heads is not None:
+        model.set_alignment_heads(alignment_heads)
+    return model
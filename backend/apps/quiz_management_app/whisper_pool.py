@@ -0,0 +1,165 @@
+"""
+Parallel Whisper transcription across a process pool.
+
+This module must stay free of Django imports: pool workers are started with
+the "spawn" method and import only this file, so they never inherit DB
+connections, locks or torch thread pools from the gunicorn/worker process.
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_key: Optional[Tuple[Any, ...]] = None
+_pool_lock = threading.Lock()
+
+# Set inside each pool worker by _init_worker().
+_worker_model = None
+
+
+# -----------------------------
+# Audio splitting
+# -----------------------------
+def split_at_silence(
+    audio: np.ndarray,
+    n_chunks: int,
+    sample_rate: int = SAMPLE_RATE,
+    search_seconds: float = 5.0,
+    frame_ms: int = 30,
+) -> List[np.ndarray]:
+    """
+    Cuts audio into n_chunks roughly equal parts. Each cut is moved to the
+    quietest frame within +-search_seconds of the even split point, so words
+    are rarely split in half.
+    """
+    if n_chunks <= 1 or len(audio) == 0:
+        return [audio]
+
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+    search = int(search_seconds * sample_rate)
+    cuts = [0]
+    for i in range(1, n_chunks):
+        target = len(audio) * i // n_chunks
+        lo = max(cuts[-1] + frame, target - search)
+        hi = min(len(audio) - frame, target + search)
+        n_frames = (hi - lo) // frame
+        if n_frames <= 0:
+            cut = target
+        else:
+            window = audio[lo:lo + n_frames * frame].reshape(n_frames, frame)
+            energy = np.square(window, dtype=np.float32).mean(axis=1)
+            cut = lo + int(np.argmin(energy)) * frame + frame // 2
+        cuts.append(cut)
+    cuts.append(len(audio))
+
+    return [audio[a:b] for a, b in zip(cuts, cuts[1:]) if b > a]
+
+
+# -----------------------------
+# Pool workers
+# -----------------------------
+def _init_worker(
+    model_name: str, download_root: str, torch_threads: int, mmap: bool = False, precision: str = "fp32"
+) -> None:
+    global _worker_model
+    import torch
+    import whisper
+
+    torch.set_num_threads(max(1, torch_threads))
+    if precision == "int8":
+        from apps.quiz_management_app.whisper_quant import load_model_int8
+
+        _worker_model = load_model_int8(model_name, download_root)
+    elif mmap:
+        from apps.quiz_management_app.whisper_mmap import load_model_mmap
+
+        _worker_model = load_model_mmap(model_name, download_root)
+    elif download_root:
+        _worker_model = whisper.load_model(model_name, download_root=download_root)
+    else:
+        _worker_model = whisper.load_model(model_name)
+
+
+def _transcribe_chunk(chunk: np.ndarray, options: Dict[str, Any]) -> str:
+    result = _worker_model.transcribe(chunk, **options)
+    text = result.get("text")
+    return text.strip() if isinstance(text, str) else ""
+
+
+# -----------------------------
+# Pool management
+# -----------------------------
+def get_pool(
+    model_name: str,
+    download_root: str,
+    workers: int,
+    torch_threads: int,
+    mmap: bool = False,
+    precision: str = "fp32",
+) -> ProcessPoolExecutor:
+    """
+    One long-lived pool per process; every worker keeps its model loaded between jobs.
+    The pool is rebuilt if the configuration changes.
+    mmap=True maps a shared fp32 checkpoint instead of loading a private copy per worker.
+    precision="int8" loads the cached quantized model instead.
+    """
+    global _pool, _pool_key
+    key = (model_name, download_root, workers, torch_threads, mmap, precision)
+    with _pool_lock:
+        if _pool is not None and _pool_key == key:
+            return _pool
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_name, download_root, torch_threads, mmap, precision),
+        )
+        _pool_key = key
+        return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool, _pool_key
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+        _pool_key = None
+
+
+def transcribe_parallel(
+    audio: np.ndarray,
+    model_name: str,
+    download_root: str,
+    workers: int,
+    torch_threads: int,
+    options: Dict[str, Any],
+    min_chunk_seconds: float = 30.0,
+    mmap: bool = False,
+    precision: str = "fp32",
+) -> str:
+    """
+    Splits at silence into up to `workers` chunks (never shorter than min_chunk_seconds),
+    transcribes them concurrently and stitches the text back in order.
+    """
+    max_chunks = int(len(audio) / SAMPLE_RATE // max(min_chunk_seconds, 1))
+    n_chunks = max(1, min(workers, max_chunks))
+    chunks = split_at_silence(audio, n_chunks)
+
+    pool = get_pool(model_name, download_root, workers, torch_threads, mmap, precision)
+    try:
+        texts = list(pool.map(_transcribe_chunk, chunks, repeat(options)))
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM); start from a clean pool next time.
+        shutdown_pool()
+        raise
+    return " ".join(t for t in texts if t)
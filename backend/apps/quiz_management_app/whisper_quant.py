@@ -0,0 +1,135 @@
+"""
+Int8 dynamic quantization of Whisper for CPU inference.
+
+Linear layers get int8 weights (activations are quantized on the fly), which
+makes the encoder/decoder matmuls cheaper and shrinks the weights ~4x.
+The quantized weights are saved next to the original checkpoint, so the
+fp16 checkpoint is converted once per model and torch version.
+
+No Django imports (used from whisper_pool workers).
+"""
+import os
+import tempfile
+import time
+from collections import OrderedDict
+
+from apps.quiz_management_app.whisper_mmap import default_download_root
+
+
+def quantized_checkpoint_path(name: str, download_root: str = "") -> str:
+    import torch
+
+    suffix = f".int8.torch{torch.__version__.split('+')[0]}.pt"
+    if os.path.isfile(name):
+        return os.path.splitext(name)[0] + suffix
+    return os.path.join(download_root or default_download_root(), name + suffix)
+
+
+def _swap_linear_layers(module) -> None:
+    """
+    whisper.model.Linear is a subclass of nn.Linear that quantize_dynamic won't convert;
+    swap in plain nn.Linear modules sharing the same weights (identical in fp32).
+    """
+    import torch
+    from whisper.model import Linear
+
+    for name, child in module.named_children():
+        if isinstance(child, Linear):
+            plain = torch.nn.Linear(child.in_features, child.out_features, bias=child.bias is not None, device="meta")
+            plain.weight = child.weight
+            plain.bias = child.bias
+            setattr(module, name, plain)
+        else:
+            _swap_linear_layers(child)
+
+
+def quantize_model(model):
+    """
+    Quantizes in place: without inplace=True quantize_dynamic deep-copies the model,
+    so the fp32 weights and a full copy would both be in memory while converting.
+    """
+    import torch
+
+    _swap_linear_layers(model)
+    return torch.ao.quantization.quantize_dynamic(
+        model.cpu().eval(), {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+    )
+
+
+def _to_plain_state(state):
+    """
+    Quantized state dicts hold torch.dtype/qscheme objects, which pickle locates by
+    scanning sys.modules (this breaks on yt_dlp's lazy modules) and which
+    weights_only loading rejects. Store dtypes by name and int8 weights as
+    int_repr + scale + zero point instead.
+    """
+    import torch
+
+    plain = {}
+    for k, v in state.items():
+        if isinstance(v, torch.dtype):
+            v = str(v)
+        elif isinstance(v, tuple) and v and getattr(v[0], "is_quantized", False):
+            weight, bias = v
+            v = {
+                "int_repr": weight.int_repr(),
+                "scale": weight.q_scale(),
+                "zero_point": weight.q_zero_point(),
+                "bias": None if bias is None else bias.detach(),
+            }
+        plain[k] = v
+    return plain
+
+
+def _from_plain_state(plain, metadata):
+    """
+    metadata: the module versions from a freshly built model's state dict;
+    quantized layers need them to read their own state dict format.
+    """
+    import torch
+
+    state = OrderedDict()
+    state._metadata = metadata
+    for k, v in plain.items():
+        if isinstance(v, str) and v.startswith("torch."):
+            v = getattr(torch, v.split(".", 1)[1])
+        elif isinstance(v, dict) and "int_repr" in v:
+            weight = torch._make_per_tensor_quantized_tensor(v["int_repr"], v["scale"], v["zero_point"])
+            v = (weight, v["bias"])
+        state[k] = v
+    return state
+
+
+def load_model_int8(name: str, download_root: str = ""):
+    """
+    Loads the cached quantized weights, or quantizes the fp32 model once and caches them.
+    """
+    import torch
+    import whisper
+    from whisper.model import ModelDimensions, Whisper
+
+    path = quantized_checkpoint_path(name, download_root)
+    if os.path.exists(path):
+        checkpoint = torch.load(path, map_location="cpu", weights_only=True)
+        # Same module structure as the cached model, then swap in the stored int8 weights.
+        model = quantize_model(Whisper(ModelDimensions(**checkpoint["dims"])))
+        model.load_state_dict(_from_plain_state(checkpoint["model_state_dict"], model.state_dict()._metadata))
+        alignment_heads = whisper._ALIGNMENT_HEADS.get(name)
+        if alignment_heads is not None:
+            model.set_alignment_heads(alignment_heads)
+        return model
+
+    t0 = time.time()
+    model = quantize_model(whisper.load_model(name, device="cpu", download_root=download_root or None))
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        torch.save({"dims": model.dims.__dict__, "model_state_dict": _to_plain_state(model.state_dict())}, tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    print(f"[whisper] quantized {name} to int8 in {time.time() - t0:.2f}s ({path})", flush=True)
+    return model
@@ -0,0 +1,198 @@
+"""
+Thread-safe, in-process registry of loaded Whisper models.
+
+Models are keyed by (model name, device, precision). Loading is single-flight:
+concurrent callers asking for the same key wait for the first load instead of
+loading a second copy. With a memory budget, the least recently used models
+are dropped from the registry until the resident models fit.
+
+A model's footprint is the process RSS growth measured around its load (what the
+budget is about: decoded checkpoint, allocator overhead, CUDA/MKL init), but never
+less than its weight tensors, which also covers platforms without /proc and loads
+that overlap in time (where the RSS deltas of both models blur together).
+
+Like whisper_pool, this module has no Django imports; utils.py wires it to settings.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+
+class ModelKey(NamedTuple):
+    name: str
+    device: str
+    precision: str
+
+
+@dataclass
+class _Entry:
+    model: Any = None
+    footprint_bytes: int = 0
+    loaded_at: float = 0.0
+    last_used_at: float = 0.0
+    uses: int = 0
+    ready: threading.Event = field(default_factory=threading.Event)
+    error: Optional[BaseException] = None
+
+
+def model_footprint(model: Any) -> int:
+    """
+    Bytes held by the model's weights and buffers (0 if it isn't a torch module).
+    Uses the state dict so packed int8 weights of quantized layers are counted too.
+    """
+    try:
+        state = model.state_dict()
+        return int(sum(_tensor_bytes(v) for v in state.values()))
+    except (AttributeError, TypeError):
+        return 0
+
+
+def _tensor_bytes(value: Any) -> int:
+    if isinstance(value, (tuple, list)):
+        return sum(_tensor_bytes(v) for v in value)
+    if hasattr(value, "numel") and hasattr(value, "element_size"):
+        return value.numel() * value.element_size()
+    return 0
+
+
+def process_rss_bytes() -> Optional[int]:
+    """
+    Current resident set size of this process (Linux only, else None).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    import resource
+
+    return pages * resource.getpagesize()
+
+
+class ModelRegistry:
+    def __init__(
+        self,
+        loader: Callable[[ModelKey], Any],
+        budget_bytes: int = 0,
+        rss: Callable[[], Optional[int]] = process_rss_bytes,
+    ):
+        """
+        loader(key) loads a model; it is called without the registry lock held.
+        budget_bytes=0 means no limit. rss() returns the process RSS (None if unknown).
+        """
+        self._loader = loader
+        self._rss = rss
+        self.budget_bytes = budget_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[ModelKey, _Entry]" = OrderedDict()
+
+    def get(self, key: ModelKey) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            owner = entry is None
+            if owner:
+                entry = _Entry()
+                self._entries[key] = entry
+
+        if not owner:
+            entry.ready.wait()
+            if entry.error is not None:
+                raise entry.error
+            with self._lock:
+                self._touch(key, entry)
+            return entry.model
+
+        try:
+            t0 = time.time()
+            rss_before = self._rss()
+            model = self._loader(key)
+            rss_after = self._rss()
+        except BaseException as e:
+            with self._lock:
+                entry.error = e
+                self._entries.pop(key, None)
+            entry.ready.set()
+            raise
+
+        with self._lock:
+            entry.model = model
+            rss_growth = rss_after - rss_before if rss_before is not None and rss_after is not None else 0
+            entry.footprint_bytes = max(rss_growth, model_footprint(model))
+            entry.loaded_at = time.time()
+            self._touch(key, entry)
+            evicted = self._evict_over_budget(keep=key)
+        entry.ready.set()
+
+        print(
+            f"[whisper] registry loaded {key.name} ({key.device}/{key.precision}) "
+            f"{entry.footprint_bytes / 2**20:.0f} MiB in {entry.loaded_at - t0:.2f}s",
+            flush=True,
+        )
+        for k in evicted:
+            print(f"[whisper] registry evicted {k.name} ({k.device}/{k.precision})", flush=True)
+        return model
+
+    def _touch(self, key: ModelKey, entry: _Entry) -> None:
+        entry.last_used_at = time.time()
+        entry.uses += 1
+        self._entries.move_to_end(key)
+
+    def _evict_over_budget(self, keep: ModelKey) -> List[ModelKey]:
+        """
+        Drops least recently used, fully loaded models until the total fits the budget.
+        A model still running in another thread stays alive until that call returns;
+        the registry just stops handing it out.
+        """
+        evicted: List[ModelKey] = []
+        if not self.budget_bytes:
+            return evicted
+        for key in list(self._entries):
+            if self.resident_bytes() <= self.budget_bytes:
+                break
+            entry = self._entries[key]
+            if key == keep or not entry.ready.is_set():
+                continue
+            del self._entries[key]
+            evicted.append(key)
+        return evicted
+
+    def resident_bytes(self) -> int:
+        return sum(e.footprint_bytes for e in self._entries.values())
+
+    def evict(self, key: ModelKey) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.ready.is_set():
+                return False
+            del self._entries[key]
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key: ModelKey) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry.ready.is_set()
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """
+        Loaded models, least recently used first, for logs and ops tooling.
+        """
+        with self._lock:
+            return [
+                {
+                    "name": key.name,
+                    "device": key.device,
+                    "precision": key.precision,
+                    "footprint_bytes": e.footprint_bytes,
+                    "loaded_at": e.loaded_at,
+                    "last_used_at": e.last_used_at,
+                    "uses": e.uses,
+                }
+                for key, e in self._entries.items()
+                if e.ready.is_set()
+            ]
@@ -0,0 +1,57 @@
+import re
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+# Kept free of Django/model imports: used by models.py and migrations too.
+
+_YT_ID_RE = re.compile(r"^[A-Za-z0-9_-]{11}$")
+_YT_WATCH_PREFIX = "https://www.youtube.com/watch?v="
+
+_YT_HOSTS = {
+    "youtube.com",
+    "www.youtube.com",
+    "m.youtube.com",
+    "music.youtube.com",
+    "youtube-nocookie.com",
+    "www.youtube-nocookie.com",
+}
+_YT_SHORT_HOSTS = {"youtu.be", "www.youtu.be"}
+# /shorts/<id>, /embed/<id>, /live/<id>, /v/<id>, /e/<id>
+_YT_ID_PATH_PREFIXES = {"shorts", "embed", "live", "v", "e"}
+
+
+def extract_youtube_video_id(url: str) -> Optional[str]:
+    """
+    Returns the 11-char video id for any common YouTube URL shape
+    (watch, youtu.be, m./music., shorts, embed, live) or None.
+    Tracking, timestamp and playlist params are ignored.
+    """
+    raw = (url or "").strip()
+    if not raw:
+        return None
+    if "://" not in raw:
+        raw = "https://" + raw
+
+    parsed = urlparse(raw)
+    if parsed.scheme not in ("http", "https"):
+        return None
+
+    host = (parsed.hostname or "").lower()
+    parts = [p for p in parsed.path.split("/") if p]
+    candidate = None
+
+    if host in _YT_SHORT_HOSTS:
+        candidate = parts[0] if parts else None
+    elif host in _YT_HOSTS:
+        if parts and parts[0] in _YT_ID_PATH_PREFIXES and len(parts) > 1:
+            candidate = parts[1]
+        elif not parts or parts[0] == "watch":
+            candidate = (parse_qs(parsed.query).get("v") or [None])[0]
+
+    if candidate and _YT_ID_RE.match(candidate):
+        return candidate
+    return None
+
+
+def canonical_youtube_url(video_id: str) -> str:
+    return _YT_WATCH_PREFIX + video_id
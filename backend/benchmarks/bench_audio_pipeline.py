@@ -0,0 +1,85 @@
+"""
+Compares the legacy mp3 audio path with the PCM path.
+
+Usage (from backend/, needs network + ffmpeg):
+    python benchmarks/bench_audio_pipeline.py "https://www.youtube.com/watch?v=<id>" --runs 3
+    python benchmarks/bench_audio_pipeline.py "<url>" --transcribe   # also time Whisper
+
+Reports wall time for download and decode (and optionally transcription)
+plus the number of bytes fetched from YouTube for each pipeline.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+
+from apps.quiz_management_app import utils  # noqa: E402
+
+
+def run_once(url: str, pipeline: str, transcribe: bool) -> dict:
+    settings.AUDIO_PIPELINE = pipeline
+    tmp = utils.make_temp_audio()
+    try:
+        t0 = time.perf_counter()
+        utils.download_audio_from_video(url, tmp)
+        t_download = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        if tmp.source_path:
+            audio = utils.decode_audio_pcm(tmp.source_path)
+        else:
+            import whisper
+
+            audio = whisper.load_audio(tmp.mp3_path)
+        t_decode = time.perf_counter() - t0
+
+        t_transcribe = 0.0
+        if transcribe:
+            model = utils.get_whisper_model()
+            t0 = time.perf_counter()
+            model.transcribe(audio, **utils.TRANSCRIBE_OPTIONS)
+            t_transcribe = time.perf_counter() - t0
+
+        return {
+            "download": t_download,
+            "decode": t_decode,
+            "transcribe": t_transcribe,
+            "bytes": tmp.downloaded_bytes,
+            "audio_seconds": len(audio) / utils.AUDIO_SAMPLE_RATE,
+        }
+    finally:
+        utils.cleanup_audio(tmp)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("url")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--transcribe", action="store_true")
+    args = parser.parse_args()
+
+    print(f"{'pipeline':<8} {'download s':>11} {'decode s':>9} {'transcribe s':>13} {'total s':>8} {'MB fetched':>11}")
+    for pipeline in ("mp3", "pcm"):
+        runs = [run_once(args.url, pipeline, args.transcribe) for _ in range(args.runs)]
+        med = {k: statistics.median(r[k] for r in runs) for k in runs[0]}
+        total = med["download"] + med["decode"] + med["transcribe"]
+        print(
+            f"{pipeline:<8} {med['download']:>11.2f} {med['decode']:>9.2f} {med['transcribe']:>13.2f} "
+            f"{total:>8.2f} {med['bytes'] / 1e6:>11.2f}"
+        )
+    print(f"audio length: {med['audio_seconds']:.0f}s, median of {args.runs} run(s)")
+
+
+if __name__ == "__main__":
+    main()
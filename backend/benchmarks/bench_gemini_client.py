@@ -0,0 +1,117 @@
+"""
+Gemini request latency: new client per request vs. the pooled process-wide client.
+
+Usage (from backend/):
+    python benchmarks/bench_gemini_client.py --requests 50 --handshake-ms 60
+
+A local stub HTTP server stands in for the Gemini API (no key or network needed)
+and answers generateContent with a fixed quiz. Every new connection waits
+--handshake-ms before it is served, standing in for DNS + TCP + TLS setup to
+the real endpoint; --server-ms is the model's own response time. The printed
+"connections" column is how many connections the server had to accept.
+"""
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from apps.quiz_management_app.gemini_pool import ClientConfig, ClientHolder, build_client  # noqa: E402
+
+MODEL = "gemini-2.5-flash"
+QUIZ = {
+    "title": "Stub quiz",
+    "description": "Served by the benchmark stub.",
+    "questions": [
+        {"question_title": f"Q{i}?", "question_options": ["A", "B", "C", "D"], "answer": "A"} for i in range(10)
+    ],
+}
+BODY = json.dumps(
+    {
+        "candidates": [{"content": {"role": "model", "parts": [{"text": json.dumps(QUIZ)}]}, "finishReason": "STOP"}],
+        "usageMetadata": {"promptTokenCount": 1000, "candidatesTokenCount": 300, "totalTokenCount": 1300},
+    }
+).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+    handshake_seconds = 0.0
+    server_seconds = 0.0
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with StubHandler.lock:
+            StubHandler.connections += 1
+        time.sleep(self.handshake_seconds)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.server_seconds)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub(handshake_ms: float, server_ms: float) -> ThreadingHTTPServer:
+    StubHandler.handshake_seconds = handshake_ms / 1000
+    StubHandler.server_seconds = server_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(mode: str, config: ClientConfig, n: int):
+    StubHandler.connections = 0
+    holder = ClientHolder()
+    latencies = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        client = build_client(config) if mode == "per-request" else holder.get(config)
+        resp = client.models.generate_content(model=MODEL, contents="transcript")
+        latencies.append(time.perf_counter() - t0)
+        assert json.loads(resp.text)["title"] == QUIZ["title"]
+    holder.reset()
+    return latencies, StubHandler.connections
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--handshake-ms", type=float, default=60.0)
+    parser.add_argument("--server-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    server = start_stub(args.handshake_ms, args.server_ms)
+    config = ClientConfig(api_key="stub", base_url=f"http://127.0.0.1:{server.server_address[1]}", timeout=30)
+    run("pooled", config, 2)  # import google.genai/httpx before timing
+
+    print(f"{args.requests} requests, handshake {args.handshake_ms:.0f} ms, server {args.server_ms:.0f} ms")
+    print(f"{'client':<12} {'mean ms':>8} {'p50 ms':>7} {'p95 ms':>7} {'connections':>12}")
+    results = {}
+    for mode in ("per-request", "pooled"):
+        latencies, connections = run(mode, config, args.requests)
+        ms = sorted(x * 1000 for x in latencies)
+        results[mode] = statistics.mean(ms)
+        p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+        print(f"{mode:<12} {results[mode]:>8.1f} {statistics.median(ms):>7.1f} {p95:>7.1f} {connections:>12}")
+    print(f"saved per request: {results['per-request'] - results['pooled']:.1f} ms")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Django boot time: django.setup() plus URL loading, in a fresh interpreter.
+
+Usage (from backend/, with the usual environment variables set):
+    python benchmarks/bench_import_time.py --runs 5 --budget 1.0
+
+Fails (exit code 1) if the median exceeds --budget seconds or if one of the
+heavy stacks (torch, whisper, numba, yt_dlp, google.genai) got imported;
+those must only load when a quiz is actually created.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+HEAVY = ("torch", "whisper", "numba", "yt_dlp", "google.genai")
+
+PROBE = """
+import json, os, sys, time
+t0 = time.perf_counter()
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(json.dumps({"seconds": time.perf_counter() - t0, "modules": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY,)
+
+
+def measure() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND, env=os.environ.copy(), capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=1.0, help="max median seconds")
+    args = parser.parse_args()
+
+    measure()  # warm the filesystem cache / .pyc files
+    runs = [measure() for _ in range(args.runs)]
+    median = statistics.median(r["seconds"] for r in runs)
+    heavy = sorted({m for r in runs for m in r["modules"]})
+
+    print(f"django.setup() + urls: median {median:.3f}s over {args.runs} runs (budget {args.budget:.3f}s)")
+    print(f"heavy modules imported: {', '.join(heavy) or 'none'}")
+    if median > args.budget or heavy:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Load time and memory of N processes loading Whisper: private copy vs. shared mmap.
+
+Usage (from backend/):
+    python benchmarks/bench_mmap_load.py --model base --processes 1,2,4
+    python benchmarks/bench_mmap_load.py --model /models/custom.pt --download-root /models
+
+Each process reports its RSS before/after loading and its PSS (proportional set
+size: shared pages are split between the processes that map them) once all
+processes have loaded the model. The sum of PSS is what the machine really pays.
+The mmap checkpoint is converted before timing; conversion is a one-off cost.
+"""
+import argparse
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from apps.quiz_management_app import whisper_mmap  # noqa: E402
+from apps.quiz_management_app.whisper_registry import process_rss_bytes  # noqa: E402
+
+MiB = 2**20
+
+
+def pss_bytes() -> int:
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def _child(mode: str, model: str, download_root: str, loaded, done, results) -> None:
+    import torch
+    import whisper
+
+    torch.set_num_threads(1)
+    rss_before = process_rss_bytes() or 0
+    t0 = time.perf_counter()
+    if mode == "mmap":
+        m = whisper_mmap.load_model_mmap(model, download_root)
+    else:
+        m = whisper.load_model(model, device="cpu", download_root=download_root or None)
+    load_s = time.perf_counter() - t0
+    rss_after = process_rss_bytes() or 0
+
+    loaded.wait()  # everyone has the model now; measure the shared steady state
+    results.put((load_s, rss_before, rss_after, pss_bytes()))
+    done.wait()
+    del m
+
+
+def run(mode: str, model: str, download_root: str, processes: int):
+    ctx = multiprocessing.get_context("spawn")
+    loaded = ctx.Barrier(processes)
+    done = ctx.Event()
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=_child, args=(mode, model, download_root, loaded, done, results))
+        for _ in range(processes)
+    ]
+    for p in procs:
+        p.start()
+    rows = [results.get() for _ in procs]
+    done.set()
+    for p in procs:
+        p.join()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="base", help="official model name or checkpoint path")
+    parser.add_argument("--download-root", default="")
+    parser.add_argument("--processes", default="1,2,4")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    whisper_mmap.ensure_mmap_checkpoint(args.model, args.download_root)
+    print(f"model: {args.model}, mmap checkpoint ready in {time.perf_counter() - t0:.1f}s")
+    print(f"{'mode':<6} {'procs':>5} {'load s':>7} {'rss before':>11} {'rss after':>10} {'pss':>8} {'sum pss':>8}  (MiB)")
+
+    for n in (int(x) for x in args.processes.split(",")):
+        for mode in ("copy", "mmap"):
+            rows = run(mode, args.model, args.download_root, n)
+            load = sum(r[0] for r in rows) / n
+            before = sum(r[1] for r in rows) / n / MiB
+            after = sum(r[2] for r in rows) / n / MiB
+            pss = sum(r[3] for r in rows) / MiB
+            print(f"{mode:<6} {n:>5} {load:>7.2f} {before:>11.0f} {after:>10.0f} {pss / n:>8.0f} {pss:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
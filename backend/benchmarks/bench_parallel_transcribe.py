@@ -0,0 +1,72 @@
+"""
+Speedup of chunked process-pool transcription vs. a single process.
+
+Usage (from backend/, needs ffmpeg and a local audio file):
+    python benchmarks/bench_parallel_transcribe.py lecture.m4a --model base --workers 1,2,4 --torch-threads 1
+
+The baseline transcribes the whole file in this process with all cores available
+to torch. Each parallel run uses a fresh pool; model loading in the workers is
+warmed up before timing so only transcription is measured.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np  # noqa: E402
+import torch  # noqa: E402
+import whisper  # noqa: E402
+
+from apps.quiz_management_app import whisper_pool  # noqa: E402
+
+OPTIONS = {"fp16": False}
+
+
+def baseline(audio: np.ndarray, model_name: str) -> float:
+    torch.set_num_threads(os.cpu_count() or 1)
+    model = whisper.load_model(model_name)
+    t0 = time.perf_counter()
+    model.transcribe(audio, **OPTIONS)
+    return time.perf_counter() - t0
+
+
+def parallel(audio: np.ndarray, model_name: str, workers: int, torch_threads: int) -> float:
+    whisper_pool.shutdown_pool()
+    # warm-up: spawn workers and load the model in each of them
+    warm = np.zeros(whisper_pool.SAMPLE_RATE * workers * 2, dtype=np.float32)
+    whisper_pool.transcribe_parallel(warm, model_name, "", workers, torch_threads, OPTIONS, min_chunk_seconds=1)
+
+    t0 = time.perf_counter()
+    whisper_pool.transcribe_parallel(audio, model_name, "", workers, torch_threads, OPTIONS)
+    dt = time.perf_counter() - t0
+    whisper_pool.shutdown_pool()
+    return dt
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("audio")
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--torch-threads", type=int, default=1)
+    args = parser.parse_args()
+
+    audio = whisper.load_audio(args.audio)
+    seconds = len(audio) / whisper_pool.SAMPLE_RATE
+    print(f"audio: {seconds:.0f}s, cores: {os.cpu_count()}, model: {args.model}")
+
+    base = baseline(audio, args.model)
+    print(f"{'mode':<22} {'wall s':>8} {'RTF':>6} {'speedup':>8}")
+    print(f"{'single process':<22} {base:>8.1f} {base / seconds:>6.2f} {1.0:>8.2f}")
+
+    for workers in (int(w) for w in args.workers.split(",")):
+        dt = parallel(audio, args.model, workers, args.torch_threads)
+        label = f"{workers} workers x {args.torch_threads} thr"
+        print(f"{label:<22} {dt:>8.1f} {dt / seconds:>6.2f} {base / dt:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
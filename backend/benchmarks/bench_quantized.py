@@ -0,0 +1,112 @@
+"""
+fp32 vs. int8 (dynamic quantization) Whisper on CPU: speed, memory and WER drift.
+
+Usage (from backend/, needs ffmpeg):
+    python benchmarks/bench_quantized.py --model base --audio-dir benchmarks/audio
+
+--audio-dir holds a few short clips (any format ffmpeg reads). A clip with a
+same-named .txt file next to it is scored against that reference; otherwise the
+fp32 transcript is the reference, so the int8 WER is pure quantization drift.
+Each precision runs in its own process so RSS numbers don't mix; the int8
+conversion is done (and cached) before timing.
+"""
+import argparse
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from apps.quiz_management_app import whisper_quant  # noqa: E402
+from apps.quiz_management_app.whisper_registry import model_footprint, process_rss_bytes  # noqa: E402
+
+OPTIONS = {"fp16": False, "temperature": 0.0}
+AUDIO_EXTS = {".wav", ".mp3", ".m4a", ".flac", ".ogg", ".webm", ".opus"}
+MiB = 2**20
+
+
+def wer(reference: str, hypothesis: str) -> float:
+    from whisper.normalizers import EnglishTextNormalizer
+
+    normalize = EnglishTextNormalizer()
+    ref = normalize(reference).split()
+    hyp = normalize(hypothesis).split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        prev, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (r != h))
+    return row[-1] / len(ref)
+
+
+def _run(precision: str, model_name: str, download_root: str, files, results) -> None:
+    import whisper
+
+    rss0 = process_rss_bytes() or 0
+    t0 = time.perf_counter()
+    if precision == "int8":
+        model = whisper_quant.load_model_int8(model_name, download_root)
+    else:
+        model = whisper.load_model(model_name, device="cpu", download_root=download_root or None)
+    load_s = time.perf_counter() - t0
+    rss = (process_rss_bytes() or 0) - rss0
+
+    texts, seconds = [], 0.0
+    for f in files:
+        audio = whisper.load_audio(f)
+        t0 = time.perf_counter()
+        texts.append(model.transcribe(audio, **OPTIONS)["text"].strip())
+        seconds += time.perf_counter() - t0
+    results.put((load_s, rss, model_footprint(model), seconds, texts))
+
+
+def run(precision: str, model_name: str, download_root: str, files):
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    p = ctx.Process(target=_run, args=(precision, model_name, download_root, files, results))
+    p.start()
+    row = results.get()
+    p.join()
+    return row
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--download-root", default="")
+    parser.add_argument("--audio-dir", default=str(Path(__file__).resolve().parent / "audio"))
+    args = parser.parse_args()
+
+    files = sorted(str(p) for p in Path(args.audio_dir).iterdir() if p.suffix.lower() in AUDIO_EXTS)
+    if not files:
+        sys.exit(f"no audio files in {args.audio_dir}")
+
+    import whisper
+
+    audio_seconds = sum(len(whisper.load_audio(f)) for f in files) / 16000
+    whisper_quant.load_model_int8(args.model, args.download_root)  # one-off conversion, not timed
+
+    fp32 = run("fp32", args.model, args.download_root, files)
+    int8 = run("int8", args.model, args.download_root, files)
+
+    print(f"model: {args.model}, {len(files)} clips, {audio_seconds:.0f}s audio")
+    print(f"{'precision':<10} {'load s':>7} {'rss MiB':>8} {'weights MiB':>12} {'transcribe s':>13} {'RTF':>6} {'WER':>6}")
+    for name, row in (("fp32", fp32), ("int8", int8)):
+        load_s, rss, weights, seconds, texts = row
+        errors = []
+        for f, text, ref_text in zip(files, texts, fp32[4]):
+            ref_file = Path(f).with_suffix(".txt")
+            reference = ref_file.read_text() if ref_file.exists() else ref_text
+            errors.append(wer(reference, text))
+        print(
+            f"{name:<10} {load_s:>7.2f} {rss / MiB:>8.0f} {weights / MiB:>12.0f} "
+            f"{seconds:>13.1f} {seconds / audio_seconds:>6.2f} {sum(errors) / len(errors):>6.1%}"
+        )
+    print(f"speedup: {fp32[3] / int8[3]:.2f}x, weights: {fp32[2] / max(int8[2], 1):.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
@@ -23,13 +23,105 @@ DEBUG = os.environ.get("DEBUG", "False") == "True"
 
 # Gemini API
 GEMINI_API_KEY = os.environ["GEMINI_API_KEY"]
+# One pooled keep-alive client per process; GEMINI_BASE_URL overrides the API endpoint (proxy, local stub)
+GEMINI_BASE_URL = os.environ.get("GEMINI_BASE_URL", "")
+GEMINI_TIMEOUT = float(os.environ.get("GEMINI_TIMEOUT", "120"))
+GEMINI_CONNECT_TIMEOUT = float(os.environ.get("GEMINI_CONNECT_TIMEOUT", "10"))
+GEMINI_MAX_CONNECTIONS = int(os.environ.get("GEMINI_MAX_CONNECTIONS", "10"))
+GEMINI_KEEPALIVE_SECONDS = float(os.environ.get("GEMINI_KEEPALIVE_SECONDS", "60"))
+# Stream the quiz and validate/store each question as soon as it is complete
+GEMINI_STREAMING = os.environ.get("GEMINI_STREAMING", "False") == "True"
+# JSON mode with an explicit response schema instead of prompt-only format instructions
+GEMINI_STRUCTURED_OUTPUT = os.environ.get("GEMINI_STRUCTURED_OUTPUT", "True") == "True"
+# Follow-up calls that regenerate only invalid/missing questions; 0 = fail the quiz instead
+QUIZ_REPAIR_MAX_ROUNDS = int(os.environ.get("QUIZ_REPAIR_MAX_ROUNDS", "2"))
+# Transcripts above this many tokens are summarized in chunks first (map-reduce); 0 = never
+LLM_TRANSCRIPT_TOKEN_BUDGET = int(os.environ.get("LLM_TRANSCRIPT_TOKEN_BUDGET", "30000"))
+LLM_MAP_CHUNK_TOKENS = int(os.environ.get("LLM_MAP_CHUNK_TOKENS", "8000"))
+LLM_MAP_CONCURRENCY = int(os.environ.get("LLM_MAP_CONCURRENCY", "4"))
 
 # Whisper
 WHISPER_MODEL = os.environ.get("WHISPER_MODEL", "small")
 WHISPER_DOWNLOAD_ROOT = os.environ.get("WHISPER_DOWNLOAD_ROOT", "")
+WHISPER_DEVICE = os.environ.get("WHISPER_DEVICE", "")  # "" = cuda if available, else cpu
+# Upper bound for all resident Whisper models (weights); least recently used ones are dropped. 0 = no limit
+WHISPER_MEMORY_BUDGET_MB = int(os.environ.get("WHISPER_MEMORY_BUDGET_MB", "0"))
+# Map a converted fp32 checkpoint so all processes share the weights (CPU only)
+WHISPER_MMAP = os.environ.get("WHISPER_MMAP", "False") == "True"
+# Warm Whisper in every gunicorn worker (gunicorn.conf.py) and gate /readyz on it.
+# Off by default: quizzes are transcribed by the job worker, which always warms up at start.
+WHISPER_PRELOAD = os.environ.get("WHISPER_PRELOAD", "False") == "True"
+READINESS_CACHE_SECONDS = float(os.environ.get("READINESS_CACHE_SECONDS", "5"))
+# "fp32" (default) or "int8": dynamically quantized linear layers for CPU inference
+WHISPER_PRECISION = os.environ.get("WHISPER_PRECISION", "fp32")
+# "full" transcribes the whole file at once, "windowed" streams fixed windows (flat memory for long videos),
+# "parallel" splits at silence and transcribes chunks in a process pool
+WHISPER_TRANSCRIBE_MODE = os.environ.get("WHISPER_TRANSCRIBE_MODE", "full")
+WHISPER_WINDOW_SECONDS = float(os.environ.get("WHISPER_WINDOW_SECONDS", "30"))
+WHISPER_PARALLEL_WORKERS = int(os.environ.get("WHISPER_PARALLEL_WORKERS", "2"))
+WHISPER_TORCH_THREADS = int(os.environ.get("WHISPER_TORCH_THREADS", "1"))
+WHISPER_MIN_CHUNK_SECONDS = float(os.environ.get("WHISPER_MIN_CHUNK_SECONDS", "30"))
+# Model tier policy: "fixed" always uses WHISPER_MODEL, "adaptive" picks a tier per job
+WHISPER_TIER_POLICY = os.environ.get("WHISPER_TIER_POLICY", "fixed")
+WHISPER_MODEL_TIERS = os.environ.get("WHISPER_MODEL_TIERS", "tiny,base,small")  # fastest first
+WHISPER_LATENCY_BUDGET = float(os.environ.get("WHISPER_LATENCY_BUDGET", "300"))  # seconds of transcription per job
 
 YT_DLP_COOKIES_PATH = os.environ.get("YT_DLP_COOKIES_PATH")
 
+# Audio: "pcm" downloads the smallest adequate audio stream and decodes it once to 16 kHz PCM,
+# "mp3" is the legacy transcode path.
+AUDIO_PIPELINE = os.environ.get("AUDIO_PIPELINE", "pcm")
+AUDIO_FORMAT = os.environ.get("AUDIO_FORMAT", "worstaudio[abr>=32][vcodec=none]/bestaudio/best")
+
+# Preflight: metadata probe before a job is queued
+VIDEO_PREFLIGHT_ENABLED = os.environ.get("VIDEO_PREFLIGHT_ENABLED", "True") == "True"
+VIDEO_PREFLIGHT_TIMEOUT = float(os.environ.get("VIDEO_PREFLIGHT_TIMEOUT", "5"))
+MAX_VIDEO_DURATION = int(os.environ.get("MAX_VIDEO_DURATION", "7200"))  # seconds, 0 = no limit
+VIDEO_DURATION_POLICY = os.environ.get("VIDEO_DURATION_POLICY", "reject")  # "reject" or "cap"
+# Whisper seconds per audio second, used to estimate job cost (CPU, base model)
+WHISPER_REALTIME_FACTOR = float(os.environ.get("WHISPER_REALTIME_FACTOR", "0.5"))
+
+# Caption fast path: use YouTube subtitles instead of Whisper when available
+CAPTIONS_ENABLED = os.environ.get("CAPTIONS_ENABLED", "True") == "True"
+CAPTIONS_LANGUAGES = [l.strip() for l in os.environ.get("CAPTIONS_LANGUAGES", "en,de").split(",") if l.strip()]
+CAPTIONS_ALLOW_AUTO = os.environ.get("CAPTIONS_ALLOW_AUTO", "True") == "True"
+CAPTIONS_MIN_WORDS = int(os.environ.get("CAPTIONS_MIN_WORDS", "50"))
+
+# Transcript cache (skips yt-dlp + Whisper for videos we already transcribed)
+TRANSCRIPT_CACHE_ENABLED = os.environ.get("TRANSCRIPT_CACHE_ENABLED", "True") == "True"
+TRANSCRIPT_CACHE_MAX_BYTES = int(os.environ.get("TRANSCRIPT_CACHE_MAX_MB", "200")) * 1024 * 1024
+# Validated Gemini quiz payloads, keyed by transcript hash + prompt version + model
+LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE_ENABLED", "True") == "True"
+LLM_CACHE_TTL = timedelta(hours=int(os.environ.get("LLM_CACHE_TTL_HOURS", "720")))
+LLM_CACHE_MAX_BYTES = int(os.environ.get("LLM_CACHE_MAX_MB", "50")) * 1024 * 1024
+
+# Quiz reuse: copy an existing quiz for the same video instead of calling Gemini again
+QUIZ_REUSE_ENABLED = os.environ.get("QUIZ_REUSE_ENABLED", "False") == "True"
+QUIZ_REUSE_MAX_AGE = timedelta(hours=int(os.environ.get("QUIZ_REUSE_MAX_AGE_HOURS", "720")))
+
+# Quiz generation jobs (processed by `manage.py run_quiz_worker`)
+QUIZ_JOB_POLL_INTERVAL = float(os.environ.get("QUIZ_JOB_POLL_INTERVAL", "2"))
+QUIZ_JOB_STALE_AFTER = int(os.environ.get("QUIZ_JOB_STALE_AFTER", "900"))
+QUIZ_JOB_HEARTBEAT_SECONDS = float(os.environ.get("QUIZ_JOB_HEARTBEAT_SECONDS", "60"))
+QUIZ_JOB_MAX_ATTEMPTS = int(os.environ.get("QUIZ_JOB_MAX_ATTEMPTS", "2"))
+# Concurrent requests for the same video share one pipeline run (threads + DB lease across processes)
+QUIZ_INFLIGHT_ENABLED = os.environ.get("QUIZ_INFLIGHT_ENABLED", "True") == "True"
+QUIZ_INFLIGHT_LEASE_SECONDS = int(os.environ.get("QUIZ_INFLIGHT_LEASE_SECONDS", "60"))
+QUIZ_INFLIGHT_RESULT_SECONDS = int(os.environ.get("QUIZ_INFLIGHT_RESULT_SECONDS", "30"))
+QUIZ_INFLIGHT_POLL_SECONDS = float(os.environ.get("QUIZ_INFLIGHT_POLL_SECONDS", "1"))
+# Idempotency-Key on POST /api/createQuiz/: replays return the first response (purge_idempotency_keys cleans up)
+IDEMPOTENCY_KEY_TTL = timedelta(hours=int(os.environ.get("IDEMPOTENCY_KEY_TTL_HOURS", "24")))
+IDEMPOTENCY_WAIT_SECONDS = float(os.environ.get("IDEMPOTENCY_WAIT_SECONDS", "1"))
+# Prometheus metrics: /metrics on the web process, this port on the quiz worker (0 = off)
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "True") == "True"
+QUIZ_WORKER_METRICS_PORT = int(os.environ.get("QUIZ_WORKER_METRICS_PORT", "0"))
+# Scrapers send `Authorization: Bearer <METRICS_TOKEN>`; empty = /metrics only answers loopback requests
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+# One PipelineTelemetry row per job run, for `manage.py pipeline_report`
+PIPELINE_TELEMETRY_ENABLED = os.environ.get("PIPELINE_TELEMETRY_ENABLED", "True") == "True"
+# Short jobs are served first; after this many seconds a job is served in arrival order
+QUIZ_JOB_MAX_WAIT = int(os.environ.get("QUIZ_JOB_MAX_WAIT", "600"))
+
 ALLOWED_HOSTS = [h.strip() for h in os.environ.get("ALLOWED_HOSTS", "").split(",") if h.strip()]
 
 # If you deploy under a subpath like /quizly, set in .env:
@@ -111,6 +203,7 @@ CORS_ALLOWED_ORIGINS = [
 CORS_ALLOW_HEADERS = list(default_headers) + [
     "authorization",
     "content-type",
+    "idempotency-key",
 ]
 
 CORS_ALLOW_METHODS = list(default_methods) + [
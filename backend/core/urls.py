@@ -2,8 +2,13 @@ from django.contrib import admin
 from django.http import JsonResponse
 from django.urls import path, include
 
+from core.views import healthz, metrics_view, readyz
+
 urlpatterns = [
     path("", lambda request: JsonResponse({"status": "ok"})),
+    path("healthz", healthz, name="healthz"),
+    path("readyz", readyz, name="readyz"),
+    path("metrics", metrics_view, name="metrics"),
     path("admin/", admin.site.urls),
     path("api/", include("apps.user_auth_app.api.urls")),
     path("api/", include("apps.quiz_management_app.api.urls")),
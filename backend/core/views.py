@@ -0,0 +1,78 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.http import Http404, HttpResponse, JsonResponse
+
+from apps.quiz_management_app import metrics, warmup
+from apps.quiz_management_app.jobs import collect_job_metrics
+
+_readiness_lock = threading.Lock()
+_readiness_cache = {"at": 0.0, "ok": False, "checks": {}}
+
+
+def healthz(request):
+    """
+    Liveness: the process is up and serving requests. Does no I/O.
+    """
+    return JsonResponse({"status": "ok"})
+
+
+def _check_database() -> bool:
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+        return True
+    except Exception:
+        return False
+
+
+def _run_checks() -> dict:
+    checks = {"database": _check_database()}
+    if warmup.preload_enabled():
+        checks["whisper"] = warmup.is_warm()
+    return checks
+
+
+def readyz(request):
+    """
+    Readiness: database reachable and (with WHISPER_PRELOAD) the model warm.
+    Results are cached for READINESS_CACHE_SECONDS so frequent probes stay cheap.
+    """
+    ttl = float(getattr(settings, "READINESS_CACHE_SECONDS", 5))
+    with _readiness_lock:
+        if time.monotonic() - _readiness_cache["at"] >= ttl:
+            checks = _run_checks()
+            _readiness_cache.update(at=time.monotonic(), ok=all(checks.values()), checks=checks)
+        ok, checks = _readiness_cache["ok"], dict(_readiness_cache["checks"])
+
+    body = {"status": "ok" if ok else "unavailable", "checks": checks}
+    if warmup.preload_enabled() and warmup.warmup_error():
+        body["whisper_error"] = warmup.warmup_error()
+    return JsonResponse(body, status=200 if ok else 503)
+
+
+def _metrics_allowed(request) -> bool:
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token:
+        return metrics.bearer_token_matches(request.headers.get("Authorization"), token)
+    # Without a token only local scrapers (sidecar, `curl` inside the container) get in.
+    return request.META.get("REMOTE_ADDR") in ("127.0.0.1", "::1")
+
+
+def metrics_view(request):
+    """
+    Prometheus text format. Pipeline stages run in the quiz worker, which serves
+    its own metrics via `run_quiz_worker --metrics-port`.
+    Needs `Authorization: Bearer <METRICS_TOKEN>`; without a token only loopback requests are served.
+    """
+    if not getattr(settings, "METRICS_ENABLED", True):
+        raise Http404
+    if not _metrics_allowed(request):
+        response = HttpResponse(status=401)
+        response["WWW-Authenticate"] = "Bearer"
+        return response
+    collect_job_metrics()
+    return HttpResponse(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
@@ -0,0 +1,23 @@
+#!/bin/sh
+# Runs migrations, the quiz worker and gunicorn in one container.
+#
+# The worker runs under a restart loop, so a crash (e.g. OOM during transcription)
+# doesn't silently stop quiz generation. Set RUN_QUIZ_WORKER=False to run the worker
+# as its own service instead (same image, command: python manage.py run_quiz_worker).
+set -e
+
+python manage.py migrate
+
+if [ "${RUN_QUIZ_WORKER:-True}" = "True" ]; then
+  (
+    while true; do
+      python manage.py run_quiz_worker && break
+      echo "quiz worker exited with status $?, restarting in 5s" >&2
+      sleep 5
+    done
+  ) &
+fi
+
+# Use 1 worker to reduce memory spikes on small instances.
+# Quiz generation runs in the background job worker, so API requests stay short.
+exec gunicorn core.wsgi:application --bind 0.0.0.0:${PORT:-8000} --workers 1 --threads 2 --timeout 300
@@ -0,0 +1,13 @@
+# Loaded automatically by gunicorn from the working directory.
+
+
+def post_worker_init(worker):
+    """
+    With WHISPER_PRELOAD=True every web worker warms Whisper in the background once
+    Django is loaded; /readyz stays 503 until it is done, so the load balancer only
+    routes to warm workers. (Not done in AppConfig.ready, which also runs for manage.py commands.)
+    """
+    from apps.quiz_management_app import warmup
+
+    if warmup.preload_enabled():
+        warmup.start_background_warmup()
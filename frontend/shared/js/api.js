@@ -1,24 +1,30 @@
 async function createQuiz(url) {
   document.querySelector(".overlay").classList.remove("d_none");
   url = url.trim();
+  const idempotencyKey = newIdempotencyKey();
   try {
     let response = await fetch(`${API_BASE_URL}${CREATE_QUIZ_URL}`, {
       method: "POST",
       headers: {
         "Content-Type": "application/json",
+        "Idempotency-Key": idempotencyKey,
       },
       body: JSON.stringify({ url: url }),
       credentials: "include",
     });
 
-    const data = await response.json();
+    const job = await response.json();
 
     if (!response.ok) {
       showToastMessage(true, ["Error generating quiz"]);
       document.querySelector(".overlay").classList.add("d_none");
       return null;
     }
+    const data = await waitForQuizJob(job.id);
     document.querySelector(".overlay").classList.add("d_none");
+    if (!data) {
+      showToastMessage(true, ["Error generating quiz"]);
+    }
     return data;
   } catch (error) {
     document.querySelector(".overlay").classList.add("d_none");
@@ -27,6 +33,37 @@ async function createQuiz(url) {
   }
 }
 
+function newIdempotencyKey() {
+  if (window.crypto && crypto.randomUUID) {
+    return crypto.randomUUID();
+  }
+  return `${Date.now()}-${Math.random().toString(16).slice(2)}`;
+}
+
+async function waitForQuizJob(jobId) {
+  const url = `${API_BASE_URL}${JOB_URL}${jobId}/`;
+  while (true) {
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    let response = await fetch(url, {
+      method: "GET",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      credentials: "include",
+    });
+    if (!response.ok) {
+      return null;
+    }
+    const job = await response.json();
+    if (job.status === "succeeded") {
+      return job.quiz;
+    }
+    if (job.status === "failed") {
+      return null;
+    }
+  }
+}
+
 async function loadQuizzes(id) {
   let url = `${API_BASE_URL}${GET_QUIZ_URL}`;
   if (id) {
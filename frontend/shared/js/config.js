@@ -5,4 +5,6 @@ const REGISTER_URL = "register/";
 const LOGOUT_URL = "logout/";
 const TOKENREFRESH_URL = "token/refresh/";
 const CREATE_QUIZ_URL = "createQuiz/";
+const JOB_URL = "jobs/";
+const JOB_POLL_INTERVAL_MS = 3000;
 const GET_QUIZ_URL = "quizzes/";
\ No newline at end of file